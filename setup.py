@@ -3,7 +3,10 @@
 Setup script for UBP Noise Theory Validation Package
 """
 
-from setuptools import setup, find_packages
+import glob
+import os
+
+from setuptools import setup
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -18,7 +21,13 @@ setup(
     description="Validation framework for the Universal Binary Principle (UBP) Noise Theory",
     long_description=long_description,
     long_description_content_type="text/markdown",
-    packages=find_packages(),
+    package_dir={"": "src"},
+    py_modules=sorted(os.path.splitext(os.path.basename(path))[0] for path in glob.glob("src/*.py")),
+    entry_points={
+        "console_scripts": [
+            "ubp-noise=ubp_cli:main",
+        ],
+    },
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Science/Research",
@@ -6,11 +6,21 @@ This script loads and analyzes the real NIST thermal noise dataset to test
 the UBP Noise theory hypothesis.
 """
 
+import os
 import numpy as np
 import h5py
 import json
+from nist_catalog import NISTCatalog, DEFAULT_INDEX_NAME
 from noise_theory_validator import UBPNoiseValidator
+from run_checkpoint import RunCheckpoint
+from validation_results import ValidationSummary
+from fast_plotting import AnalysisPlotter, BackgroundPlotter, DEFAULT_FAST_DPI
+from prefetch import prefetch_series
 import matplotlib.pyplot as plt
+import warnings
+
+# Local copy of the NIST corpus (one directory per noise type)
+NIST_DATA_ROOT = os.environ.get('NIST_DATA_ROOT', '/home/ubuntu')
 
 def load_nist_data(data_path):
     """Load NIST thermal noise data from HDF5 file."""
@@ -42,6 +52,76 @@ def load_nist_data(data_path):
         print(f"Error loading NIST data: {e}")
         return None, None
 
+def load_catalog_data(corpus_root=NIST_DATA_ROOT, noise_type='bandpass', split='test', params=None,
+                      target_range=None, max_rows=None, index_path=None):
+    """
+    Load corpus rows selected through the indexed NIST catalog.
+    
+    The index is built on first use and refreshed incrementally afterwards;
+    only the selected rows are read from the HDF5 files.
+    
+    Args:
+        corpus_root: Corpus root directory
+        noise_type: Noise type directory (e.g. 'FBM')
+        split: 'train', 'test' or None for both
+        params: noise_params.json filter, e.g. {'H': (0.2, 0.4)}
+        target_range: Inclusive range of the per-row parameter value
+        max_rows: Stop after this many rows
+        index_path: Catalog index file (default: <corpus_root>/nist_catalog.h5)
+    
+    Returns:
+        tuple: (param_values, noise_data) or (None, None) if nothing matches
+    """
+    index_path = index_path or os.path.join(corpus_root, DEFAULT_INDEX_NAME)
+    catalog = NISTCatalog.build(corpus_root, index_path=index_path)
+    selection = catalog.query(noise_type=noise_type, split=split, params=params,
+                              target_range=target_range)
+    if max_rows is not None:
+        limited, remaining = [], max_rows
+        for index, rows in selection:
+            if remaining <= 0:
+                break
+            limited.append((index, rows[:remaining]))
+            remaining -= len(rows[:remaining])
+        selection = limited
+    if not selection:
+        print(f"No catalog rows match noise_type={noise_type}, split={split}, params={params}")
+        return None, None
+    
+    param_values, noise_data = [], []
+    for entry, values, data in catalog.read(selection):
+        print(f"Loaded {len(values)} rows from {entry['path']}")
+        param_values.append(values)
+        noise_data.append(data)
+    return np.concatenate(param_values), np.concatenate(noise_data)
+
+class NISTRowReader:
+    """
+    Row-range reader over the series of a NIST HDF5 file.
+    
+    Unlike load_nist_data() nothing is loaded up front; read() returns the
+    data columns of a row range, so the file can be streamed through a
+    prefetching reader thread.
+    """
+    
+    def __init__(self, data_path):
+        self.h5f = h5py.File(data_path, 'r')
+        names = [name for name in ('test', 'train') if name in self.h5f]
+        if not names:
+            self.h5f.close()
+            raise ValueError(f"No recognized dataset found. Available: {list(self.h5f.keys())}")
+        self.dataset_name = names[0]
+        self.dataset = self.h5f[self.dataset_name]
+        self.n_series = self.dataset.shape[0]
+        self.series_length = self.dataset.shape[1] - 1
+    
+    def read(self, start, stop):
+        """Series [start, stop) without the parameter column."""
+        return self.dataset[start:stop, 1:]
+    
+    def close(self):
+        self.h5f.close()
+
 def load_noise_params(params_path):
     """Load noise parameters from JSON file."""
     try:
@@ -52,49 +132,104 @@ def load_noise_params(params_path):
         print(f"Error loading parameters: {e}")
         return None
 
-def analyze_nist_thermal_noise():
-    """Comprehensive analysis of NIST thermal noise data."""
-    print("=== NIST Thermal Noise Data Analysis ===")
-    
-    # Load data
-    data_path = "/home/ubuntu/bandpass/band3/test.h5"
-    params_path = "/home/ubuntu/bandpass/band3/noise_params.json"
+def analyze_nist_thermal_noise(data_path=os.path.join(NIST_DATA_ROOT, "bandpass/band3/test.h5"),
+                               params_path=os.path.join(NIST_DATA_ROOT, "bandpass/band3/noise_params.json"),
+                               n_analyze=10, store_path=None, checkpoint_every=100,
+                               checkpoint_seconds=60.0, plot_mode='sync', plot_series=(0,),
+                               plot_dpi=None, catalog_query=None, prefetch_depth=2, prefetch_chunk=8):
+    """
+    Comprehensive analysis of NIST thermal noise data.
     
-    # Load parameters
-    params = load_noise_params(params_path)
-    if params:
-        print(f"Noise parameters: {params}")
+    Args:
+        data_path: NIST HDF5 file (test.h5 or train.h5)
+        params_path: Matching noise_params.json
+        n_analyze: Maximum number of time series to analyze
+        store_path: Optional HDF5 results store used as a checkpoint. Series
+            already stored there are skipped, so an interrupted run resumes
+            where it stopped.
+        checkpoint_every: Commit summaries to the store after this many series
+        checkpoint_seconds: Commit at least this often (seconds)
+        plot_mode: 'sync' (full-resolution pyplot figures), 'fast' (one reused
+            Agg figure with decimated spectra), 'background' (fast plots
+            rendered on a worker thread) or 'none'
+        plot_series: Indices of the series that get a detailed plot
+        plot_dpi: Figure resolution (defaults to 300 for 'sync', 100 otherwise)
+        catalog_query: Optional load_catalog_data() keyword arguments; when
+            given, rows are selected through the corpus catalog instead of
+            data_path/params_path
+        prefetch_depth: Stream data_path through a reader thread that keeps
+            up to this many chunks decoded ahead of the validation (0 loads
+            the whole dataset first)
+        prefetch_chunk: Series per prefetched read
+    """
+    print("=== NIST Thermal Noise Data Analysis ===")
     
-    # Load data
-    param_values, noise_data = load_nist_data(data_path)
+    reader = None
+    if catalog_query is not None:
+        # Rows selected through the indexed corpus catalog
+        param_values, noise_data = load_catalog_data(max_rows=n_analyze, **catalog_query)
+    else:
+        # Load parameters
+        params = load_noise_params(params_path)
+        if params:
+            print(f"Noise parameters: {params}")
+        
+        # Load data (streamed through the prefetcher, or all at once)
+        if prefetch_depth > 0:
+            try:
+                reader = NISTRowReader(data_path)
+                noise_data = reader.dataset
+                print(f"Streaming NIST {reader.dataset_name} data shape: {noise_data.shape}")
+            except (OSError, ValueError) as e:
+                print(f"Error loading NIST data: {e}")
+                noise_data = None
+        else:
+            param_values, noise_data = load_nist_data(data_path)
     
     if noise_data is None:
         print("Failed to load NIST data")
         return None
     
-    print(f"Number of time series: {noise_data.shape[0]}")
-    print(f"Time series length: {noise_data.shape[1]}")
+    n_series = noise_data.shape[0]
+    series_length = reader.series_length if reader is not None else noise_data.shape[1]
+    print(f"Number of time series: {n_series}")
+    print(f"Time series length: {series_length}")
     
     # Initialize validator
     validator = UBPNoiseValidator()
     
-    # Analyze multiple time series
-    results_summary = {
-        'nrci_values': [],
-        'mean_coherence_values': [],
-        'ubp_scores': [],
-        'detected_resonances': []
-    }
+    # Analyze the first n_analyze time series (to save time)
+    n_analyze = min(n_analyze, n_series)
     
-    # Analyze first 10 time series (to save time)
-    n_analyze = min(10, noise_data.shape[0])
+    # Compact per-series summaries; completed series come from the checkpoint
+    checkpoint = None
+    summaries = {}
+    if store_path:
+        checkpoint = RunCheckpoint(store_path, flush_every=checkpoint_every,
+                                   flush_seconds=checkpoint_seconds)
+        summaries.update(checkpoint.summaries(range(n_analyze)))
     
-    for i in range(n_analyze):
+    detailed_results = None
+    
+    # Per-series plotting: synchronous pyplot, reused Agg figure, or deferred
+    plot_series = set(plot_series)
+    plotter = None
+    if plot_mode == 'fast':
+        plotter = AnalysisPlotter(validator, dpi=plot_dpi or DEFAULT_FAST_DPI)
+    elif plot_mode == 'background':
+        plotter = BackgroundPlotter(validator, dpi=plot_dpi or DEFAULT_FAST_DPI)
+    
+    # Series still to analyze; with a reader, the next chunks are read from
+    # disk while the current ones are validated
+    pending = [i for i in range(n_analyze) if i not in summaries]
+    if reader is not None:
+        series_stream = prefetch_series(reader.read, pending, prefetch_chunk, depth=prefetch_depth)
+    else:
+        series_stream = ((i, noise_data[i, :]) for i in pending)
+    
+    for i, signal in series_stream:
         print(f"\nAnalyzing time series {i+1}/{n_analyze}")
         
-        # Get time series
-        signal = noise_data[i, :]
-        
         # Estimate sampling rate from parameters or use default
         # For bandpass filtered noise, we need to estimate
         sampling_rate = 1e6  # 1 MHz default, adjust based on actual data
@@ -107,26 +242,71 @@ def analyze_nist_thermal_noise():
         )
         
         # Store summary statistics
-        results_summary['nrci_values'].append(results['nrci'])
-        results_summary['mean_coherence_values'].append(results['coherence_analysis']['mean_coherence'])
-        results_summary['ubp_scores'].append(results['ubp_assessment']['overall_score'])
-        results_summary['detected_resonances'].append(len(results['frequency_analysis']['detected_resonances']))
+        summaries[i] = ValidationSummary.from_results(results)
+        if checkpoint is not None:
+            checkpoint.record(i, summaries[i])
         
         # Save detailed results for first series
         if i == 0:
             detailed_results = results
-            # Create detailed plot
-            fig = validator.plot_analysis_results(results, f"/home/ubuntu/nist_thermal_analysis_series_{i+1}.png")
-            plt.close(fig)
+        
+        # Create detailed plot
+        if i in plot_series and plot_mode != 'none':
+            plot_path = f"/home/ubuntu/nist_thermal_analysis_series_{i+1}.png"
+            if plot_mode == 'sync':
+                fig = validator.plot_analysis_results(results, plot_path, dpi=plot_dpi or 300)
+                plt.close(fig)
+            elif plot_mode == 'fast':
+                plotter.render(results, plot_path)
+            else:
+                plotter.submit(results, plot_path)
+    
+    if plot_mode == 'background':
+        plotter.close()
+    
+    if reader is not None:
+        reader.close()
+    
+    if checkpoint is not None:
+        checkpoint.close()
+        print(f"Per-series results stored in: {store_path}")
+    
+    # Analyze multiple time series
+    results_summary = {
+        'nrci_values': [],
+        'mean_coherence_values': [],
+        'ubp_scores': [],
+        'detected_resonances': []
+    }
+    for i in sorted(summaries):
+        results_summary['nrci_values'].append(summaries[i].nrci)
+        results_summary['mean_coherence_values'].append(summaries[i].mean_coherence)
+        results_summary['ubp_scores'].append(summaries[i].overall_score)
+        results_summary['detected_resonances'].append(len(summaries[i].resonance_names))
     
     # Create summary analysis
-    create_summary_analysis(results_summary, validator)
+    create_summary_analysis(results_summary, validator, plot=plot_mode != 'none',
+                            dpi=plot_dpi or (300 if plot_mode == 'sync' else DEFAULT_FAST_DPI))
     
     return detailed_results, results_summary
 
-def create_summary_analysis(results_summary, validator):
-    """Create summary plots and statistics for multiple time series."""
+def create_summary_analysis(results_summary, validator, plot=True, dpi=300):
+    """
+    Create summary plots and statistics for multiple time series.
     
+    Args:
+        results_summary: Dict of per-series metric lists
+        validator: UBPNoiseValidator providing the thresholds
+        plot: Create and save the summary figure (statistics are always printed)
+        dpi: Resolution of the saved figure
+    """
+    if plot:
+        plot_summary_analysis(results_summary, validator, dpi=dpi)
+    
+    print_summary_statistics(results_summary, validator)
+
+def plot_summary_analysis(results_summary, validator, dpi=300):
+    """Create and save the 2x2 summary figure."""
     fig, axes = plt.subplots(2, 2, figsize=(15, 10))
     fig.suptitle('NIST Thermal Noise Data - UBP Theory Analysis Summary', fontsize=16)
     
@@ -170,9 +350,12 @@ def create_summary_analysis(results_summary, validator):
     ax4.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('/home/ubuntu/nist_summary_analysis.png', dpi=300, bbox_inches='tight')
+    plt.savefig('/home/ubuntu/nist_summary_analysis.png', dpi=dpi, bbox_inches='tight')
     print("Summary analysis saved to: /home/ubuntu/nist_summary_analysis.png")
-    
+    plt.close(fig)
+
+def print_summary_statistics(results_summary, validator):
+    """Print summary statistics and the UBP compatibility conclusion."""
     # Print summary statistics
     print("\n=== NIST Data Summary Statistics ===")
     print(f"Number of time series analyzed: {len(results_summary['nrci_values'])}")
@@ -212,7 +395,7 @@ def compare_synthetic_vs_nist():
     )
     
     # Load and analyze one NIST series
-    param_values, noise_data = load_nist_data("/home/ubuntu/bandpass/band3/test.h5")
+    param_values, noise_data = load_nist_data(os.path.join(NIST_DATA_ROOT, "bandpass/band3/test.h5"))
     if noise_data is not None:
         nist_results = validator.validate_noise_hypothesis(
             noise_data[0, :], 1e6, "NIST Thermal Noise"
@@ -227,6 +410,9 @@ def compare_synthetic_vs_nist():
         print(f"NIST UBP Score: {nist_results['ubp_assessment']['overall_score']}")
 
 if __name__ == "__main__":
+    # Silence NumPy/SciPy warnings for the script run only, not on import
+    warnings.filterwarnings('ignore')
+    
     # Analyze NIST data
     detailed_results, summary_results = analyze_nist_thermal_noise()
     
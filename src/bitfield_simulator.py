@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Sparse OffBit Bitfield Toggle Simulator
+
+Generates signals that follow the UBP model itself, for calibrating the
+detectors of the validator against known ground truth:
+
+1. Bitfield: the active OffBits of the 6-D Bitfield (170 x 170 x 170 x 5 x 2
+   x 2 cells, sparsity 0.01) held as a sorted array of linearized cell
+   coordinates (COO) and a parallel array of 24-bit OffBit words. Memory is
+   12 bytes per active OffBit and every operation is a vectorized gather or
+   scatter; CSR and full coordinate views are built on demand.
+2. Toggles: at every step a Binomial(n_active, toggle_rate) sample of active
+   OffBits is drawn. A fraction `coherence` of them is set to a common
+   driver state (phase-locked toggles); the rest toggle independently (XOR).
+3. Observable: the state of each OffBit is bit 12 (first activation bit) of
+   its word; the 1-D signal is the weighted projection sum_i w_i (2 s_i - 1)
+   after every step, updated incrementally from the toggled OffBits only.
+
+With coherence 0 the observable is an AR(1) process whose binarized segments
+are uncorrelated (C_ij near 0.25, sub-coherent); as coherence grows the
+signal locks to the driver and C_ij approaches 0.5.
+
+rng follows noise_generators: None draws from NumPy's global state (so
+np.random.seed applies), an int seeds a new Generator.
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+import numpy as np
+
+# 6-D operational Bitfield and the expected fraction of active OffBits
+BITFIELD_SHAPE = (170, 170, 170, 5, 2, 2)
+DEFAULT_SPARSITY = 0.01
+
+# OffBits are 24-bit words; bit 12 (first activation bit) is the on/off state
+OFFBIT_BITS = 24
+STATE_SHIFT = 12
+STATE_BIT = np.uint32(1 << STATE_SHIFT)
+
+# Default driver: square wave period in steps
+DEFAULT_DRIVER_PERIOD = 64
+
+
+def _rng(rng):
+    """Random source: a Generator as-is, an int as seed, None seeded from the global state."""
+    if isinstance(rng, np.random.Generator):
+        return rng
+    if rng is None:
+        # np.random.seed() still makes runs reproducible
+        rng = np.random.randint(0, 2**31 - 1)
+    return np.random.default_rng(rng)
+
+
+def _sorted_unique(values):
+    """Sorted distinct values by sort and neighbour mask (cheaper than np.unique)."""
+    values = np.sort(values)
+    if values.size < 2:
+        return values
+    keep = np.empty(values.size, dtype=bool)
+    keep[0] = True
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+
+def square_driver(n_steps, period=DEFAULT_DRIVER_PERIOD):
+    """
+    Periodic 0/1 driver states for the coherent toggles.
+
+    Args:
+        n_steps: Number of steps
+        period: Square wave period in steps
+
+    Returns:
+        numpy.ndarray: uint8 driver state per step
+    """
+    return ((np.arange(n_steps) % period) < period // 2).view(np.uint8)
+
+
+class Bitfield:
+    """Active OffBits of a sparse Bitfield as coordinate and word arrays."""
+
+    def __init__(self, coords, words, shape=BITFIELD_SHAPE):
+        """
+        Args:
+            coords: Linearized (C-order) cell index of each active OffBit, sorted and unique
+            words: 24-bit OffBit word of each active OffBit
+            shape: Bitfield dimensions
+        """
+        self.shape = tuple(int(size) for size in shape)
+        self.n_cells = int(np.prod(self.shape, dtype=np.int64))
+        self.coords = np.ascontiguousarray(coords, dtype=np.int64)
+        self.words = np.ascontiguousarray(words, dtype=np.uint32)
+        if self.coords.shape != self.words.shape or self.coords.ndim != 1:
+            raise ValueError("coords and words must be 1-D arrays of the same length")
+        if self.coords.size and (self.coords[0] < 0 or self.coords[-1] >= self.n_cells
+                                 or np.any(np.diff(self.coords) <= 0)):
+            raise ValueError("coords must be sorted, unique cell indices within the Bitfield")
+
+    @classmethod
+    def random(cls, shape=BITFIELD_SHAPE, sparsity=DEFAULT_SPARSITY, n_active=None, rng=None):
+        """
+        Bitfield with randomly placed active OffBits and random words.
+
+        Args:
+            shape: Bitfield dimensions
+            sparsity: Fraction of active cells (ignored if n_active is given)
+            n_active: Number of active OffBits
+            rng: Generator or seed
+
+        Returns:
+            Bitfield: The new Bitfield
+        """
+        rng = _rng(rng)
+        n_cells = int(np.prod(shape, dtype=np.int64))
+        n_active = int(round(sparsity * n_cells)) if n_active is None else int(n_active)
+        if not 0 <= n_active <= n_cells:
+            raise ValueError(f"Cannot place {n_active} active OffBits in {n_cells} cells")
+
+        # Draw cell indices with replacement and top up the duplicates;
+        # a handful of rounds at sparsity 0.01, without an n_cells permutation
+        coords = _sorted_unique(rng.integers(0, n_cells, n_active))
+        while coords.size < n_active:
+            extra = rng.integers(0, n_cells, n_active - coords.size)
+            coords = _sorted_unique(np.concatenate([coords, extra]))
+        words = rng.integers(0, 1 << OFFBIT_BITS, n_active, dtype=np.uint32)
+        return cls(coords, words, shape)
+
+    @property
+    def n_active(self):
+        return self.coords.size
+
+    def states(self):
+        """On/off state of every active OffBit as uint8."""
+        return ((self.words >> STATE_SHIFT) & 1).astype(np.uint8)
+
+    def coordinates(self):
+        """(n_active x ndim) array of 6-D cell coordinates."""
+        return np.stack(np.unravel_index(self.coords, self.shape), axis=1)
+
+    def to_csr(self):
+        """
+        OffBit words as a SciPy CSR matrix.
+
+        Rows are the spatial cells (first three dimensions) and columns the
+        remaining dimensions; the sorted coordinates give the CSR order
+        directly.
+
+        Returns:
+            scipy.sparse.csr_matrix: (170^3 x 20) for the default shape
+        """
+        from scipy.sparse import csr_matrix
+
+        n_columns = int(np.prod(self.shape[3:], dtype=np.int64))
+        rows, columns = np.divmod(self.coords, n_columns)
+        indptr = np.searchsorted(rows, np.arange(self.n_cells // n_columns + 1))
+        return csr_matrix((self.words, columns, indptr), shape=(self.n_cells // n_columns, n_columns))
+
+    def apply_toggles(self, indices, targets=None):
+        """
+        Set or toggle the state of selected active OffBits.
+
+        Args:
+            indices: Unique positions into the active arrays
+            targets: New 0/1 state per position (or one for all), or None
+                to toggle (XOR)
+
+        Returns:
+            numpy.ndarray: Change of each state (-1, 0 or +1)
+        """
+        old = ((self.words[indices] >> STATE_SHIFT) & 1).astype(np.int8)
+        new = 1 - old if targets is None else np.asarray(targets, dtype=np.int8)
+        self.words[indices] ^= (old ^ new).astype(np.uint32) << STATE_SHIFT
+        return new - old
+
+    def step(self, toggle_rate, coherence=0.0, target=1, rng=None):
+        """
+        Apply one step of toggles.
+
+        Args:
+            toggle_rate: Expected fraction of active OffBits acted on
+            coherence: Fraction of those set to the driver state instead of toggled
+            target: Driver state (0 or 1) for the coherent toggles
+            rng: Generator or seed
+
+        Returns:
+            tuple: (indices, changes) of the OffBits acted on
+        """
+        rng = _rng(rng)
+        # Drawn with replacement; duplicates collapse, so the realized rate is
+        # slightly below toggle_rate for large rates
+        indices = _sorted_unique(rng.integers(0, self.n_active, rng.binomial(self.n_active, toggle_rate)))
+        if coherence <= 0:
+            return indices, self.apply_toggles(indices)
+        # Phase-locked OffBits are set to the driver state, the rest toggled
+        locked = rng.random(indices.size) < coherence
+        changes = np.empty(indices.size, dtype=np.int8)
+        changes[~locked] = self.apply_toggles(indices[~locked])
+        changes[locked] = self.apply_toggles(indices[locked], target)
+        return indices, changes
+
+    def observe(self, weights=None):
+        """
+        Projection of the current state onto the 1-D observable.
+
+        Args:
+            weights: Weight per active OffBit (default: 1 / n_active)
+
+        Returns:
+            float: sum_i w_i (2 s_i - 1)
+        """
+        spins = 2.0 * self.states() - 1.0
+        if weights is None:
+            return float(spins.mean()) if self.n_active else 0.0
+        return float(np.dot(weights, spins))
+
+    def simulate(self, n_steps, toggle_rate=0.01, coherence=0.0, driver=None,
+                 driver_period=DEFAULT_DRIVER_PERIOD, weights=None, rng=None):
+        """
+        Run the toggle dynamics and record the observable after every step.
+
+        Args:
+            n_steps: Number of steps (output samples)
+            toggle_rate: Expected fraction of active OffBits acted on per step
+            coherence: Fraction of toggles phase-locked to the driver (0 to 1)
+            driver: 0/1 driver state per step (default: square wave)
+            driver_period: Period of the default square wave driver
+            weights: Projection weight per active OffBit (default: 1 / n_active)
+            rng: Generator or seed
+
+        Returns:
+            numpy.ndarray: float64 observable of length n_steps
+        """
+        if not 0.0 <= coherence <= 1.0:
+            raise ValueError(f"coherence must be in [0, 1], got {coherence}")
+        rng = _rng(rng)
+        if driver is None:
+            driver = square_driver(n_steps, driver_period)
+        driver = np.asarray(driver)
+        if driver.size < n_steps:
+            raise ValueError(f"driver has {driver.size} states for {n_steps} steps")
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)
+            if weights.shape != (self.n_active,):
+                raise ValueError(f"weights must have one entry per active OffBit ({self.n_active})")
+
+        # 1. Initial projection, then incremental updates from toggled OffBits only
+        observable = np.empty(n_steps, dtype=np.float64)
+        if weights is None:
+            n_on = int(np.count_nonzero(self.words & STATE_BIT))
+            scale = 1.0 / max(self.n_active, 1)
+        else:
+            value = self.observe(weights)
+
+        # 2. One vectorized toggle step per sample
+        for t in range(n_steps):
+            indices, changes = self.step(toggle_rate, coherence, int(driver[t]), rng)
+            if weights is None:
+                n_on += int(changes.sum(dtype=np.int64))
+                observable[t] = (2 * n_on - self.n_active) * scale
+            else:
+                value += 2.0 * float(np.dot(weights[indices], changes))
+                observable[t] = value
+        return observable
+
+
+def bitfield_signal(n_samples, n_active=4096, toggle_rate=0.05, coherence=0.0,
+                    driver_period=DEFAULT_DRIVER_PERIOD, shape=BITFIELD_SHAPE, rng=None):
+    """
+    Observable of a freshly seeded random Bitfield.
+
+    Args:
+        n_samples: Output length (one sample per step)
+        n_active: Number of active OffBits
+        toggle_rate: Expected fraction of active OffBits acted on per step
+        coherence: Fraction of toggles phase-locked to the driver
+        driver_period: Square wave driver period in steps
+        shape: Bitfield dimensions
+        rng: Generator or seed
+
+    Returns:
+        numpy.ndarray: float64 observable of length n_samples
+    """
+    rng = _rng(rng)
+    field = Bitfield.random(shape, n_active=n_active, rng=rng)
+    return field.simulate(n_samples, toggle_rate, coherence, driver_period=driver_period, rng=rng)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Vectorized and Multi-Scale Coherence Analysis
+
+UBP coherence between adjacent segments i and i+1 of length L is
+
+    C_i(L) = (1/L) * sum_k s[iL + k] * s[(i+1)L + k]
+
+For binary OffBit streams the product is a bitwise AND, so with the stream
+bit-packed once (bitstream.py) every byte-aligned segment length L (multiple
+of 8) is evaluated by AND-ing the packed stream with itself shifted by L/8
+bytes and summing popcounts per segment. A ladder of scales therefore
+touches N/8 bytes per scale: ten power-of-two scales cost about as much as one
+pass over the uint8 stream. Other lengths fall back to a uint8 product with a
+reshape-and-sum per segment.
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+import numpy as np
+
+from bitstream import bit_counts, pack_bits
+
+# Row layout of the scale-by-coherence table returned by multiscale_coherence()
+SCALE_DTYPE = np.dtype([
+    ('segment_length', np.int64),
+    ('n_pairs', np.int64),
+    ('mean_coherence', np.float64),
+    ('std_coherence', np.float64),
+    ('sub_coherent_fraction', np.float64),
+    ('toggle_detectable_fraction', np.float64),
+])
+
+
+def segment_coherence(binary_signal, segment_length=2000):
+    """
+    Adjacent-segment coherence for one segment length (vectorized).
+
+    Matches UBPNoiseValidator.compute_coherence() without the Python loop.
+
+    Args:
+        binary_signal: Binary 0/1 signal array
+        segment_length: Length of each segment
+
+    Returns:
+        tuple: (coherence_values, segment_positions)
+    """
+    binary_signal = np.asarray(binary_signal)
+    n_segments = len(binary_signal) // segment_length
+    if n_segments < 2:
+        return np.array([]), np.array([], dtype=np.int64)
+
+    segments = binary_signal[:n_segments * segment_length].reshape(n_segments, segment_length)
+    if segments.dtype.kind in 'biu':
+        coherence = np.count_nonzero(segments[:-1] & segments[1:], axis=1) / segment_length
+    else:
+        coherence = np.mean(segments[:-1] * segments[1:], axis=1)
+    return coherence, np.arange(n_segments - 1) * segment_length
+
+
+def _packed_segment_coherence(packed, n_bits, segment_length):
+    """Adjacent-segment coherence from a packed stream (segment_length % 8 == 0)."""
+    n_segments = n_bits // segment_length
+    if n_segments < 2:
+        return np.array([])
+    segment_bytes = segment_length // 8
+    stop = n_segments * segment_bytes
+    overlap = packed[:stop - segment_bytes] & packed[segment_bytes:stop]
+    if segment_bytes % 8 == 0:
+        # Whole 64-bit words per segment: count eight bytes at a time
+        overlap = overlap.view(np.uint64)
+    counts = bit_counts(overlap).reshape(n_segments - 1, -1).sum(axis=1, dtype=np.int64)
+    return counts / segment_length
+
+
+def default_scales(n_samples, min_length=8, min_pairs=1):
+    """
+    Power-of-two segment lengths with at least `min_pairs` adjacent pairs.
+
+    Args:
+        n_samples: Length of the binary signal
+        min_length: Smallest segment length
+        min_pairs: Minimum number of segment pairs at the largest scale
+
+    Returns:
+        list: Segment lengths
+    """
+    scales = []
+    length = min_length
+    while n_samples // length >= min_pairs + 1:
+        scales.append(length)
+        length *= 2
+    return scales
+
+
+def multiscale_coherence(binary_signal, segment_lengths=None, coherence_threshold=0.5,
+                         sub_coherent_threshold=0.3, return_values=False):
+    """
+    Adjacent-segment coherence for a ladder of segment lengths.
+
+    Args:
+        binary_signal: Binary 0/1 signal array, or a (packed bytes, n_bits)
+            tuple from bitstream.pack_bits()
+        segment_lengths: Segment lengths (default: powers of two from 8)
+        coherence_threshold: C_ij threshold for 3D observability
+        sub_coherent_threshold: Minimum coherence for toggle detection
+        return_values: Also return the per-segment coherence of every scale
+
+    Returns:
+        numpy.array or tuple: SCALE_DTYPE table (one row per scale), plus a
+            dict segment_length -> coherence values if return_values is set
+    """
+    if isinstance(binary_signal, tuple):
+        packed, n_bits = binary_signal
+        binary = None
+    else:
+        binary = np.asarray(binary_signal)
+        packed, n_bits = pack_bits(binary)
+
+    if segment_lengths is None:
+        segment_lengths = default_scales(n_bits)
+
+    table = np.zeros(len(segment_lengths), dtype=SCALE_DTYPE)
+    values = {}
+    for row, length in enumerate(segment_lengths):
+        length = int(length)
+        if length % 8 == 0:
+            coherence = _packed_segment_coherence(packed, n_bits, length)
+        else:
+            if binary is None:
+                binary = np.unpackbits(packed, count=n_bits)
+            coherence = segment_coherence(binary, length)[0]
+
+        table[row]['segment_length'] = length
+        table[row]['n_pairs'] = coherence.size
+        if coherence.size:
+            table[row]['mean_coherence'] = np.mean(coherence)
+            table[row]['std_coherence'] = np.std(coherence)
+            table[row]['sub_coherent_fraction'] = np.mean(coherence < coherence_threshold)
+            table[row]['toggle_detectable_fraction'] = np.mean(coherence > sub_coherent_threshold)
+        else:
+            for name in SCALE_DTYPE.names[2:]:
+                table[row][name] = np.nan
+        values[length] = coherence
+
+    if return_values:
+        return table, values
+    return table
+
+
+# Lag counts up to which lag_coherence_profile() correlates directly
+DIRECT_MAX_LAGS = 32
+
+
+def _next_fast_length(n):
+    """Smallest 2^a * 3^b * 5^c >= n (fast FFT size)."""
+    from scipy.fft import next_fast_len
+
+    return next_fast_len(int(n), real=True)
+
+
+def _fft_overlap_counts(binary, max_lag):
+    """Counts sum_t s[t] s[t + tau] for tau = 0..max_lag along the last axis."""
+    from scipy.fft import irfft, rfft
+
+    n = binary.shape[-1]
+    n_fft = _next_fast_length(n + max_lag)
+    spectrum = rfft(binary.astype(np.float64), n=n_fft, axis=-1)
+    spectrum *= spectrum.conj()
+    counts = irfft(spectrum, n=n_fft, axis=-1)[..., :max_lag + 1]
+    # Overlaps are integers; rounding removes FFT round-off
+    return np.rint(counts)
+
+
+def _check_lags(n_samples, max_lag, min_lag):
+    max_lag = int(min(max_lag, n_samples - 1))
+    if max_lag < min_lag or min_lag < 0:
+        raise ValueError(f"Invalid lag range [{min_lag}, {max_lag}] for {n_samples} samples")
+    return max_lag
+
+
+def lag_coherence_profile(binary_signal, max_lag, min_lag=1, method='auto'):
+    """
+    Coherence versus lag, C(tau) = (1/(N - tau)) * sum_t s[t] * s[t + tau].
+
+    compute_coherence() samples this profile only at tau = segment_length; the
+    profile covers a whole lag range in one pass.
+
+    Args:
+        binary_signal: Binary 0/1 signal array
+        max_lag: Largest lag (clipped to N - 1)
+        min_lag: Smallest lag
+        method: 'fft' (one zero-padded FFT autocorrelation, O(N log N)),
+            'direct' (AND and count per lag, O(N) per lag) or 'auto'
+            (direct for up to DIRECT_MAX_LAGS lags)
+
+    Returns:
+        tuple: (lags, coherence)
+    """
+    binary = np.asarray(binary_signal)
+    n = binary.size
+    max_lag = _check_lags(n, max_lag, min_lag)
+    lags = np.arange(min_lag, max_lag + 1)
+    if method == 'auto':
+        method = 'direct' if lags.size <= DIRECT_MAX_LAGS else 'fft'
+
+    if method == 'direct':
+        binary = binary.astype(np.uint8, copy=False)
+        counts = np.array([np.count_nonzero(binary[:n - lag] & binary[lag:]) for lag in lags],
+                          dtype=np.float64)
+    elif method == 'fft':
+        counts = _fft_overlap_counts(binary, max_lag)[min_lag:]
+    else:
+        raise ValueError(f"Unknown method '{method}'")
+    return lags, counts / (n - lags)
+
+
+def lag_coherence_profile_batch(binary_signals, max_lag, min_lag=1):
+    """
+    Lag coherence profiles of many equally long series in one batched FFT.
+
+    Args:
+        binary_signals: 2-D array (n_series, n_samples) of binary states
+        max_lag: Largest lag (clipped to n_samples - 1)
+        min_lag: Smallest lag
+
+    Returns:
+        tuple: (lags, coherence array of shape (n_series, n_lags))
+    """
+    binary = np.atleast_2d(np.asarray(binary_signals))
+    n = binary.shape[1]
+    max_lag = _check_lags(n, max_lag, min_lag)
+    lags = np.arange(min_lag, max_lag + 1)
+    counts = _fft_overlap_counts(binary, max_lag)[:, min_lag:]
+    return lags, counts / (n - lags)
@@ -16,6 +16,10 @@ with the UBP theory of incoherent OffBit toggles.
 import numpy as np
 import matplotlib.pyplot as plt
 from noise_theory_validator import UBPNoiseValidator
+import noise_generators
+import bitfield_simulator
+from results_store import ResultsStore
+from run_checkpoint import RunCheckpoint
 import scipy.signal
 from scipy.stats import norm
 import warnings
@@ -85,8 +89,78 @@ class ComprehensiveNoiseAnalyzer:
         time = np.linspace(0, duration, n_samples)
         return time, noise
     
-    def analyze_all_noise_types(self):
-        """Analyze all noise types for UBP compatibility."""
+    def generate_fgn_noise(self, duration=0.1, sampling_rate=1e6, hurst=0.7, amplitude=1.0, rng=None):
+        """Generate fractional Gaussian noise (Davies-Harte)."""
+        n_samples = int(duration * sampling_rate)
+        noise = noise_generators.fgn(n_samples, hurst, scale=amplitude, rng=rng)[0]
+        time = np.linspace(0, duration, n_samples)
+        return time, noise
+    
+    def generate_fbm_noise(self, duration=0.1, sampling_rate=1e6, hurst=0.7, amplitude=1.0, rng=None):
+        """Generate fractional Brownian motion noise."""
+        n_samples = int(duration * sampling_rate)
+        noise = noise_generators.fbm(n_samples, hurst, scale=amplitude, rng=rng)[0]
+        time = np.linspace(0, duration, n_samples)
+        return time, noise
+    
+    def generate_fdwn_noise(self, duration=0.1, sampling_rate=1e6, d=0.3, amplitude=1.0, rng=None):
+        """Generate fractionally differenced white noise."""
+        n_samples = int(duration * sampling_rate)
+        noise = noise_generators.fdwn(n_samples, d, scale=amplitude, rng=rng)[0]
+        time = np.linspace(0, duration, n_samples)
+        return time, noise
+    
+    def generate_bg_noise(self, duration=0.1, sampling_rate=1e6, p=0.05, amplitude=1.0, rng=None):
+        """Generate Bernoulli-Gaussian impulsive noise."""
+        n_samples = int(duration * sampling_rate)
+        noise = noise_generators.bernoulli_gaussian(n_samples, p, impulse_std=amplitude, rng=rng)[0]
+        time = np.linspace(0, duration, n_samples)
+        return time, noise
+    
+    def generate_sas_noise(self, duration=0.1, sampling_rate=1e6, alpha=1.5, amplitude=1.0, rng=None):
+        """Generate symmetric alpha-stable impulsive noise."""
+        n_samples = int(duration * sampling_rate)
+        noise = noise_generators.symmetric_alpha_stable(n_samples, alpha, scale=amplitude, rng=rng)[0]
+        time = np.linspace(0, duration, n_samples)
+        return time, noise
+    
+    def generate_bitfield_noise(self, duration=0.1, sampling_rate=1e6, n_active=4096, toggle_rate=0.05,
+                                coherence=0.0, rng=None):
+        """Generate the observable of a simulated sparse OffBit Bitfield (one step per sample)."""
+        n_samples = int(duration * sampling_rate)
+        noise = bitfield_simulator.bitfield_signal(n_samples, n_active=n_active, toggle_rate=toggle_rate,
+                                                   coherence=coherence, rng=rng)
+        time = np.linspace(0, duration, n_samples)
+        return time, noise
+    
+    def generate_reference_batch(self, noise_type, parameter, n_series, n_samples=4096, rng=None,
+                                 **options):
+        """
+        Generate a batch of NIST-style reference series in one vectorized call.
+        
+        Args:
+            noise_type: 'FGN', 'FBM', 'FDWN', 'BG' or 'SAS'
+            parameter: Class parameter (H, H, d, p or alpha)
+            n_series: Number of series
+            n_samples: Samples per series (NIST series have 4096)
+            rng: None, seed or numpy Generator
+            **options: Generator options (scale, impulse_std, ...)
+        
+        Returns:
+            numpy.ndarray: n_series x n_samples array
+        """
+        return noise_generators.generate_batch(noise_type, n_samples, parameter, n_series=n_series,
+                                               rng=rng, **options)
+    
+    def analyze_all_noise_types(self, checkpoint_path=None):
+        """
+        Analyze all noise types for UBP compatibility.
+        
+        Args:
+            checkpoint_path: Optional HDF5 checkpoint. Each finished noise type
+                is committed immediately; on restart, finished types are
+                restored from the checkpoint instead of being re-analyzed.
+        """
         print("=== Comprehensive UBP Noise Theory Analysis ===")
         print("Testing multiple noise types for UBP compatibility\n")
         
@@ -94,53 +168,74 @@ class ComprehensiveNoiseAnalyzer:
         duration = 0.1  # 100 ms
         sampling_rate = 1e6  # 1 MHz
         
-        # 1. Thermal noise (Johnson-Nyquist)
-        print("1. Analyzing Thermal Noise...")
-        time, thermal = self.validator.generate_thermal_noise(
-            resistance=1000, temperature=300, 
-            sampling_rate=sampling_rate, duration=duration
-        )
-        thermal_results = self.validator.validate_noise_hypothesis(
-            thermal, sampling_rate, "Thermal Noise (1kΩ, 300K)"
-        )
-        self.results['thermal'] = thermal_results
-        
-        # 2. White Gaussian noise
-        print("\n2. Analyzing White Gaussian Noise...")
-        time, white = self.generate_white_noise(duration, sampling_rate, amplitude=1e-6)
-        white_results = self.validator.validate_noise_hypothesis(
-            white, sampling_rate, "White Gaussian Noise"
-        )
-        self.results['white'] = white_results
-        
-        # 3. Pink (1/f) noise
-        print("\n3. Analyzing Pink (1/f) Noise...")
-        time, pink = self.generate_pink_noise(duration, sampling_rate, amplitude=1e-6)
-        pink_results = self.validator.validate_noise_hypothesis(
-            pink, sampling_rate, "Pink (1/f) Noise"
-        )
-        self.results['pink'] = pink_results
-        
-        # 4. Shot noise
-        print("\n4. Analyzing Shot Noise...")
-        time, shot = self.generate_shot_noise(duration, sampling_rate, rate=1000, amplitude=1e-6)
-        shot_results = self.validator.validate_noise_hypothesis(
-            shot, sampling_rate, "Shot Noise (Poisson)"
-        )
-        self.results['shot'] = shot_results
-        
-        # 5. Brownian motion noise
-        print("\n5. Analyzing Brownian Motion Noise...")
-        time, brownian = self.generate_brownian_noise(duration, sampling_rate, diffusion=1e-12)
-        brownian_results = self.validator.validate_noise_hypothesis(
-            brownian, sampling_rate, "Brownian Motion Noise"
-        )
-        self.results['brownian'] = brownian_results
+        # (key, title, signal name, generator) per noise type
+        noise_configs = [
+            # 1. Thermal noise (Johnson-Nyquist)
+            ('thermal', "Thermal Noise", "Thermal Noise (1kΩ, 300K)",
+             lambda: self.validator.generate_thermal_noise(
+                 resistance=1000, temperature=300,
+                 sampling_rate=sampling_rate, duration=duration)),
+            # 2. White Gaussian noise
+            ('white', "White Gaussian Noise", "White Gaussian Noise",
+             lambda: self.generate_white_noise(duration, sampling_rate, amplitude=1e-6)),
+            # 3. Pink (1/f) noise
+            ('pink', "Pink (1/f) Noise", "Pink (1/f) Noise",
+             lambda: self.generate_pink_noise(duration, sampling_rate, amplitude=1e-6)),
+            # 4. Shot noise
+            ('shot', "Shot Noise", "Shot Noise (Poisson)",
+             lambda: self.generate_shot_noise(duration, sampling_rate, rate=1000, amplitude=1e-6)),
+            # 5. Brownian motion noise
+            ('brownian', "Brownian Motion Noise", "Brownian Motion Noise",
+             lambda: self.generate_brownian_noise(duration, sampling_rate, diffusion=1e-12)),
+        ]
+        
+        checkpoint = RunCheckpoint(checkpoint_path, flush_every=1) if checkpoint_path else None
+        completed = checkpoint.summaries() if checkpoint is not None else {}
+        
+        for index, (key, title, signal_name, generate) in enumerate(noise_configs):
+            if index in completed:
+                print(f"{index + 1}. {title}: restored from checkpoint\n")
+                self.results[key] = completed[index].to_results(self.validator)
+                continue
+            
+            print(f"{index + 1}. Analyzing {title}...")
+            time, noise = generate()
+            self.results[key] = self.validator.validate_noise_hypothesis(
+                noise, sampling_rate, signal_name
+            )
+            print()
+            
+            if checkpoint is not None:
+                checkpoint.record(index, self.results[key])
+        
+        if checkpoint is not None:
+            checkpoint.close()
         
         return self.results
     
-    def create_comparative_analysis(self):
-        """Create comprehensive comparative analysis plots."""
+    def save_results(self, store_path):
+        """
+        Append the per-noise-type summaries to a columnar HDF5 results store.
+        
+        Args:
+            store_path: Path of the HDF5 results store
+            
+        Returns:
+            int: Number of rows in the store after the append
+        """
+        noise_types = list(self.results.keys())
+        with ResultsStore(store_path) as store:
+            return store.append([self.results[nt] for nt in noise_types])
+    
+    def create_comparative_analysis(self, save_path='/home/ubuntu/comprehensive_noise_analysis.png',
+                                    dpi=300):
+        """
+        Create comprehensive comparative analysis plots.
+        
+        Args:
+            save_path: Output image path (None to skip saving)
+            dpi: Resolution of the saved figure
+        """
         fig, axes = plt.subplots(3, 2, figsize=(20, 15))
         fig.suptitle('Comprehensive UBP Noise Theory Analysis - Multiple Noise Types', fontsize=16)
         
@@ -258,8 +353,9 @@ class ComprehensiveNoiseAnalyzer:
         ax6.set_title('UBP Compatibility Summary', pad=20)
         
         plt.tight_layout()
-        plt.savefig('/home/ubuntu/comprehensive_noise_analysis.png', dpi=300, bbox_inches='tight')
-        print("Comprehensive analysis plot saved to: /home/ubuntu/comprehensive_noise_analysis.png")
+        if save_path:
+            plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
+            print(f"Comprehensive analysis plot saved to: {save_path}")
         
         return fig
     
@@ -365,12 +461,16 @@ def main():
     with open('/home/ubuntu/comprehensive_noise_report.md', 'w') as f:
         f.write(report)
     
+    # Persist per-noise-type metrics
+    analyzer.save_results('/home/ubuntu/comprehensive_noise_results.h5')
+    
     print("\n" + "="*60)
     print("COMPREHENSIVE ANALYSIS COMPLETE")
     print("="*60)
     print(f"Results saved to:")
     print(f"- Plot: /home/ubuntu/comprehensive_noise_analysis.png")
     print(f"- Report: /home/ubuntu/comprehensive_noise_report.md")
+    print(f"- Metrics: /home/ubuntu/comprehensive_noise_results.h5")
     print("\nSummary:")
     
     # Quick summary
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Discretization Engine for OffBit Analysis
+
+Sign thresholding (signal > 0) gives degenerate bitstreams for non-negative
+signals (shot noise) and drifting ones (Brownian noise). This module converts
+continuous signals to OffBit states with:
+
+1. Thresholds - sign, global median, quantile (exact or streaming sketch) and
+   rolling median (block medians, linear time)
+2. Hysteresis - Schmitt-trigger switching between center -/+ width
+3. Multi-level quantization - b-bit codes split into b binary bit planes
+
+Every binary output is uint8 and can be returned bit-packed for the
+bitstream pipeline (see bitstream.py).
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+import numpy as np
+
+from bitstream import pack_bits
+from streaming_normality import DEFAULT_CHUNK_SIZE, LogBinnedHistogram
+
+# Threshold modes accepted by compute_threshold() and discretize()
+THRESHOLD_MODES = ('sign', 'median', 'quantile', 'rolling_median')
+
+# Default rolling-median window (samples)
+DEFAULT_WINDOW = 4096
+
+
+def quantile_threshold(signal, q=0.5, sketch=False, chunk_size=DEFAULT_CHUNK_SIZE,
+                       relative_accuracy=0.001):
+    """
+    Quantile of a signal used as a discretization threshold.
+
+    Args:
+        signal: Input signal array
+        q: Quantile in [0, 1]
+        sketch: Use a streaming quantile sketch instead of introselect
+        chunk_size: Samples per sketch update
+        relative_accuracy: Relative accuracy of the sketch
+
+    Returns:
+        float: Threshold value
+    """
+    signal = np.asarray(signal)
+    if not sketch:
+        # np.quantile selects with np.partition: linear time, no full sort
+        return float(np.quantile(signal, q))
+    histogram = LogBinnedHistogram(relative_accuracy)
+    for start in range(0, signal.size, chunk_size):
+        histogram.update(signal[start:start + chunk_size])
+    return histogram.quantile(q)
+
+
+def rolling_median(signal, window=DEFAULT_WINDOW):
+    """
+    Rolling median baseline in linear time.
+
+    The signal is cut into blocks of `window` samples; the median of each block
+    is found by selection (O(window)) and the baseline is linearly interpolated
+    between block centers. Total cost is O(N) independent of the window, versus
+    O(N log window) or worse for an exact sliding median, and it follows drift
+    on time scales longer than the window.
+
+    Args:
+        signal: Input signal array
+        window: Block length in samples
+
+    Returns:
+        numpy.array: Baseline with the same length and dtype as the signal
+    """
+    signal = np.asarray(signal)
+    n = signal.size
+    window = max(1, min(int(window), n))
+    n_full = n // window
+
+    medians = []
+    centers = []
+    if n_full:
+        medians.append(np.median(signal[:n_full * window].reshape(n_full, window), axis=1))
+        centers.append(np.arange(n_full) * window + (window - 1) / 2.0)
+    if n_full * window < n:
+        tail = signal[n_full * window:]
+        medians.append([np.median(tail)])
+        centers.append([n_full * window + (tail.size - 1) / 2.0])
+    medians = np.concatenate(medians)
+    centers = np.concatenate(centers)
+
+    if medians.size == 1:
+        return np.full(n, medians[0], dtype=signal.dtype)
+    return np.interp(np.arange(n), centers, medians).astype(signal.dtype, copy=False)
+
+
+def compute_threshold(signal, mode='sign', q=0.5, window=DEFAULT_WINDOW, sketch=False):
+    """
+    Threshold for one of the THRESHOLD_MODES.
+
+    Args:
+        signal: Input signal array
+        mode: 'sign', 'median', 'quantile' or 'rolling_median'
+        q: Quantile for mode 'quantile'
+        window: Block length for mode 'rolling_median'
+        sketch: Use a streaming sketch for 'median' and 'quantile'
+
+    Returns:
+        float or numpy.array: Scalar threshold, or per-sample baseline
+    """
+    if mode == 'sign':
+        return 0.0
+    if mode == 'median':
+        return quantile_threshold(signal, 0.5, sketch=sketch)
+    if mode == 'quantile':
+        return quantile_threshold(signal, q, sketch=sketch)
+    if mode == 'rolling_median':
+        return rolling_median(signal, window)
+    raise ValueError(f"Unknown threshold mode '{mode}'; expected one of {THRESHOLD_MODES}")
+
+
+def hysteresis_threshold(signal, low, high, initial=None):
+    """
+    Schmitt-trigger discretization.
+
+    The state switches to 1 when the signal rises above `high` and to 0 when it
+    falls below `low`; in between the previous state is held. Vectorized by
+    forward-filling the index of the last switching sample.
+
+    Args:
+        signal: Input signal array
+        low: Lower threshold (scalar or per-sample array)
+        high: Upper threshold (scalar or per-sample array)
+        initial: State before the first switch (default: signal[0] above the
+            midpoint of the thresholds)
+
+    Returns:
+        numpy.array: Binary uint8 array
+    """
+    signal = np.asarray(signal)
+    if signal.size == 0:
+        return np.zeros(0, dtype=np.uint8)
+
+    events = np.full(signal.size, -1, dtype=np.int8)
+    events[signal < low] = 0
+    events[signal > high] = 1
+    if events[0] < 0:
+        if initial is None:
+            midpoint = (np.broadcast_to(low, signal.shape)[0] + np.broadcast_to(high, signal.shape)[0]) / 2
+            initial = signal[0] > midpoint
+        events[0] = int(bool(initial))
+
+    # Forward-fill: every sample takes the state of the last switching sample
+    last_event = np.where(events >= 0, np.arange(signal.size), 0)
+    np.maximum.accumulate(last_event, out=last_event)
+    return events[last_event].view(np.uint8)
+
+
+def discretize(signal, mode='sign', q=0.5, window=DEFAULT_WINDOW, hysteresis=0.0,
+               sketch=False, packed=False):
+    """
+    Convert a continuous signal to binary OffBit states.
+
+    Args:
+        signal: Input signal array
+        mode: Threshold mode (see THRESHOLD_MODES)
+        q: Quantile for mode 'quantile'
+        window: Block length for mode 'rolling_median'
+        hysteresis: Half-width of the hysteresis band in units of the signal
+            standard deviation (0 disables hysteresis)
+        sketch: Use a streaming sketch for 'median' and 'quantile'
+        packed: Return the bit-packed stream instead of uint8 states
+
+    Returns:
+        numpy.array or tuple: uint8 0/1 array, or (packed bytes, n_bits)
+    """
+    signal = np.asarray(signal)
+    threshold = compute_threshold(signal, mode, q=q, window=window, sketch=sketch)
+    if hysteresis > 0:
+        width = hysteresis * np.std(signal)
+        binary = hysteresis_threshold(signal, threshold - width, threshold + width)
+    else:
+        binary = (signal > threshold).view(np.uint8)
+    return pack_bits(binary) if packed else binary
+
+
+def quantize_levels(signal, n_bits=2, method='quantile', sketch=False):
+    """
+    Multi-level quantization into 2**n_bits equally populated (or spaced) levels.
+
+    Args:
+        signal: Input signal array
+        n_bits: Bits per sample (1-8)
+        method: 'quantile' (equal occupancy) or 'uniform' (equal width)
+        sketch: Use a streaming sketch for the quantile edges
+
+    Returns:
+        tuple: (uint8 level codes, level edges)
+    """
+    if not 1 <= n_bits <= 8:
+        raise ValueError("n_bits must be between 1 and 8")
+    signal = np.asarray(signal)
+    n_levels = 1 << n_bits
+    if method == 'quantile':
+        levels = np.arange(1, n_levels) / n_levels
+        if sketch:
+            edges = np.array([quantile_threshold(signal, level, sketch=True) for level in levels])
+        else:
+            edges = np.quantile(signal, levels)
+    elif method == 'uniform':
+        edges = np.linspace(np.min(signal), np.max(signal), n_levels + 1)[1:-1]
+    else:
+        raise ValueError(f"Unknown quantization method '{method}'")
+    codes = np.searchsorted(edges, signal, side='right').astype(np.uint8)
+    return codes, edges
+
+
+def bit_planes(codes, n_bits, packed=False):
+    """
+    Split multi-level codes into binary bit planes (most significant first).
+
+    Each plane is an OffBit stream that the coherence and toggle stages can
+    analyze independently.
+
+    Args:
+        codes: uint8 level codes from quantize_levels()
+        n_bits: Bits per code
+        packed: Return bit-packed planes
+
+    Returns:
+        list: n_bits uint8 0/1 arrays, or (packed bytes, n_bits) tuples
+    """
+    codes = np.asarray(codes, dtype=np.uint8)
+    planes = [(codes >> bit) & 1 for bit in range(n_bits - 1, -1, -1)]
+    if packed:
+        return [pack_bits(plane) for plane in planes]
+    return planes
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Headless Fast-Render Plotting for Batch Runs
+
+plot_analysis_results() draws the full positive-frequency spectrum (hundreds of
+thousands of points) through pyplot and saves at 300 dpi, which often costs
+more than the analysis itself. This module provides a fast path:
+
+1. use_headless_backend() - switch Matplotlib to the non-interactive Agg backend
+2. AnalysisPlotter - one reusable Agg figure redrawn for every series, with
+   log-spaced min/max spectrum decimation and configurable dpi
+3. BackgroundPlotter - renders on a worker thread so batch runs never wait
+   for plotting; only decimated spectra are queued
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from validation_results import downsample_spectrum
+
+# Default number of plotted spectrum points in fast mode
+DEFAULT_MAX_POINTS = 4096
+
+# Default resolution of fast-mode figures
+DEFAULT_FAST_DPI = 100
+
+
+def use_headless_backend():
+    """Select the Agg backend (no display, no GUI event loop)."""
+    import matplotlib
+
+    matplotlib.use('Agg')
+
+
+def light_results(results, max_points=DEFAULT_MAX_POINTS):
+    """
+    Copy of a results dict with the spectrum decimated for plotting.
+
+    Args:
+        results: Validation results dictionary
+        max_points: Number of spectrum points kept (min/max envelope)
+
+    Returns:
+        dict: Results dictionary safe to keep after the full arrays are freed
+    """
+    light = dict(results)
+    freq_data = dict(results['frequency_analysis'])
+    freq_data.pop('peaks', None)
+    if 'frequencies' in freq_data:
+        freq_data['frequencies'], freq_data['power_spectrum'] = downsample_spectrum(
+            freq_data['frequencies'], freq_data['power_spectrum'], max_points, method='minmax')
+    light['frequency_analysis'] = freq_data
+    return light
+
+
+class AnalysisPlotter:
+    """
+    Reusable Agg figure for per-series analysis plots.
+
+    The figure and its 2x3 axes are created once; render() clears and redraws
+    them, avoiding figure construction and pyplot state for every series.
+    """
+
+    def __init__(self, validator, dpi=DEFAULT_FAST_DPI, max_points=DEFAULT_MAX_POINTS,
+                 figsize=(18, 12)):
+        """
+        Args:
+            validator: UBPNoiseValidator providing draw_analysis_axes()
+            dpi: Resolution of saved figures
+            max_points: Number of plotted spectrum points (None for all)
+            figsize: Figure size in inches
+        """
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.validator = validator
+        self.dpi = dpi
+        self.max_points = max_points
+        self.fig = Figure(figsize=figsize)
+        FigureCanvasAgg(self.fig)
+        self.axes = self.fig.subplots(2, 3)
+
+    def render(self, results, save_path):
+        """
+        Redraw the figure for one series and save it.
+
+        Args:
+            results: Validation results dictionary
+            save_path: Output image path
+        """
+        for ax in self.axes.flat:
+            ax.clear()
+        self.validator.draw_analysis_axes(self.fig, self.axes, results, max_points=self.max_points)
+        self.fig.tight_layout()
+        self.fig.savefig(save_path, dpi=self.dpi)
+        return save_path
+
+
+class BackgroundPlotter:
+    """
+    Defer analysis plots to a single background thread.
+
+    submit() decimates the spectrum immediately (so the caller can drop the
+    full results) and returns a Future; close() waits for queued plots.
+    """
+
+    def __init__(self, validator, dpi=DEFAULT_FAST_DPI, max_points=DEFAULT_MAX_POINTS):
+        self.max_points = max_points
+        self._plotter = AnalysisPlotter(validator, dpi=dpi, max_points=max_points)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ubp-plot')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def submit(self, results, save_path):
+        """
+        Queue one analysis plot.
+
+        Args:
+            results: Validation results dictionary
+            save_path: Output image path
+
+        Returns:
+            concurrent.futures.Future: Resolves to save_path when written
+        """
+        return self._executor.submit(self._plotter.render,
+                                     light_results(results, self.max_points), save_path)
+
+    def close(self):
+        """Wait for all queued plots to finish."""
+        self._executor.shutdown(wait=True)
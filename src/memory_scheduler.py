@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Memory-Budget-Aware Planning of Batch and Sweep Runs
+
+Each analysis stage allocates temporaries proportional to the series length:
+the real FFT and peak search, the toggle positions and intervals, and above
+all the sorts and CDF arrays of the exact normality tests. This module
+estimates the peak working memory of one validation from the series length
+and precision, and plans a run so that
+
+    workers * (worker baseline + chunk data + series peak)
+        + queued chunks * chunk data + shared copy <= budget
+
+by choosing, in order of preference, the normality mode (exact, then
+streaming sketch), the precision (single only when allowed), the number of
+workers and the chunk size. Queued chunks are the decoded row blocks held
+by the parent when prefetching: up to depth + read_ahead in the prefetch
+queue plus max_in_flight submitted to the pool. The shared copy is the
+block loaded once for all workers with --shared-memory; a selection that
+does not fit next to one worker is refused.
+
+The per-stage model is n * (constant + multiple * itemsize) + fixed bytes,
+measured with tracemalloc on the validator (float64 and float32, 2^16 to
+2^22 samples) and rounded up; the sketch normality stage is bounded by its
+chunk size instead of the series length. The fixed term covers buffers that
+do not scale with the series, such as the window histograms and kernel
+blocks of the randomness metrics.
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from noise_theory_validator import ANALYSIS_STAGES, OPTIONAL_STAGES, PRECISION_DTYPES
+from streaming_normality import DEFAULT_CHUNK_SIZE as SKETCH_CHUNK_SIZE, DEFAULT_EXACT_MAX_SAMPLES
+
+# Peak temporaries: (constant bytes per sample, multiple of the itemsize,
+# fixed bytes)
+STAGE_MEMORY_MODEL = {
+    'coherence': (0.0, 1.0, 0),
+    'frequency': (14.0, 1.125, 0),
+    'nrci': (0.0, 1.0, 0),
+    'toggle': (18.0, 0.0, 0),             # worst case: a toggle at every sample
+    'normality_exact': (57.0, 2.0, 0),
+    'normality_sketch': (16.0, 2.0, 0),   # per sample of one sketch chunk
+    'golay': (1.2, 0.0, 1 << 16),         # bool copy and packed stream; syndromes are blocked
+    'randomness': (1.25, 0.0, 24 << 20),  # as golay, plus 2 x 4 MB counted-window histograms
+                                          # and 2 x 8 MB intp kernel blocks
+}
+
+# Results kept alive across stages (binary signal, spectrum arrays)
+RETAINED_MEMORY_MODEL = (3.0, 1.0)
+
+# Margin on top of the model, and resident size of an idle worker process
+SAFETY_FACTOR = 1.2
+WORKER_BASELINE_MB = 120
+
+
+def stage_memory(stage, n_samples, itemsize=8, normality_mode='exact', sketch_chunk=SKETCH_CHUNK_SIZE):
+    """
+    Estimated peak temporaries of one analysis stage.
+
+    Args:
+        stage: One of ANALYSIS_STAGES or OPTIONAL_STAGES
+        n_samples: Series length
+        itemsize: Bytes per sample under the precision policy
+        normality_mode: 'exact' or 'sketch' (normality stage only)
+        sketch_chunk: Chunk size of the sketch normality tests
+
+    Returns:
+        int: Bytes
+    """
+    if stage not in ANALYSIS_STAGES + OPTIONAL_STAGES:
+        raise ValueError(f"Unknown analysis stage '{stage}'; "
+                         f"expected one of {ANALYSIS_STAGES + OPTIONAL_STAGES}")
+    if stage == 'normality':
+        if normality_mode not in ('exact', 'sketch'):
+            raise ValueError(f"Unknown normality mode '{normality_mode}'; expected 'exact' or 'sketch'")
+        stage = f"normality_{normality_mode}"
+        if normality_mode == 'sketch':
+            n_samples = min(n_samples, sketch_chunk)
+    constant, multiple, fixed = STAGE_MEMORY_MODEL[stage]
+    return int(np.ceil(n_samples * (constant + multiple * itemsize))) + fixed
+
+
+def estimate_series_memory(n_samples, stages=None, precision='double', normality_mode='auto',
+                           exact_max_samples=DEFAULT_EXACT_MAX_SAMPLES):
+    """
+    Estimated peak working memory of one validate_noise_hypothesis() call.
+
+    Stages run one after another, so the peak is the largest stage plus the
+    results kept alive between stages and the converted input signal.
+
+    Args:
+        n_samples: Series length
+        stages: Optional subset of ANALYSIS_STAGES (default: all)
+        precision: 'double' or 'single'
+        normality_mode: 'exact', 'sketch' or 'auto' (as in the validator)
+        exact_max_samples: Largest series tested exactly in 'auto' mode
+
+    Returns:
+        dict: 'stages' (bytes per stage), 'retained', 'signal', 'normality_mode'
+            and 'peak' (bytes, including the safety factor)
+    """
+    stages = ANALYSIS_STAGES if stages is None else tuple(stages)
+    itemsize = np.dtype(PRECISION_DTYPES[precision][0]).itemsize
+    if normality_mode == 'auto':
+        normality_mode = 'exact' if n_samples <= exact_max_samples else 'sketch'
+
+    per_stage = {stage: stage_memory(stage, n_samples, itemsize, normality_mode) for stage in stages}
+    constant, multiple = RETAINED_MEMORY_MODEL
+    retained = int(np.ceil(n_samples * (constant + multiple * itemsize)))
+    signal = n_samples * itemsize
+    peak = int(SAFETY_FACTOR * (max(per_stage.values(), default=0) + retained + signal))
+    return {
+        'stages': per_stage,
+        'retained': retained,
+        'signal': signal,
+        'normality_mode': normality_mode,
+        'peak': peak
+    }
+
+
+@dataclass
+class RunPlan:
+    """Worker count, chunking and stage modes chosen for a memory budget."""
+    __slots__ = ('workers', 'chunk_size', 'max_in_flight', 'precision', 'normality_mode',
+                 'series_bytes', 'worker_bytes', 'chunk_bytes', 'queued_chunks', 'shared_bytes',
+                 'budget_bytes')
+
+    workers: int
+    chunk_size: int
+    max_in_flight: int
+    precision: str
+    normality_mode: str
+    series_bytes: int
+    worker_bytes: int
+    chunk_bytes: int
+    queued_chunks: int
+    shared_bytes: int
+    budget_bytes: int
+
+    @property
+    def total_bytes(self):
+        """Planned peak memory of all workers, the queued chunks and the shared copy."""
+        return self.workers * self.worker_bytes + self.queued_chunks * self.chunk_bytes + self.shared_bytes
+
+    def settings(self):
+        """Validator attributes implementing the plan."""
+        return {'precision': self.precision, 'normality_mode': self.normality_mode}
+
+    def describe(self):
+        return (f"{self.workers} workers x {self.chunk_size} series/chunk, {self.precision} precision, "
+                f"{self.normality_mode} normality: {self.total_bytes / 2**20:.0f} MB "
+                f"of {self.budget_bytes / 2**20:.0f} MB")
+
+
+def plan_run(n_series, series_length, memory_budget_mb, stages=None, max_workers=1, chunk_size=8,
+             precision='double', allow_single=False, source_itemsize=8,
+             exact_max_samples=DEFAULT_EXACT_MAX_SAMPLES, shared_series=0, prefetch_depth=0, read_ahead=1):
+    """
+    Plan a batch run that stays within a RAM budget.
+
+    Candidates are tried in order: exact normality, sketch normality, and
+    (with allow_single) sketch normality in single precision. The first
+    candidate that fits max_workers workers is taken; otherwise the one that
+    fits the most workers. The chunk size is then reduced until the chunk
+    data of every worker and of the chunks queued in the parent fits as
+    well. At most max_in_flight chunks are submitted at a time; without
+    prefetching they are index ranges read by the workers.
+
+    Args:
+        n_series: Number of series to process
+        series_length: Samples per series
+        memory_budget_mb: Total RAM allowed for all workers
+        stages: Optional subset of ANALYSIS_STAGES
+        max_workers: Upper bound on worker processes
+        chunk_size: Requested series per chunk (upper bound)
+        precision: Requested precision ('double' or 'single')
+        allow_single: Allow falling back to single precision
+        source_itemsize: Bytes per sample as read from the source
+        exact_max_samples: Longest series eligible for exact normality
+        shared_series: Series copied once into shared memory for all workers
+            (stored in the plan's precision)
+        prefetch_depth: Decoded chunks waiting in the parent's prefetch queue
+            (0: workers read their own chunks)
+        read_ahead: Consecutive chunks fetched per prefetch read
+
+    Returns:
+        RunPlan: The chosen plan
+
+    Raises:
+        ValueError: If not even one worker with one series (next to the
+            shared copy) fits the budget
+    """
+    budget = int(memory_budget_mb * 2**20)
+    baseline = WORKER_BASELINE_MB * 2**20
+    stages = ANALYSIS_STAGES if stages is None else tuple(stages)
+    max_workers = max(1, int(max_workers))
+    series_bytes_per_chunk = series_length * source_itemsize
+    # Prefetching holds depth + read_ahead decoded series in the parent's queue
+    # and one more per submitted chunk (max_in_flight, 2 per worker)
+    prefetch_queue = prefetch_depth + read_ahead if prefetch_depth > 0 else 0
+    in_flight_per_worker = 2 if prefetch_depth > 0 else 0
+
+    candidates = []
+    if 'normality' not in stages or series_length <= exact_max_samples:
+        candidates.append((precision, 'exact'))
+    if 'normality' in stages:
+        candidates.append((precision, 'sketch'))
+    if allow_single and precision != 'single':
+        candidates.append(('single', 'sketch' if 'normality' in stages else 'exact'))
+
+    best = None
+    for candidate_precision, mode in candidates:
+        series_bytes = estimate_series_memory(series_length, stages, candidate_precision, mode)['peak']
+        shared_bytes = shared_series * series_length * np.dtype(PRECISION_DTYPES[candidate_precision][0]).itemsize
+        worker_bytes = baseline + series_bytes + series_length * source_itemsize
+        room = max(budget - shared_bytes - prefetch_queue * series_bytes_per_chunk, 0)
+        fit = min(max_workers, room // (worker_bytes + in_flight_per_worker * series_bytes_per_chunk),
+                  n_series or 1)
+        if best is None or fit > best[0]:
+            best = (fit, candidate_precision, mode, series_bytes, shared_bytes)
+        if fit >= min(max_workers, n_series or 1):
+            break
+
+    workers, precision, mode, series_bytes, shared_bytes = best
+    if workers < 1:
+        if shared_bytes:
+            raise ValueError(f"The shared copy of {shared_series} series needs {shared_bytes / 2**20:.0f} MB "
+                             f"and one worker about {(baseline + series_bytes) / 2**20:.0f} MB more; the "
+                             f"budget is {memory_budget_mb} MB (select fewer series or drop --shared-memory)")
+        raise ValueError(f"A single {series_length}-sample series needs about "
+                         f"{(baseline + series_bytes) / 2**20:.0f} MB; the budget is {memory_budget_mb} MB")
+
+    # Largest chunk whose raw data (in the workers and queued) still fits
+    max_in_flight = 2 * int(workers)
+    queued_chunks = prefetch_queue + in_flight_per_worker * int(workers)
+    chunk_room = (budget - shared_bytes - workers * (baseline + series_bytes)) // (workers + queued_chunks)
+    chunk_size = int(max(1, min(chunk_size, chunk_room // max(series_bytes_per_chunk, 1),
+                                -(-(n_series or 1) // workers))))
+    worker_bytes = baseline + series_bytes + chunk_size * series_bytes_per_chunk
+    return RunPlan(workers=int(workers), chunk_size=chunk_size, max_in_flight=max_in_flight,
+                   precision=precision, normality_mode=mode, series_bytes=series_bytes,
+                   worker_bytes=worker_bytes, chunk_bytes=chunk_size * series_bytes_per_chunk,
+                   queued_chunks=queued_chunks, shared_bytes=shared_bytes, budget_bytes=budget)
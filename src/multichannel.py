@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Multi-Channel Cross-Coherence for Simultaneous Captures
+
+For a (channels x samples) array or memmap this module computes, in one
+chunked pass over the samples:
+
+1. Binary coherence between all channel pairs,
+       C_ij = (1/N) * sum_t s_i[t] * s_j[t]
+   as one matrix product B @ B.T per sample block
+2. Magnitude-squared spectral coherence (Welch, Hann window),
+       MSC_ij(f) = |S_ij(f)|^2 / (S_ii(f) * S_jj(f))
+   where every channel is transformed once per segment and the cross
+   spectra of all pairs are accumulated as batched matrix products, split
+   into channel-pair blocks that run in a thread pool
+
+Memory is bounded by one batch of segments plus the (frequencies x C x C)
+cross-spectral accumulator.
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Largest sample block whose 0/1 products sum exactly in float32
+FLOAT32_EXACT_COUNT = 1 << 24
+
+
+def _sign_binarize(block):
+    """Default discretization: 1 where the sample is positive."""
+    return block > 0
+
+
+def _pair_blocks(n_channels, block_channels):
+    """Upper-triangular (rows, cols) channel slices."""
+    edges = list(range(0, n_channels, block_channels)) + [n_channels]
+    slices = [slice(start, stop) for start, stop in zip(edges[:-1], edges[1:])]
+    return [(rows, cols) for i, rows in enumerate(slices) for cols in slices[i:]]
+
+
+def multichannel_coherence(data, sampling_rate, nperseg=1024, noverlap=None, binarize=None,
+                           segments_per_batch=64, block_channels=16, workers=None):
+    """
+    Pairwise binary and spectral coherence of simultaneous channels.
+
+    Args:
+        data: 2-D array or memmap (channels x samples)
+        sampling_rate: Sampling rate in Hz
+        nperseg: Samples per Welch segment
+        noverlap: Segment overlap (default: nperseg // 2)
+        binarize: Callable mapping a (channels x block) array to 0/1 states
+            (default: sign thresholding)
+        segments_per_batch: Segments transformed per batch (bounds memory)
+        block_channels: Channels per block of the pairwise cross spectra
+        workers: Threads for the channel-pair blocks (default: CPU count)
+
+    Returns:
+        dict: 'binary_coherence' (C x C), 'frequencies', 'msc'
+            (frequencies x C x C), 'mean_msc' (C x C, averaged over
+            frequencies excluding DC) and 'n_segments'
+    """
+    from scipy.fft import rfft, rfftfreq
+    from scipy.signal import get_window
+
+    n_channels, n_samples = data.shape
+    nperseg = min(int(nperseg), n_samples)
+    step = nperseg - (nperseg // 2 if noverlap is None else int(noverlap))
+    n_segments = 1 + (n_samples - nperseg) // step
+    binarize = binarize or _sign_binarize
+    window = get_window('hann', nperseg)
+    n_freqs = nperseg // 2 + 1
+
+    binary_counts = np.zeros((n_channels, n_channels))
+    cross = np.zeros((n_freqs, n_channels, n_channels), dtype=np.complex128)
+    pair_blocks = _pair_blocks(n_channels, block_channels)
+    frame_index = np.arange(nperseg)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for first in range(0, n_segments, segments_per_batch):
+            last = min(first + segments_per_batch, n_segments)
+            start = first * step
+            stop = (last - 1) * step + nperseg
+            block = np.asarray(data[:, start:stop], dtype=np.float64)
+
+            # 1. Binary coherence over the non-overlapping part of the batch
+            binary_stop = n_samples if last == n_segments else last * step
+            binary_block = data[:, start:binary_stop]
+            for offset in range(0, binary_stop - start, FLOAT32_EXACT_COUNT):
+                states = binarize(np.asarray(binary_block[:, offset:offset + FLOAT32_EXACT_COUNT]))
+                states = states.astype(np.float32)
+                binary_counts += states @ states.T
+
+            # 2. One FFT per channel and segment, shared by all pairs
+            frames = block[:, (np.arange(last - first) * step)[:, np.newaxis] + frame_index]
+            frames = frames - frames.mean(axis=-1, keepdims=True)
+            spectra = rfft(frames * window, axis=-1)            # C x S x F
+            spectra = np.ascontiguousarray(spectra.transpose(2, 0, 1))  # F x C x S
+
+            def accumulate(pair_block):
+                rows, cols = pair_block
+                cross[:, rows, cols] += spectra[:, rows, :] @ spectra[:, cols, :].conj().transpose(0, 2, 1)
+
+            list(executor.map(accumulate, pair_blocks))
+
+    # Fill the lower triangle from Hermitian symmetry
+    upper = np.triu(np.ones((n_channels, n_channels), dtype=bool), k=1)
+    cross_t = cross.conj().transpose(0, 2, 1)
+    cross[:, upper.T] = cross_t[:, upper.T]
+
+    auto = np.real(np.diagonal(cross, axis1=1, axis2=2))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        msc = np.abs(cross)**2 / (auto[:, :, np.newaxis] * auto[:, np.newaxis, :])
+
+    return {
+        'binary_coherence': binary_counts / n_samples,
+        'frequencies': rfftfreq(nperseg, 1 / sampling_rate),
+        'msc': msc,
+        'mean_msc': np.nanmean(msc[1:], axis=0),
+        'n_segments': n_segments
+    }
+
+
+def coherence_pairs(matrix):
+    """
+    Upper-triangular channel pairs of a symmetric coherence matrix.
+
+    Args:
+        matrix: C x C coherence matrix
+
+    Returns:
+        tuple: (i indices, j indices, values) for i < j
+    """
+    i, j = np.triu_indices(matrix.shape[0], k=1)
+    return i, j, matrix[i, j]
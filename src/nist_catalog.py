@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Indexed Catalog of the NIST Noise Corpus
+
+The NIST release (docs/nist_readme.txt) unpacks to one directory per noise
+type (bandpass, BG, FBM, FDWN, FGN, SAS, shot), each with subdirectories per
+parameter set holding noise_params.json, train.h5 and test.h5. Every HDF5
+dataset stores one series per row with the target parameter value in
+column 0.
+
+NISTCatalog scans a local copy once and writes a persistent HDF5 index:
+
+    /files/<column>     one entry per dataset: noise type, subset directory,
+                        path, split, shape, dtype, byte offset (contiguous
+                        datasets), mtime/size and parameter range
+    /files/metadata     noise_params.json of the subset (JSON text)
+    /rows/param         column 0 of every row, concatenated in file order
+
+Rescans only re-read files whose mtime or size changed. Queries select rows
+by noise type, split, noise_params.json values and per-row parameter, and
+reads touch only the selected rows (memory-mapped for contiguous datasets).
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+import json
+import os
+
+import numpy as np
+
+# Noise types of the NIST release (top-level directory names)
+NIST_NOISE_TYPES = ('bandpass', 'BG', 'FBM', 'FDWN', 'FGN', 'SAS', 'shot')
+
+# Default index file name inside the corpus root
+DEFAULT_INDEX_NAME = 'nist_catalog.h5'
+
+# Fixed-size columns of the file table
+FILE_DTYPE = np.dtype([
+    ('noise_type', 'S32'),
+    ('subset', 'S256'),
+    ('path', 'S1024'),
+    ('split', 'S32'),
+    ('n_rows', np.int64),
+    ('row_length', np.int64),
+    ('dtype', 'S16'),
+    ('offset', np.int64),
+    ('mtime', np.float64),
+    ('size', np.int64),
+    ('row_start', np.int64),
+    ('param_min', np.float64),
+    ('param_max', np.float64),
+])
+
+
+def _text(value):
+    return value.decode('utf-8') if isinstance(value, bytes) else str(value)
+
+
+def _scan_dataset(path, name, dataset, stat):
+    """Index entry and row parameters of one HDF5 dataset."""
+    n_rows, n_columns = dataset.shape
+    params = np.asarray(dataset[:, 0], dtype=np.float64)
+    offset = dataset.id.get_offset()
+    contiguous = offset is not None and dataset.chunks is None and dataset.compression is None
+    entry = np.zeros((), dtype=FILE_DTYPE)
+    entry['path'] = path.encode('utf-8')
+    entry['split'] = name.encode('utf-8')
+    entry['n_rows'] = n_rows
+    entry['row_length'] = n_columns - 1
+    entry['dtype'] = dataset.dtype.str.encode('ascii')
+    entry['offset'] = offset if contiguous else -1
+    entry['mtime'] = stat.st_mtime
+    entry['size'] = stat.st_size
+    entry['param_min'] = params.min() if n_rows else np.nan
+    entry['param_max'] = params.max() if n_rows else np.nan
+    return entry, params
+
+
+class NISTCatalog:
+    """
+    Persistent index of the NIST noise corpus with row-level queries.
+
+    Usage:
+        catalog = NISTCatalog.build('/data/nist')
+        selection = catalog.query(noise_type='FBM', params={'H': (0.2, 0.4)})
+        for entry, params, data in catalog.read(selection):
+            ...
+    """
+
+    def __init__(self, root, files, metadata, row_params):
+        """
+        Args:
+            root: Corpus root directory
+            files: FILE_DTYPE array (one entry per dataset)
+            metadata: List of noise_params.json dicts, one per entry
+            row_params: Column 0 of all rows, concatenated in entry order
+        """
+        self.root = root
+        self.files = files
+        self.metadata = metadata
+        self.row_params = row_params
+
+    def __len__(self):
+        return len(self.files)
+
+    @classmethod
+    def build(cls, root, index_path=None, include_generated=False):
+        """
+        Scan a corpus directory and write (or refresh) its index.
+
+        Args:
+            root: Corpus root directory
+            index_path: Index file (default: <root>/nist_catalog.h5)
+            include_generated: Also index GAN outputs (gen_distribution.h5)
+
+        Returns:
+            NISTCatalog: The refreshed catalog
+        """
+        import h5py
+
+        index_path = index_path or os.path.join(root, DEFAULT_INDEX_NAME)
+        previous = {}
+        if os.path.exists(index_path):
+            old = cls.load(index_path)
+            for entry in old.files:
+                start = entry['row_start']
+                previous.setdefault(_text(entry['path']), []).append(
+                    (entry, old.row_params[start:start + entry['n_rows']]))
+
+        entries, metadata, params = [], [], []
+        for directory, subdirs, filenames in os.walk(root):
+            subdirs.sort()
+            h5_files = sorted(name for name in filenames if name.endswith('.h5')
+                              and name != os.path.basename(index_path)
+                              and (include_generated or name != 'gen_distribution.h5'))
+            if not h5_files:
+                continue
+
+            subset = os.path.relpath(directory, root)
+            noise_type = subset.split(os.sep)[0]
+            params_path = os.path.join(directory, 'noise_params.json')
+            subset_metadata = {}
+            if os.path.exists(params_path):
+                with open(params_path, 'r') as f:
+                    subset_metadata = json.load(f)
+
+            for filename in h5_files:
+                path = os.path.join(directory, filename)
+                stat = os.stat(path)
+                relative = os.path.relpath(path, root)
+
+                # Unchanged files are taken from the previous index unopened
+                scanned = previous.get(relative, [])
+                if not scanned or any(entry['mtime'] != stat.st_mtime or entry['size'] != stat.st_size
+                                      for entry, _ in scanned):
+                    with h5py.File(path, 'r') as h5f:
+                        scanned = [_scan_dataset(relative, name, h5f[name], stat) for name in sorted(h5f)
+                                   if isinstance(h5f[name], h5py.Dataset) and h5f[name].ndim == 2]
+
+                for entry, row_params in scanned:
+                    entry = entry.copy()
+                    entry['noise_type'] = noise_type.encode('utf-8')
+                    entry['subset'] = subset.encode('utf-8')
+                    entries.append(entry)
+                    metadata.append(subset_metadata)
+                    params.append(row_params)
+
+        files = np.array(entries, dtype=FILE_DTYPE) if entries else np.zeros(0, dtype=FILE_DTYPE)
+        files['row_start'] = np.concatenate([[0], np.cumsum(files['n_rows'])[:-1]]) if entries else []
+        row_params = np.concatenate(params) if params else np.zeros(0)
+        catalog = cls(root, files, metadata, row_params)
+        catalog.save(index_path)
+        return catalog
+
+    def save(self, index_path):
+        """Write the index to an HDF5 file."""
+        import h5py
+
+        with h5py.File(index_path, 'w') as h5f:
+            h5f.attrs['root'] = self.root
+            group = h5f.create_group('files')
+            for name in FILE_DTYPE.names:
+                group.create_dataset(name, data=self.files[name])
+            group.create_dataset('metadata', data=[json.dumps(m) for m in self.metadata],
+                                 dtype=h5py.string_dtype())
+            h5f.create_dataset('rows/param', data=self.row_params)
+
+    @classmethod
+    def load(cls, index_path):
+        """
+        Load a catalog index written by build().
+
+        Args:
+            index_path: Index file path
+
+        Returns:
+            NISTCatalog: Catalog (no corpus files are opened)
+        """
+        import h5py
+
+        with h5py.File(index_path, 'r') as h5f:
+            group = h5f['files']
+            n_files = group['n_rows'].shape[0]
+            files = np.zeros(n_files, dtype=FILE_DTYPE)
+            for name in FILE_DTYPE.names:
+                files[name] = group[name][:]
+            metadata = [json.loads(_text(m)) for m in group['metadata'][:]]
+            row_params = h5f['rows/param'][:]
+            root = _text(h5f.attrs['root'])
+        return cls(root, files, metadata, row_params)
+
+    @property
+    def noise_types(self):
+        """Noise types present in the catalog."""
+        return sorted({_text(t) for t in self.files['noise_type']})
+
+    def entry(self, index):
+        """Entry as a dict including its noise_params.json metadata."""
+        record = self.files[index]
+        entry = {name: (_text(record[name]) if FILE_DTYPE[name].kind == 'S' else record[name].item())
+                 for name in FILE_DTYPE.names}
+        entry['metadata'] = self.metadata[index]
+        return entry
+
+    def query(self, noise_type=None, split=None, params=None, target_range=None):
+        """
+        Select rows of the corpus.
+
+        Args:
+            noise_type: Noise type (or tuple of types)
+            split: Dataset name such as 'train' or 'test' (or tuple)
+            params: Dict of noise_params.json key -> value or (low, high)
+                inclusive range, e.g. {'H': (0.2, 0.4)}
+            target_range: Inclusive (low, high) range of the per-row
+                parameter value (column 0)
+
+        Returns:
+            list: (entry index, sorted row indices) for every matching dataset
+        """
+        def matches(value, wanted):
+            if isinstance(wanted, (tuple, list)) and len(wanted) == 2:
+                try:
+                    return wanted[0] <= float(value) <= wanted[1]
+                except (TypeError, ValueError):
+                    return False
+            return value == wanted
+
+        noise_types = (noise_type,) if isinstance(noise_type, str) else noise_type
+        splits = (split,) if isinstance(split, str) else split
+        selection = []
+        for i, record in enumerate(self.files):
+            if noise_types and _text(record['noise_type']) not in noise_types:
+                continue
+            if splits and _text(record['split']) not in splits:
+                continue
+            if params and not all(key in self.metadata[i] and matches(self.metadata[i][key], wanted)
+                                  for key, wanted in params.items()):
+                continue
+            if target_range is not None and (record['param_max'] < target_range[0]
+                                             or record['param_min'] > target_range[1]):
+                continue
+
+            rows = np.arange(record['n_rows'])
+            if target_range is not None:
+                start = record['row_start']
+                values = self.row_params[start:start + record['n_rows']]
+                rows = rows[(values >= target_range[0]) & (values <= target_range[1])]
+            if rows.size:
+                selection.append((i, rows))
+        return selection
+
+    def read_rows(self, index, rows):
+        """
+        Read selected rows of one dataset.
+
+        Contiguous uncompressed datasets are memory-mapped at their byte
+        offset, so only the pages of the selected rows are read; other
+        datasets are read with one HDF5 hyperslab per run of rows.
+
+        Args:
+            index: Entry index
+            rows: Sorted row indices
+
+        Returns:
+            tuple: (param_values, data) with data of shape (len(rows), row_length)
+        """
+        record = self.files[index]
+        path = os.path.join(self.root, _text(record['path']))
+        rows = np.asarray(rows, dtype=np.int64)
+        shape = (int(record['n_rows']), int(record['row_length']) + 1)
+
+        if record['offset'] >= 0:
+            mapped = np.memmap(path, dtype=np.dtype(_text(record['dtype'])), mode='r',
+                               offset=int(record['offset']), shape=shape)
+            block = np.array(mapped[rows])
+            del mapped
+        else:
+            import h5py
+
+            breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+            with h5py.File(path, 'r') as h5f:
+                dataset = h5f[_text(record['split'])]
+                block = np.concatenate([dataset[run[0]:run[-1] + 1] for run in np.split(rows, breaks)
+                                        if run.size]) if rows.size else np.zeros((0, shape[1]))
+        return block[:, 0], block[:, 1:]
+
+    def read(self, selection):
+        """
+        Iterate over the rows of a query result, one dataset at a time.
+
+        Args:
+            selection: Result of query()
+
+        Yields:
+            tuple: (entry dict, param_values, data)
+        """
+        for index, rows in selection:
+            param_values, data = self.read_rows(index, rows)
+            yield self.entry(index), param_values, data
@@ -17,15 +17,34 @@ Date: July 2025
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-import scipy.signal
-import scipy.stats
-from scipy.fft import fft, fftfreq
-from scipy.sparse import dok_matrix
-import h5py
-import json
-import warnings
-warnings.filterwarnings('ignore')
+from coherence_analysis import lag_coherence_profile, multiscale_coherence, segment_coherence
+from bitstream import pack_bits
+from discretization import discretize
+from golay import golay_analysis
+from multichannel import multichannel_coherence
+from progressive import progressive_metrics
+from randomness_metrics import randomness_metrics
+from resonance_tracking import track_resonances
+from spectral_peaks import DEFAULT_TOP_K, match_targets, top_k_peaks
+from streaming_normality import normality_tests, DEFAULT_EXACT_MAX_SAMPLES
+from validation_results import ValidationResult, ValidationSummary, downsample_spectrum
+
+# Heavy dependencies (matplotlib, scipy.signal, scipy.fft, scipy.stats) are
+# imported inside the stages that use them so that importing this module, e.g.
+# in process-pool workers or short CLI jobs, stays fast.
+
+# Analysis stages of validate_noise_hypothesis() in execution order
+ANALYSIS_STAGES = ('coherence', 'frequency', 'nrci', 'toggle', 'normality')
+
+# Stages run only when requested explicitly through `stages`
+OPTIONAL_STAGES = ('golay', 'randomness')
+
+# Precision policies: (real dtype of signals and spectra, complex FFT dtype).
+# Binary OffBit states are always uint8.
+PRECISION_DTYPES = {
+    'double': (np.float64, np.complex128),
+    'single': (np.float32, np.complex64)
+}
 
 class UBPNoiseValidator:
     """
@@ -55,6 +74,48 @@ class UBPNoiseValidator:
         # Johnson-Nyquist constants
         self.k_b = 1.38e-23  # Boltzmann constant
         
+        # Statistical stage: 'exact' sorts the full signal, 'sketch' streams
+        # it through mergeable moment/quantile sketches, 'auto' picks by size
+        self.normality_mode = 'auto'
+        self.exact_normality_max_samples = DEFAULT_EXACT_MAX_SAMPLES
+        
+        # Numeric precision of generated signals, analysis and spectra:
+        # 'double' (float64/complex128) or 'single' (float32/complex64).
+        # See check_precision() for the accuracy of 'single'.
+        self.precision = 'double'
+        
+        # OffBit discretization: threshold mode ('sign', 'median', 'quantile',
+        # 'rolling_median') plus discretization.discretize() keyword options
+        # such as hysteresis, q or window. 'sign' is plain signal > 0.
+        self.discretization_mode = 'sign'
+        self.discretization_options = {}
+        
+        # Spectral peaks: 'all' keeps every maximum above the mean power
+        # (find_peaks), 'top_k' only the peak_count strongest, ranked by
+        # 'power' or 'prominence', optionally on power / local noise floor
+        # (blocks of peak_noise_window bins)
+        self.peak_mode = 'all'
+        self.peak_count = DEFAULT_TOP_K
+        self.peak_rank = 'power'
+        self.peak_noise_window = None
+    
+    @property
+    def float_dtype(self):
+        """Real dtype of the current precision policy."""
+        return PRECISION_DTYPES[self.precision][0]
+    
+    def as_signal(self, signal):
+        """
+        Convert a signal to the real dtype of the precision policy.
+        
+        Args:
+            signal: Input signal (array-like)
+            
+        Returns:
+            numpy.array: Signal as float32 or float64 (no copy if it already is)
+        """
+        return np.asarray(signal, dtype=self.float_dtype)
+        
     def generate_thermal_noise(self, resistance=1000, temperature=300, 
                              sampling_rate=1e9, duration=0.01):
         """
@@ -76,9 +137,9 @@ class UBPNoiseValidator:
         noise_psd = 4 * self.k_b * temperature * resistance
         
         # Generate white Gaussian noise
-        noise_voltage = np.random.normal(0, np.sqrt(noise_psd * sampling_rate/2), n_samples)
+        noise_voltage = self.as_signal(np.random.normal(0, np.sqrt(noise_psd * sampling_rate/2), n_samples))
         
-        time_array = np.linspace(0, duration, n_samples)
+        time_array = np.linspace(0, duration, n_samples, dtype=self.float_dtype)
         
         return time_array, noise_voltage
     
@@ -89,10 +150,15 @@ class UBPNoiseValidator:
         Args:
             signal: Input signal array
             
+        Uses the validator's discretization_mode and discretization_options;
+        the default is sign thresholding.
+        
         Returns:
-            numpy.array: Binary array (1 for positive, 0 for negative/zero)
+            numpy.array: Binary uint8 array (1 above threshold, 0 otherwise)
         """
-        return (signal > 0).astype(int)
+        if self.discretization_mode == 'sign' and not self.discretization_options:
+            return (np.asarray(signal) > 0).view(np.uint8)
+        return discretize(signal, self.discretization_mode, **self.discretization_options)
     
     def compute_coherence(self, binary_signal, segment_length=2000):
         """
@@ -107,27 +173,91 @@ class UBPNoiseValidator:
             
         Returns:
             tuple: (coherence_values, segment_positions)
+        
+        See compute_multiscale_coherence() for many segment lengths at once
+        and compute_lag_profile() for coherence as a function of lag.
         """
-        n_segments = len(binary_signal) // segment_length
-        coherence_values = []
-        segment_positions = []
+        # Adjacent segments compared with one vectorized AND per segment pair
+        return segment_coherence(binary_signal, segment_length)
+    
+    def compute_multiscale_coherence(self, binary_signal, segment_lengths=None):
+        """
+        Adjacent-segment coherence for a ladder of segment lengths in one call.
         
-        for i in range(n_segments - 1):
-            start_i = i * segment_length
-            end_i = (i + 1) * segment_length
-            start_j = (i + 1) * segment_length
-            end_j = (i + 2) * segment_length
+        Args:
+            binary_signal: Binary signal array (or packed (bytes, n_bits) tuple)
+            segment_lengths: Segment lengths (default: powers of two from 8)
             
-            if end_j <= len(binary_signal):
-                segment_i = binary_signal[start_i:end_i]
-                segment_j = binary_signal[start_j:end_j]
-                
-                # Compute coherence between adjacent segments
-                coherence = np.mean(segment_i * segment_j)
-                coherence_values.append(coherence)
-                segment_positions.append(start_i)
-        
-        return np.array(coherence_values), np.array(segment_positions)
+        Returns:
+            numpy.array: Scale-by-coherence table (coherence_analysis.SCALE_DTYPE)
+        """
+        return multiscale_coherence(binary_signal, segment_lengths,
+                                    coherence_threshold=self.coherence_threshold,
+                                    sub_coherent_threshold=self.sub_coherent_threshold)
+    
+    def compute_lag_profile(self, binary_signal, max_lag=4096, min_lag=1):
+        """
+        Coherence versus lag C(tau) for the binarized signal.
+        
+        Args:
+            binary_signal: Binary signal array
+            max_lag: Largest lag in samples
+            min_lag: Smallest lag in samples
+            
+        Returns:
+            tuple: (lags, coherence)
+        """
+        return lag_coherence_profile(binary_signal, max_lag, min_lag=min_lag)
+    
+    def resonance_targets(self):
+        """UBP resonance frequencies checked in spectra (name -> Hz)."""
+        return {
+            'pi_resonance': self.pi_resonance,
+            'phi_resonance': self.phi_resonance,
+            'neural': self.neural_freq,
+            'cosmic': self.cosmic_freq
+        }
+    
+    def track_resonances(self, signal, sampling_rate, nperseg=4096, method='stft',
+                         targets=None, chunk_size=1 << 20):
+        """
+        Time-resolved power near each UBP resonance (short-time spectra).
+        
+        Args:
+            signal: Input signal (array or memmap; processed in chunks)
+            sampling_rate: Sampling rate in Hz
+            nperseg: Samples per frame (frequency resolution sampling_rate / nperseg)
+            method: 'stft' or 'multitaper'
+            targets: Optional dict name -> Hz (default: resonance_targets())
+            chunk_size: Samples per chunk
+            
+        Returns:
+            dict: Time x target table (see resonance_tracking.ResonanceTracker.result)
+        """
+        return track_resonances(signal, sampling_rate, targets or self.resonance_targets(),
+                                chunk_size=chunk_size, nperseg=nperseg, method=method)
+    
+    def compute_multichannel_coherence(self, data, sampling_rate, nperseg=1024, workers=None):
+        """
+        Pairwise binary and magnitude-squared coherence of simultaneous channels.
+        
+        Non-sign discretization modes are applied per channel and sample
+        block, so data-dependent thresholds are local to each block.
+        
+        Args:
+            data: 2-D array or memmap (channels x samples)
+            sampling_rate: Sampling rate in Hz
+            nperseg: Samples per Welch segment
+            workers: Threads for the channel-pair blocks
+            
+        Returns:
+            dict: See multichannel.multichannel_coherence()
+        """
+        def binarize(block):
+            return np.stack([self.discretize_signal(row) for row in block])
+        
+        return multichannel_coherence(data, sampling_rate, nperseg=nperseg, workers=workers,
+                                      binarize=binarize)
     
     def analyze_resonance_frequencies(self, signal, sampling_rate):
         """
@@ -140,51 +270,54 @@ class UBPNoiseValidator:
         Returns:
             dict: Analysis results including detected peaks
         """
-        # Compute FFT
-        fft_signal = fft(signal)
-        frequencies = fftfreq(len(signal), 1/sampling_rate)
-        power_spectrum = np.abs(fft_signal)**2
+        from scipy.fft import rfft, rfftfreq
         
-        # Only consider positive frequencies
-        pos_mask = frequencies > 0
-        pos_freqs = frequencies[pos_mask]
-        pos_power = power_spectrum[pos_mask]
+        # Compute FFT (real input: only the non-negative half is computed;
+        # float32 input gives a complex64 spectrum)
+        fft_signal = rfft(self.as_signal(signal))
+        frequencies = rfftfreq(len(signal), 1/sampling_rate).astype(self.float_dtype)
+        
+        # Only consider positive frequencies (DC and Nyquist excluded)
+        pos_slice = slice(1, (len(signal) + 1) // 2)
+        pos_freqs = frequencies[pos_slice]
+        pos_power = fft_signal.real[pos_slice]**2 + fft_signal.imag[pos_slice]**2
         
         # Find peaks in power spectrum
-        peaks, properties = scipy.signal.find_peaks(pos_power, height=np.mean(pos_power))
+        mean_power = np.mean(pos_power)
+        scores = None
+        if self.peak_mode == 'top_k':
+            peaks, scores = top_k_peaks(pos_power, self.peak_count, rank=self.peak_rank,
+                                        noise_window=self.peak_noise_window)
+        elif self.peak_mode == 'all':
+            from scipy.signal import find_peaks
+            peaks, properties = find_peaks(pos_power, height=mean_power)
+        else:
+            raise ValueError(f"Unknown peak mode '{self.peak_mode}'; expected 'all' or 'top_k'")
         peak_freqs = pos_freqs[peaks]
         peak_powers = pos_power[peaks]
         
-        # Check for UBP resonance frequencies
-        ubp_frequencies = {
-            'pi_resonance': self.pi_resonance,
-            'phi_resonance': self.phi_resonance,
-            'neural': self.neural_freq,
-            'cosmic': self.cosmic_freq
-        }
+        # Check for UBP resonance frequencies (10% tolerance); peaks are in
+        # ascending frequency order, so matching is a binary search per target
+        max_freq = pos_freqs[-1] if len(pos_freqs) else 0
+        ubp_frequencies = {name: target_freq for name, target_freq in self.resonance_targets().items()
+                           if target_freq <= max_freq}
         
         detected_resonances = {}
-        tolerance = 0.1  # 10% tolerance for frequency matching
-        
-        for name, target_freq in ubp_frequencies.items():
-            if target_freq <= np.max(pos_freqs):
-                # Find closest peak to target frequency
-                freq_diffs = np.abs(peak_freqs - target_freq)
-                min_diff_idx = np.argmin(freq_diffs)
-                min_diff = freq_diffs[min_diff_idx]
-                
-                if min_diff / target_freq <= tolerance:
-                    detected_resonances[name] = {
-                        'target_freq': target_freq,
-                        'detected_freq': peak_freqs[min_diff_idx],
-                        'power': peak_powers[min_diff_idx],
-                        'significance': peak_powers[min_diff_idx] / np.mean(pos_power)
-                    }
+        for name, index in match_targets(peak_freqs, ubp_frequencies, tolerance=0.1).items():
+            detected_resonances[name] = {
+                'target_freq': ubp_frequencies[name],
+                'detected_freq': peak_freqs[index],
+                'power': peak_powers[index],
+                'significance': peak_powers[index] / mean_power
+            }
         
+        peaks_result = {'frequencies': peak_freqs, 'powers': peak_powers}
+        if scores is not None:
+            peaks_result['scores'] = scores
         return {
             'frequencies': pos_freqs,
             'power_spectrum': pos_power,
-            'peaks': {'frequencies': peak_freqs, 'powers': peak_powers},
+            'peaks': peaks_result,
             'detected_resonances': detected_resonances
         }
     
@@ -201,13 +334,6 @@ class UBPNoiseValidator:
         # Convert to binary
         binary_signal = self.discretize_signal(signal)
         
-        # Compute autocorrelation
-        autocorr = np.correlate(binary_signal, binary_signal, mode='full')
-        autocorr = autocorr[autocorr.size // 2:]
-        
-        # Normalize
-        autocorr = autocorr / autocorr[0]
-        
         # NRCI is based on how much the signal deviates from random
         # Higher values indicate more structure/coherence
         random_expectation = 0.5  # For random binary signal
@@ -228,13 +354,14 @@ class UBPNoiseValidator:
         Returns:
             dict: Toggle analysis results
         """
-        # Count toggle events (0->1 or 1->0)
-        toggles = np.diff(binary_signal)
-        toggle_count = np.sum(np.abs(toggles))
+        # Count toggle events (0->1 or 1->0); comparison instead of np.diff
+        # so unsigned binaries do not wrap around
+        toggles = binary_signal[1:] != binary_signal[:-1]
+        toggle_count = int(np.count_nonzero(toggles))
         toggle_rate = toggle_count / len(binary_signal)
         
         # Analyze toggle intervals
-        toggle_positions = np.where(np.abs(toggles) > 0)[0]
+        toggle_positions = np.flatnonzero(toggles)
         if len(toggle_positions) > 1:
             toggle_intervals = np.diff(toggle_positions)
             mean_interval = np.mean(toggle_intervals)
@@ -254,7 +381,92 @@ class UBPNoiseValidator:
             'total_samples': len(binary_signal)
         }
     
-    def validate_noise_hypothesis(self, signal, sampling_rate, signal_name="Unknown"):
+    def compute_progressive_metrics(self, signal, metrics=('nrci', 'mean_coherence'), precision=1e-4,
+                                    confidence=0.95, order='random', rng=None):
+        """
+        NRCI and coherence estimated from a growing sample of the signal.
+        
+        Segment pairs are read in random (or strided) order until every
+        requested metric is within `precision` at the given confidence, so
+        long captures are only partly read and discretized.
+        
+        Args:
+            signal: Input signal (array or memmap)
+            metrics: Metrics that must reach the precision (see
+                progressive.PROGRESSIVE_METRICS)
+            precision: Target confidence half-width (float or dict per metric)
+            confidence: Confidence level
+            order: 'random' or 'strided'
+            rng: Generator or seed for the random order
+            
+        Returns:
+            dict: Estimates, half-widths, convergence and data consumed
+                (see progressive.progressive_metrics)
+        """
+        if self.discretization_mode != 'sign' or self.discretization_options:
+            raise ValueError("Progressive metrics need the pointwise 'sign' discretization")
+        return progressive_metrics(signal, metrics, precision=precision, confidence=confidence,
+                                   order=order, rng=rng)
+    
+    def compute_golay_analysis(self, binary_signal):
+        """
+        Golay(24,12) syndrome statistics of the OffBit stream.
+        
+        Consecutive 24-bit words of the packed binary signal are checked
+        against the extended Golay code; coherent OffBits would show more
+        exact or correctable codewords than uniformly random bits.
+        
+        Args:
+            binary_signal: Binary signal array
+            
+        Returns:
+            dict: Codeword, correction and weight distribution metrics
+                (see golay.golay_analysis)
+        """
+        packed, n_bits = pack_bits(binary_signal)
+        return golay_analysis(packed, n_bits)
+    
+    def compute_randomness_metrics(self, binary_signal):
+        """
+        Sequential randomness metrics of the OffBit stream.
+        
+        Unlike NRCI, which only sees the fraction of ones, block entropies,
+        Lempel-Ziv complexity and the runs, serial and approximate entropy
+        tests respond to structure in the order of the bits.
+        
+        Args:
+            binary_signal: Binary signal array
+            
+        Returns:
+            dict: Entropy, complexity and test metrics
+                (see randomness_metrics.RandomnessSketch.results)
+        """
+        packed, n_bits = pack_bits(binary_signal)
+        return randomness_metrics(packed, n_bits)
+    
+    def compute_statistical_tests(self, signal, mode=None):
+        """
+        Run normality tests (KS, Anderson-Darling, Jarque-Bera) on the signal.
+        
+        Small signals are tested exactly; large signals are streamed in chunks
+        through a NormalitySketch, avoiding the O(N log N) sort and full copy.
+        
+        Args:
+            signal: Input signal
+            mode: 'exact', 'sketch' or 'auto' (defaults to self.normality_mode)
+            
+        Returns:
+            dict: Statistical test results
+        """
+        return normality_tests(
+            signal,
+            mode=mode or self.normality_mode,
+            exact_max_samples=self.exact_normality_max_samples
+        )
+    
+    def validate_noise_hypothesis(self, signal, sampling_rate, signal_name="Unknown",
+                                  compact=False, spectrum='none', spectrum_points=2048,
+                                  stages=None):
         """
         Comprehensive validation of the UBP Noise hypothesis.
         
@@ -262,12 +474,25 @@ class UBPNoiseValidator:
             signal: Input noise signal
             sampling_rate: Sampling rate in Hz
             signal_name: Name/description of the signal
+            compact: Return a ValidationResult instead of the nested dict
+            spectrum: Spectrum kept in compact mode: 'none', 'downsampled' or 'full'
+            spectrum_points: Number of log-spaced points when downsampling
+            stages: Optional subset of ANALYSIS_STAGES and OPTIONAL_STAGES to
+                run (default: ANALYSIS_STAGES); results of skipped stages are
+                omitted from the output
             
         Returns:
-            dict: Comprehensive validation results
+            dict or ValidationResult: Comprehensive validation results
         """
         print(f"\n=== UBP Noise Theory Validation: {signal_name} ===")
         
+        signal = self.as_signal(signal)
+        stages = set(ANALYSIS_STAGES if stages is None else stages)
+        unknown = stages.difference(ANALYSIS_STAGES + OPTIONAL_STAGES)
+        if unknown:
+            raise ValueError(f"Unknown analysis stages {sorted(unknown)}; "
+                             f"expected {ANALYSIS_STAGES + OPTIONAL_STAGES}")
+        
         # 1. Basic signal statistics
         signal_stats = {
             'mean': np.mean(signal),
@@ -278,56 +503,103 @@ class UBPNoiseValidator:
             'duration': len(signal) / sampling_rate
         }
         
+        results = {
+            'signal_name': signal_name,
+            'signal_stats': signal_stats
+        }
+        
         # 2. Convert to binary for OffBit analysis
-        binary_signal = self.discretize_signal(signal)
+        if stages.intersection(('coherence', 'toggle', 'golay', 'randomness')):
+            binary_signal = self.discretize_signal(signal)
         
         # 3. Coherence analysis
-        coherence_values, segment_positions = self.compute_coherence(binary_signal)
-        coherence_stats = {
-            'mean_coherence': np.mean(coherence_values),
-            'std_coherence': np.std(coherence_values),
-            'sub_coherent_fraction': np.sum(coherence_values < self.coherence_threshold) / len(coherence_values),
-            'toggle_detectable_fraction': np.sum(coherence_values > self.sub_coherent_threshold) / len(coherence_values)
-        }
+        if 'coherence' in stages:
+            coherence_values, segment_positions = self.compute_coherence(binary_signal)
+            results['coherence_analysis'] = {
+                'mean_coherence': np.mean(coherence_values),
+                'std_coherence': np.std(coherence_values),
+                'sub_coherent_fraction': np.sum(coherence_values < self.coherence_threshold) / len(coherence_values),
+                'toggle_detectable_fraction': np.sum(coherence_values > self.sub_coherent_threshold) / len(coherence_values)
+            }
         
         # 4. Frequency analysis
-        freq_analysis = self.analyze_resonance_frequencies(signal, sampling_rate)
+        if 'frequency' in stages:
+            results['frequency_analysis'] = self.analyze_resonance_frequencies(signal, sampling_rate)
         
         # 5. NRCI computation
-        nrci = self.compute_nrci(signal)
+        if 'nrci' in stages:
+            results['nrci'] = self.compute_nrci(signal)
         
         # 6. Toggle pattern analysis
-        toggle_analysis = self.analyze_toggle_patterns(binary_signal)
+        if 'toggle' in stages:
+            results['toggle_analysis'] = self.analyze_toggle_patterns(binary_signal)
         
-        # 7. Statistical tests
-        # Kolmogorov-Smirnov test against normal distribution
-        ks_stat, ks_pvalue = scipy.stats.kstest(signal, 'norm', args=(np.mean(signal), np.std(signal)))
+        # 7. Statistical tests (exact or streaming, depending on signal size)
+        if 'normality' in stages:
+            results['statistical_tests'] = self.compute_statistical_tests(signal)
         
-        # Anderson-Darling test for normality
-        ad_stat, ad_critical, ad_significance = scipy.stats.anderson(signal, dist='norm')
+        # 8. Golay(24,12) syndrome statistics (optional stage)
+        if 'golay' in stages:
+            results['golay_analysis'] = self.compute_golay_analysis(binary_signal)
         
-        results = {
-            'signal_name': signal_name,
-            'signal_stats': signal_stats,
-            'coherence_analysis': coherence_stats,
-            'frequency_analysis': freq_analysis,
-            'nrci': nrci,
-            'toggle_analysis': toggle_analysis,
-            'statistical_tests': {
-                'ks_statistic': ks_stat,
-                'ks_pvalue': ks_pvalue,
-                'ad_statistic': ad_stat,
-                'ad_critical_values': ad_critical,
-                'ad_significance_levels': ad_significance
-            }
-        }
+        # 9. Block entropy, Lempel-Ziv and NIST-style tests (optional stage)
+        if 'randomness' in stages:
+            results['randomness_analysis'] = self.compute_randomness_metrics(binary_signal)
         
-        # 8. UBP Theory Assessment
+        # 10. UBP Theory Assessment
         assessment = self.assess_ubp_compatibility(results)
         results['ubp_assessment'] = assessment
         
+        if compact:
+            return ValidationResult.from_results(results, spectrum=spectrum,
+                                                 spectrum_points=spectrum_points)
+        
         return results
     
+    def check_precision(self, signal, sampling_rate, stages=None):
+        """
+        Measure the accuracy of single-precision analysis against float64.
+        
+        The signal is validated under both precision policies and every
+        scalar summary metric is compared. Thresholding at zero makes the
+        binary stages (coherence, NRCI, toggles) exact unless samples lie
+        within float32 rounding of zero; spectral and moment statistics
+        typically agree to ~1e-6 relative error.
+        
+        Args:
+            signal: Input noise signal (float64 recommended as reference)
+            sampling_rate: Sampling rate in Hz
+            stages: Optional subset of ANALYSIS_STAGES
+            
+        Returns:
+            dict: 'metrics' (name -> (double, single, relative error)),
+                'max_relative_error' and 'resonances_match'
+        """
+        original = self.precision
+        summaries = {}
+        try:
+            for precision in ('double', 'single'):
+                self.precision = precision
+                results = self.validate_noise_hypothesis(signal, sampling_rate, f"Precision {precision}",
+                                                         stages=stages)
+                summaries[precision] = ValidationSummary.from_results(results)
+        finally:
+            self.precision = original
+        
+        metrics = {}
+        for name in ValidationSummary.__slots__:
+            double, single = getattr(summaries['double'], name), getattr(summaries['single'], name)
+            if isinstance(double, str) or not np.isfinite(double):
+                continue
+            scale = abs(double) if double != 0 else 1.0
+            metrics[name] = (double, single, abs(single - double) / scale)
+        
+        return {
+            'metrics': metrics,
+            'max_relative_error': max((error for _, _, error in metrics.values()), default=0.0),
+            'resonances_match': summaries['double'].detected_resonances == summaries['single'].detected_resonances
+        }
+    
     def assess_ubp_compatibility(self, results):
         """
         Assess how well the results align with UBP Noise theory predictions.
@@ -345,10 +617,14 @@ class UBPNoiseValidator:
             'confidence': 'low'
         }
         
-        coherence = results['coherence_analysis']
+        # Stages that were skipped (or restored as NaN) contribute no indicators
+        coherence = results.get('coherence_analysis') or {}
+        mean_coherence = coherence.get('mean_coherence', np.nan)
         
         # Check coherence predictions
-        if coherence['mean_coherence'] < self.coherence_threshold:
+        if np.isnan(mean_coherence):
+            pass
+        elif coherence['mean_coherence'] < self.coherence_threshold:
             assessment['compatible_indicators'].append(
                 f"Mean coherence ({coherence['mean_coherence']:.3f}) < threshold ({self.coherence_threshold}), consistent with sub-coherent toggles"
             )
@@ -359,14 +635,14 @@ class UBPNoiseValidator:
             )
         
         # Check for toggle detectability
-        if coherence['toggle_detectable_fraction'] > 0.2:  # At least 20% detectable
+        if coherence.get('toggle_detectable_fraction', np.nan) > 0.2:  # At least 20% detectable
             assessment['compatible_indicators'].append(
                 f"Toggle detectable fraction ({coherence['toggle_detectable_fraction']:.3f}) suggests structured activity"
             )
             assessment['overall_score'] += 1
         
         # Check NRCI
-        nrci = results['nrci']
+        nrci = results.get('nrci', np.nan)
         if nrci < self.nrci_threshold:
             assessment['compatible_indicators'].append(
                 f"NRCI ({nrci:.6f}) < threshold ({self.nrci_threshold}), consistent with incoherent toggles"
@@ -374,7 +650,7 @@ class UBPNoiseValidator:
             assessment['overall_score'] += 1
         
         # Check for resonance frequencies
-        detected_resonances = results['frequency_analysis']['detected_resonances']
+        detected_resonances = (results.get('frequency_analysis') or {}).get('detected_resonances')
         if detected_resonances:
             assessment['compatible_indicators'].append(
                 f"Detected UBP resonance frequencies: {list(detected_resonances.keys())}"
@@ -393,15 +669,43 @@ class UBPNoiseValidator:
         
         return assessment
     
-    def plot_analysis_results(self, results, save_path=None):
+    def plot_analysis_results(self, results, save_path=None, dpi=300, max_points=None):
         """
         Create comprehensive plots of the analysis results.
         
         Args:
             results: Validation results dictionary
             save_path: Optional path to save the plot
+            dpi: Resolution of the saved figure
+            max_points: Optional limit on plotted spectrum points (log-spaced
+                min/max decimation); None plots the full spectrum
         """
+        import matplotlib.pyplot as plt
+        
         fig, axes = plt.subplots(2, 3, figsize=(18, 12))
+        self.draw_analysis_axes(fig, axes, results, max_points=max_points)
+        
+        plt.tight_layout()
+        
+        if save_path:
+            plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
+            print(f"Analysis plot saved to: {save_path}")
+        
+        return fig
+    
+    def draw_analysis_axes(self, fig, axes, results, max_points=None):
+        """
+        Draw the six analysis panels into an existing 2x3 grid of axes.
+        
+        Uses only the object-oriented Matplotlib API, so the same figure can be
+        cleared and redrawn for many series (see fast_plotting.AnalysisPlotter).
+        
+        Args:
+            fig: Matplotlib figure owning the axes
+            axes: 2x3 array of axes
+            results: Validation results dictionary
+            max_points: Optional limit on plotted spectrum points
+        """
         fig.suptitle(f'UBP Noise Theory Analysis: {results["signal_name"]}', fontsize=16)
         
         # Plot 1: Coherence values
@@ -420,7 +724,11 @@ class UBPNoiseValidator:
         # Plot 2: Frequency spectrum
         freq_data = results['frequency_analysis']
         ax2 = axes[0, 1]
-        ax2.loglog(freq_data['frequencies'], freq_data['power_spectrum'])
+        if 'frequencies' in freq_data:
+            frequencies, power = freq_data['frequencies'], freq_data['power_spectrum']
+            if max_points is not None:
+                frequencies, power = downsample_spectrum(frequencies, power, max_points, method='minmax')
+            ax2.loglog(frequencies, power)
         ax2.set_title('Power Spectral Density')
         ax2.set_xlabel('Frequency (Hz)')
         ax2.set_ylabel('Power')
@@ -428,6 +736,8 @@ class UBPNoiseValidator:
         
         # Mark detected resonances
         for name, resonance in freq_data['detected_resonances'].items():
+            if 'detected_freq' not in resonance:
+                continue
             ax2.axvline(x=resonance['detected_freq'], color='red', linestyle='--', alpha=0.7)
             ax2.text(resonance['detected_freq'], resonance['power'], name, rotation=90)
         
@@ -439,7 +749,7 @@ class UBPNoiseValidator:
         ax3.bar(toggle_metrics, toggle_values)
         ax3.set_title('Toggle Pattern Analysis')
         ax3.set_ylabel('Value')
-        plt.setp(ax3.get_xticklabels(), rotation=45)
+        ax3.tick_params(axis='x', labelrotation=45)
         
         # Plot 4: UBP Assessment
         assessment = results['ubp_assessment']
@@ -475,14 +785,6 @@ class UBPNoiseValidator:
         ax6.text(0.1, 0.8, stats_text, fontsize=12, transform=ax6.transAxes, verticalalignment='top')
         ax6.set_title('Signal Statistics')
         ax6.axis('off')
-        
-        plt.tight_layout()
-        
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Analysis plot saved to: {save_path}")
-        
-        return fig
 
 # Example usage and testing functions
 def test_thermal_noise():
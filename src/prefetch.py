@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Prefetching Reader for Overlapping I/O and Validation
+
+ChunkPrefetcher runs the reads of a chunked input on a background thread and
+hands decoded chunks to the consumer through a bounded queue:
+
+    reader thread:  read k+1 | read k+2 | (blocked: queue full) | read k+3
+    consumer:       validate k          | validate k+1          | ...
+
+h5py, NumPy file reads and decompression release the GIL for the actual
+I/O, so disk and network latency are hidden behind the validation of the
+previous chunks. `depth` bounds the decoded chunks waiting in the queue and
+`read_ahead` coalesces consecutive chunks into one larger read; at most
+depth + read_ahead chunks are held in memory at any time.
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+import queue
+import threading
+import time
+
+# Default number of decoded chunks waiting for the consumer
+DEFAULT_PREFETCH_DEPTH = 2
+
+# Sentinel marking the end of the chunk stream
+_DONE = object()
+
+
+class _ReadFailure:
+    """Exception raised by the reader, re-raised in the consumer."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _read_groups(chunks, read_ahead):
+    """Group consecutive, contiguous chunks into single reads."""
+    group = []
+    for start, stop in chunks:
+        if group and (len(group) >= read_ahead or start != group[-1][1]):
+            yield group
+            group = []
+        group.append((start, stop))
+    if group:
+        yield group
+
+
+def contiguous_chunks(indices, chunk_size):
+    """Split sorted indices into (start, stop) runs of at most chunk_size series."""
+    chunks = []
+    start = previous = None
+    for index in indices:
+        if start is None:
+            start = previous = index
+        elif index != previous + 1 or index - start >= chunk_size:
+            chunks.append((start, previous + 1))
+            start = index
+        previous = index
+    if start is not None:
+        chunks.append((start, previous + 1))
+    return chunks
+
+
+class ChunkPrefetcher:
+    """
+    Iterator over (start, stop, rows) for a list of chunks, read ahead on a thread.
+
+    Usage:
+        with ChunkPrefetcher(source.read, [(0, 8), (8, 16)], depth=2) as chunks:
+            for start, stop, rows in chunks:
+                ...
+    """
+
+    def __init__(self, read, chunks, depth=DEFAULT_PREFETCH_DEPTH, read_ahead=1):
+        """
+        Args:
+            read: Callable read(start, stop) returning rows [start, stop)
+            chunks: Sequence of (start, stop) pairs, in consumption order
+            depth: Maximum decoded chunks waiting in the queue
+            read_ahead: Maximum consecutive chunks fetched by one read call
+        """
+        if depth < 1 or read_ahead < 1:
+            raise ValueError("depth and read_ahead must be at least 1")
+        self.read = read
+        self.chunks = list(chunks)
+        self.depth = int(depth)
+        self.read_ahead = int(read_ahead)
+        self.stats = {'reads': 0, 'read_seconds': 0.0, 'reader_blocked_seconds': 0.0,
+                      'consumer_wait_seconds': 0.0}
+        self._queue = queue.Queue(maxsize=self.depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='chunk-prefetch', daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        """Queue an item, giving up when the consumer has closed the prefetcher."""
+        blocked = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        self.stats['reader_blocked_seconds'] += time.perf_counter() - blocked
+        return not self._stop.is_set()
+
+    def _run(self):
+        """Reader thread: read each group, split it into chunks and queue them."""
+        try:
+            for group in _read_groups(self.chunks, self.read_ahead):
+                if self._stop.is_set():
+                    return
+                started = time.perf_counter()
+                rows = self.read(group[0][0], group[-1][1])
+                self.stats['read_seconds'] += time.perf_counter() - started
+                self.stats['reads'] += 1
+                offset = group[0][0]
+                for start, stop in group:
+                    if not self._put((start, stop, rows[start - offset:stop - offset])):
+                        return
+        except Exception as error:
+            self._put(_ReadFailure(error))
+            return
+        self._put(_DONE)
+
+    def __iter__(self):
+        while True:
+            waited = time.perf_counter()
+            item = self._queue.get()
+            self.stats['consumer_wait_seconds'] += time.perf_counter() - waited
+            if item is _DONE:
+                return
+            if isinstance(item, _ReadFailure):
+                raise item.error
+            yield item
+
+    def close(self):
+        """Stop the reader and release queued chunks."""
+        self._stop.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def prefetch_series(read, indices, chunk_size, depth=DEFAULT_PREFETCH_DEPTH, read_ahead=1):
+    """
+    Iterate over individual series of sorted indices, read ahead in chunks.
+
+    Args:
+        read: Callable read(start, stop) returning rows [start, stop)
+        indices: Sorted series indices
+        chunk_size: Series per chunk
+        depth: Maximum decoded chunks waiting in the queue
+        read_ahead: Maximum consecutive chunks fetched by one read call
+
+    Yields:
+        tuple: (series index, 1-D series)
+    """
+    with ChunkPrefetcher(read, contiguous_chunks(indices, chunk_size), depth=depth,
+                         read_ahead=read_ahead) as prefetcher:
+        for start, stop, rows in prefetcher:
+            for offset, series in enumerate(rows):
+                yield start + offset, series
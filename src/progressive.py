@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Progressive-Precision Estimation of the Bit-Level Metrics
+
+On long captures NRCI and mean coherence are usually needed only to about
+1e-4, which a small fraction of the samples already gives. progressive_metrics()
+treats the signal as K adjacent segment pairs (the units of
+UBPNoiseValidator.compute_coherence()) and visits them in growing batches:
+
+1. Order: a random permutation of the K pairs, or 'strided', the
+   bit-reversal permutation (every batch refines a regular stride, so early
+   batches cover the whole capture)
+2. Per pair j: coherence c_j = |seg_j AND seg_j+1| / L, bit mean and toggle
+   rate of seg_j (toggles up to the first sample of seg_j+1)
+3. After each batch: mean and confidence half-width of every metric,
+   z * s / sqrt(k) * sqrt(1 - k / K) (finite population correction, so the
+   half-width reaches 0 once every pair is read)
+4. Stop as soon as every requested metric is within its target precision;
+   batches grow geometrically, so the number of checks stays logarithmic
+
+Only the segments of visited pairs are read and discretized, so memory-mapped
+captures are read sparsely. With every pair consumed, mean coherence equals
+the validator's; bit mean and toggle rate then cover all but the last segment.
+The half-widths assume random sampling and are approximate for 'strided'.
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+
+# Metrics estimated by progressive_metrics()
+PROGRESSIVE_METRICS = ('nrci', 'mean_coherence', 'bit_mean', 'toggle_rate')
+
+# Segment length of UBPNoiseValidator.compute_coherence()
+DEFAULT_SEGMENT_LENGTH = 2000
+
+# Pairs in the first batch and growth factor of the total per batch
+DEFAULT_INITIAL_PAIRS = 32
+DEFAULT_GROWTH = 2.0
+
+
+def strided_order(n):
+    """
+    Bit-reversal permutation of range(n).
+
+    Args:
+        n: Number of units
+
+    Returns:
+        numpy.ndarray: int64 permutation; every prefix of length 2^m is spread evenly
+    """
+    if n <= 1:
+        return np.arange(n, dtype=np.int64)
+    n_bits = int(np.ceil(np.log2(n)))
+    values = np.arange(1 << n_bits, dtype=np.int64)
+    reversed_values = np.zeros_like(values)
+    for bit in range(n_bits):
+        reversed_values |= ((values >> bit) & 1) << (n_bits - 1 - bit)
+    return reversed_values[reversed_values < n]
+
+
+def _pair_values(signal, pairs, segment_length, threshold):
+    """Per-pair coherence, bit mean and toggle rate for the given pair indices."""
+    segments = np.asarray(signal)[:(len(signal) // segment_length) * segment_length]
+    segments = segments.reshape(-1, segment_length)
+    first = segments[pairs] > threshold
+    second = segments[pairs + 1] > threshold
+
+    coherence = np.count_nonzero(first & second, axis=1) / segment_length
+    bit_mean = np.count_nonzero(first, axis=1) / segment_length
+    toggles = np.count_nonzero(first[:, 1:] != first[:, :-1], axis=1) + (first[:, -1] != second[:, 0])
+    return {'mean_coherence': coherence, 'bit_mean': bit_mean, 'toggle_rate': toggles / segment_length}
+
+
+def progressive_metrics(signal, metrics=('nrci', 'mean_coherence'), precision=1e-4, confidence=0.95,
+                        order='random', threshold=0.0, segment_length=DEFAULT_SEGMENT_LENGTH,
+                        initial_pairs=DEFAULT_INITIAL_PAIRS, growth=DEFAULT_GROWTH, rng=None):
+    """
+    Estimate bit-level metrics from a growing sample of the signal.
+
+    Args:
+        signal: Input signal (array or memmap)
+        metrics: Subset of PROGRESSIVE_METRICS that must reach the precision
+        precision: Target confidence half-width, a float or a dict per metric
+            (metrics missing from the dict have no target)
+        confidence: Confidence level of the half-widths
+        order: 'random' or 'strided'
+        threshold: OffBit threshold (signal > threshold; 0 is the validator's 'sign' mode)
+        segment_length: Samples per segment
+        initial_pairs: Segment pairs in the first batch
+        growth: Factor by which the consumed pairs grow per batch
+        rng: Generator or seed for the random order
+
+    Returns:
+        dict: 'estimates' and 'half_widths' (all PROGRESSIVE_METRICS),
+            'converged', 'pairs_used', 'total_pairs', 'samples_consumed',
+            'fraction_consumed' and 'batches'
+    """
+    unknown = set(metrics).difference(PROGRESSIVE_METRICS)
+    if unknown:
+        raise ValueError(f"Unknown progressive metrics {sorted(unknown)}; expected {PROGRESSIVE_METRICS}")
+    if order not in ('random', 'strided'):
+        raise ValueError(f"Unknown order '{order}'; expected 'random' or 'strided'")
+    if growth <= 1:
+        raise ValueError(f"growth must be greater than 1, got {growth}")
+    if isinstance(precision, dict):
+        unknown = set(precision).difference(PROGRESSIVE_METRICS)
+        if unknown:
+            raise ValueError(f"Unknown progressive metrics {sorted(unknown)}; expected {PROGRESSIVE_METRICS}")
+        targets = {name: precision[name] for name in metrics if name in precision}
+    else:
+        targets = {name: precision for name in metrics}
+    total_pairs = len(signal) // segment_length - 1
+    if total_pairs < 2:
+        raise ValueError(f"Need at least 3 segments of {segment_length} samples, got {len(signal)} samples")
+
+    # 1. Visiting order of the segment pairs
+    if order == 'random':
+        generator = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+        visit = generator.permutation(total_pairs)
+    else:
+        visit = strided_order(total_pairs)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    # 2. Running sums per metric over the consumed pairs
+    sums = {name: 0.0 for name in ('mean_coherence', 'bit_mean', 'toggle_rate')}
+    squares = dict(sums)
+    used = 0
+    batches = 0
+    while True:
+        stop = min(total_pairs, max(used + 1, int(initial_pairs if used == 0 else used * growth)))
+        values = _pair_values(signal, visit[used:stop], segment_length, threshold)
+        for name, column in values.items():
+            sums[name] += float(column.sum())
+            squares[name] += float(np.dot(column, column))
+        used = stop
+        batches += 1
+
+        # 3. Means and finite-population confidence half-widths
+        estimates, half_widths = {}, {}
+        for name in sums:
+            mean = sums[name] / used
+            variance = max(squares[name] / used - mean**2, 0.0) * used / max(used - 1, 1)
+            estimates[name] = mean
+            half_widths[name] = float(z * np.sqrt(variance / used * (1 - used / total_pairs)))
+        estimates['nrci'] = 1 - abs(estimates['bit_mean'] - 0.5) / 0.5
+        half_widths['nrci'] = 2 * half_widths['bit_mean']
+
+        # 4. Stop once every requested metric is precise enough
+        converged = all(half_widths[name] <= target for name, target in targets.items())
+        if converged or used == total_pairs:
+            break
+
+    # Segments read: both segments of every consumed pair
+    touched = np.zeros(total_pairs + 1, dtype=bool)
+    touched[visit[:used]] = True
+    touched[visit[:used] + 1] = True
+    samples = int(np.count_nonzero(touched)) * segment_length
+    return {
+        'estimates': estimates,
+        'half_widths': half_widths,
+        'converged': converged,
+        'pairs_used': used,
+        'total_pairs': total_pairs,
+        'samples_consumed': samples,
+        'fraction_consumed': samples / len(signal),
+        'batches': batches
+    }
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Randomness Metrics on Bit-Packed OffBit Streams
+
+compute_nrci() only sees the fraction of ones, so a stream such as
+0101... or 00110011... scores as perfectly random. This module measures
+sequential structure on streams packed by bitstream.pack_bits:
+
+1. Window histogram: counts of the overlapping 16-bit windows at every bit
+   position. Each byte-aligned 24-bit word yields two 19-bit windows (bit
+   offsets 0 and 4), counted with bincount into 2^19 bins; every 19-bit
+   window contains four 16-bit windows, recovered by summing the histogram
+   over the leading and trailing bits. Only the last few bits are unpacked.
+2. Block counts: with the stream closed into a circle (as in NIST SP 800-22),
+   the counts of every block size m <= 16 are marginals of the 16-bit
+   histogram, so block entropies H_1..H_16, the runs, serial and approximate
+   entropy tests all come from one pass.
+3. Lempel-Ziv complexity: LZ76 phrase count (Kaspar-Schuster) of blocks of
+   `lz_block_bits` bits, one block every `lz_spacing` bits of the stream.
+   The parse is sequential, so it is sampled rather than run on every bit;
+   c log2(L) / L is close to 1 for random bits and small for structured ones.
+
+RandomnessSketch keeps the histogram, the first and last 15 bits and the LZ
+sums. Sketches of consecutive chunks merge exactly (the windows across the
+boundary are counted from the stored edge bits), so chunked, out-of-core
+and multi-worker runs give the same block statistics as a single pass.
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+import math
+
+import numpy as np
+
+# Largest block size; the histogram holds the overlapping 16-bit windows
+MAX_BLOCK_BITS = 16
+EDGE_BITS = MAX_BLOCK_BITS - 1
+
+# Counted windows: 19 bits at bit offsets 0 and 4 of each byte-aligned 24-bit word
+COUNTED_WINDOW_BITS = 19
+COUNTED_WINDOW_OFFSETS = (0, 4)
+
+# Bytes per kernel block (bounds the two int64 temporaries to 16 MB)
+DEFAULT_BLOCK_BYTES = 1 << 20
+
+# Lempel-Ziv blocks: length and spacing in bits
+DEFAULT_LZ_BLOCK_BITS = 4096
+DEFAULT_LZ_SPACING = 1 << 23
+
+WINDOW_WEIGHTS = 1 << np.arange(MAX_BLOCK_BITS - 1, -1, -1, dtype=np.int64)
+
+
+def _window_values(bits):
+    """Values of the overlapping 16-bit windows of a short 0/1 array."""
+    if bits.size < MAX_BLOCK_BITS:
+        return np.empty(0, dtype=np.int64)
+    windows = np.lib.stride_tricks.sliding_window_view(bits.astype(np.int64), MAX_BLOCK_BITS)
+    return windows @ WINDOW_WEIGHTS
+
+
+def _bit_range(packed, start, stop):
+    """Bits [start, stop) of a packed stream as a 0/1 uint8 array."""
+    if stop <= start:
+        return np.empty(0, dtype=np.uint8)
+    chunk = np.unpackbits(packed[start // 8:(stop + 7) // 8])
+    return chunk[start % 8:start % 8 + stop - start]
+
+
+def window_histogram(packed, n_bits, block_bytes=DEFAULT_BLOCK_BYTES):
+    """
+    Counts of the overlapping 16-bit windows lying entirely in the stream.
+
+    Args:
+        packed: Packed uint8 array (big-endian bit order)
+        n_bits: Number of valid bits
+        block_bytes: Bytes per kernel block
+
+    Returns:
+        numpy.ndarray: int64 counts indexed by window value (first bit most
+            significant); sums to max(n_bits - 15, 0)
+    """
+    packed = np.asarray(packed, dtype=np.uint8)
+    window_mask = (1 << COUNTED_WINDOW_BITS) - 1
+    spare_bits = COUNTED_WINDOW_BITS - MAX_BLOCK_BITS
+
+    # 1. Words whose eight window starts all fit: 8 i + 7 <= n_bits - 16
+    n_words = max(0, (n_bits - 23) // 8 + 1)
+    counted = [np.zeros(1 << COUNTED_WINDOW_BITS, dtype=np.int64) for _ in COUNTED_WINDOW_OFFSETS]
+    if n_words:
+        block = min(block_bytes, n_words)
+        words = np.empty(block, dtype=np.intp)
+        shifted = np.empty(block, dtype=np.intp)
+        for start in range(0, n_words, block):
+            stop = min(start + block, n_words)
+            word, temp = words[:stop - start], shifted[:stop - start]
+            np.left_shift(packed[start:stop], 16, out=word, dtype=np.intp, casting='unsafe')
+            np.left_shift(packed[start + 1:stop + 1], 8, out=temp, dtype=np.intp, casting='unsafe')
+            word |= temp
+            word |= packed[start + 2:stop + 2]
+            for histogram, offset in zip(counted, COUNTED_WINDOW_OFFSETS):
+                np.right_shift(word, 24 - offset - COUNTED_WINDOW_BITS, out=temp)
+                temp &= window_mask
+                histogram += np.bincount(temp, minlength=1 << COUNTED_WINDOW_BITS)
+
+    # 2. 16-bit windows at shifts 0-3 inside each 19-bit window
+    counts = np.zeros(1 << MAX_BLOCK_BITS, dtype=np.int64)
+    if n_words:
+        for histogram in counted:
+            for shift in range(spare_bits + 1):
+                blocks = histogram.reshape(1 << shift, 1 << MAX_BLOCK_BITS, 1 << (spare_bits - shift))
+                counts += blocks.sum(axis=(0, 2))
+
+    # 3. Remaining window starts (at most eight) from unpacked tail bits
+    tail = _bit_range(packed, 8 * n_words, n_bits)
+    counts += np.bincount(_window_values(tail), minlength=1 << MAX_BLOCK_BITS)
+    return counts
+
+
+def lempel_ziv_phrases(bits):
+    """
+    Number of LZ76 phrases (Kaspar-Schuster complexity counter).
+
+    Args:
+        bits: 0/1 uint8 array or bytes
+
+    Returns:
+        int: Phrase count c(n)
+    """
+    sequence = bytes(np.asarray(bits, dtype=np.uint8)) if not isinstance(bits, bytes) else bits
+    n = len(sequence)
+    position = 0
+    phrases = 0
+    while position < n:
+        # Extend the phrase while it still occurs earlier; the first
+        # occurrence of a longer phrase never precedes that of its prefix
+        length = 1
+        found = 0
+        while position + length <= n:
+            found = sequence.find(sequence[position:position + length], found, position + length - 1)
+            if found < 0:
+                break
+            length += 1
+        phrases += 1
+        position += length
+    return phrases
+
+
+def _igamc(a, x):
+    """Regularized upper incomplete gamma function (NIST igamc)."""
+    from scipy.special import gammaincc
+
+    return float(gammaincc(a, x))
+
+
+class RandomnessSketch:
+    """
+    Mergeable block statistics and Lempel-Ziv sums of a packed bit stream.
+
+    Usage:
+        sketch = RandomnessSketch()
+        for packed, n_bits in chunks:
+            sketch.update(packed, n_bits)
+        metrics = sketch.results()
+    """
+
+    def __init__(self, lz_block_bits=DEFAULT_LZ_BLOCK_BITS, lz_spacing=DEFAULT_LZ_SPACING):
+        """
+        Args:
+            lz_block_bits: Bits per Lempel-Ziv block (0 disables the LZ metric)
+            lz_spacing: Bits between the starts of consecutive LZ blocks
+        """
+        if lz_block_bits and lz_spacing < lz_block_bits:
+            raise ValueError(f"lz_spacing ({lz_spacing}) must be at least lz_block_bits ({lz_block_bits})")
+        self.lz_block_bits = int(lz_block_bits)
+        self.lz_spacing = int(lz_spacing)
+        self.n_bits = 0
+        self.windows = np.zeros(1 << MAX_BLOCK_BITS, dtype=np.int64)
+        self.head = np.empty(0, dtype=np.uint8)
+        self.tail = np.empty(0, dtype=np.uint8)
+        self.lz_phrases = 0
+        self.lz_blocks = 0
+        self.lz_pending = np.empty(0, dtype=np.uint8)
+
+    def update(self, packed, n_bits):
+        """
+        Add the next chunk of the stream.
+
+        Args:
+            packed: Packed uint8 array
+            n_bits: Number of valid bits in the chunk
+
+        Returns:
+            RandomnessSketch: self, for chaining
+        """
+        packed = np.asarray(packed, dtype=np.uint8)
+        chunk = RandomnessSketch(self.lz_block_bits, self.lz_spacing)
+        chunk.n_bits = int(n_bits)
+        chunk.windows = window_histogram(packed, n_bits)
+        chunk.head = _bit_range(packed, 0, min(EDGE_BITS, n_bits))
+        chunk.tail = _bit_range(packed, max(n_bits - EDGE_BITS, 0), n_bits)
+
+        # LZ blocks start at multiples of lz_spacing of this sketch's stream;
+        # a block cut by the chunk end is completed by the next update
+        if self.lz_block_bits:
+            blocks = []
+            if self.lz_pending.size:
+                missing = self.lz_block_bits - self.lz_pending.size
+                blocks.append(np.concatenate([self.lz_pending, _bit_range(packed, 0, min(missing, n_bits))]))
+            first = -(-self.n_bits // self.lz_spacing) * self.lz_spacing - self.n_bits
+            blocks.extend(_bit_range(packed, start, min(start + self.lz_block_bits, n_bits))
+                          for start in range(first, n_bits, self.lz_spacing))
+            for block in blocks:
+                if block.size < self.lz_block_bits:
+                    chunk.lz_pending = block
+                else:
+                    chunk.lz_phrases += lempel_ziv_phrases(block)
+                    chunk.lz_blocks += 1
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """
+        Append the sketch of the chunk that follows this one.
+
+        Block statistics merge exactly; an LZ block still open at the end of
+        this sketch is dropped, since the other sketch's blocks are aligned
+        to its own start.
+
+        Args:
+            other: RandomnessSketch of the next part of the stream
+
+        Returns:
+            RandomnessSketch: self, for chaining
+        """
+        if (other.lz_block_bits, other.lz_spacing) != (self.lz_block_bits, self.lz_spacing):
+            raise ValueError("Cannot merge sketches with different Lempel-Ziv settings")
+        boundary = np.concatenate([self.tail, other.head])
+        self.windows += other.windows
+        self.windows += np.bincount(_window_values(boundary), minlength=1 << MAX_BLOCK_BITS)
+        self.head = np.concatenate([self.head, other.head])[:EDGE_BITS]
+        self.tail = np.concatenate([self.tail, other.tail])[-EDGE_BITS:]
+        self.n_bits += other.n_bits
+        self.lz_phrases += other.lz_phrases
+        self.lz_blocks += other.lz_blocks
+        self.lz_pending = other.lz_pending
+        return self
+
+    def circular_windows(self):
+        """Counts of the n_bits 16-bit windows of the stream closed into a circle."""
+        if self.n_bits < MAX_BLOCK_BITS:
+            # Short stream: head holds every bit; windows wrap more than once
+            positions = np.arange(self.n_bits)[:, np.newaxis] + np.arange(MAX_BLOCK_BITS)
+            values = self.head[positions % max(self.n_bits, 1)].astype(np.int64) @ WINDOW_WEIGHTS
+            return np.bincount(values, minlength=1 << MAX_BLOCK_BITS)
+        wrapped = np.concatenate([self.tail, self.head])
+        return self.windows + np.bincount(_window_values(wrapped), minlength=1 << MAX_BLOCK_BITS)
+
+    def block_counts(self, max_block=MAX_BLOCK_BITS):
+        """
+        Circular overlapping block counts for block sizes 1 to max_block.
+
+        Args:
+            max_block: Largest block size (<= 16)
+
+        Returns:
+            list: counts[m - 1] is the int64 array of the 2^m m-bit block counts
+        """
+        counts = self.circular_windows()
+        by_size = [counts]
+        for _ in range(MAX_BLOCK_BITS - 1):
+            by_size.append(by_size[-1].reshape(-1, 2).sum(axis=1))
+        return by_size[::-1][:max_block]
+
+    def results(self, max_block=MAX_BLOCK_BITS, serial_block=None, apen_block=None):
+        """
+        Block entropies, Lempel-Ziv complexity and NIST-style tests.
+
+        Args:
+            max_block: Largest block size for the entropies (<= 16)
+            serial_block: Block size m of the serial test (default:
+                floor(log2 n) - 3, clipped to 2-16)
+            apen_block: Block size m of the approximate entropy test
+                (default: floor(log2 n) - 6, clipped to 1-15)
+
+        Returns:
+            dict: 'n_bits', 'bit_mean', 'block_entropy' (H_1..H_max_block in
+                bits), 'entropy_per_bit' (H_m / m), 'entropy_rate'
+                (H_m - H_m-1), 'lz_complexity' (normalized, NaN without LZ
+                blocks), 'lz_blocks', 'runs', 'frequency_p_value',
+                'runs_p_value', 'serial_block', 'serial_statistics',
+                'serial_p_values', 'apen_block', 'approximate_entropy'
+                and 'apen_p_value'
+        """
+        n = self.n_bits
+        if n < 2:
+            raise ValueError(f"Need at least 2 bits, got {n}")
+        log_n = int(math.floor(math.log2(n)))
+        serial_block = min(MAX_BLOCK_BITS, max(2, log_n - 3)) if serial_block is None else serial_block
+        apen_block = min(MAX_BLOCK_BITS - 1, max(1, log_n - 6)) if apen_block is None else apen_block
+        if not 1 <= max_block <= MAX_BLOCK_BITS or not 2 <= serial_block <= MAX_BLOCK_BITS \
+                or not 1 <= apen_block < MAX_BLOCK_BITS:
+            raise ValueError(f"Block sizes must lie within 1-{MAX_BLOCK_BITS} "
+                             f"(serial test >= 2, approximate entropy < {MAX_BLOCK_BITS})")
+        counts = self.block_counts()
+
+        # 1. Block entropies and Lempel-Ziv complexity
+        entropies = np.empty(max_block)
+        for m in range(1, max_block + 1):
+            frequencies = counts[m - 1][counts[m - 1] > 0] / n
+            entropies[m - 1] = -np.dot(frequencies, np.log2(frequencies))
+        lz_complexity = (self.lz_phrases / self.lz_blocks * math.log2(self.lz_block_bits) / self.lz_block_bits
+                         if self.lz_blocks else np.nan)
+
+        # 2. Frequency and runs tests (SP 800-22 sections 2.1 and 2.3)
+        ones = int(counts[0][1])
+        proportion = ones / n
+        transitions = int(counts[1][1] + counts[1][2]) - int(self.tail[-1] != self.head[0])
+        runs = transitions + 1
+        frequency_p = math.erfc(abs(2 * ones - n) / math.sqrt(2 * n))
+        if abs(proportion - 0.5) >= 2 / math.sqrt(n):
+            runs_p = 0.0
+        else:
+            spread = 2 * n * proportion * (1 - proportion)
+            runs_p = math.erfc(abs(runs - spread) / (2 * math.sqrt(2 * n) * proportion * (1 - proportion)))
+
+        # 3. Serial test (section 2.11): psi^2_m = 2^m / n sum(c^2) - n
+        def psi_squared(m):
+            if m <= 0:
+                return 0.0
+            block = counts[m - 1].astype(np.float64)
+            return float(2**m / n * np.dot(block, block) - n)
+
+        psi = [psi_squared(serial_block - lag) for lag in range(3)]
+        delta = psi[0] - psi[1]
+        delta2 = psi[0] - 2 * psi[1] + psi[2]
+        serial_p = (_igamc(2**(serial_block - 2), delta / 2), _igamc(2**(serial_block - 3), delta2 / 2))
+
+        # 4. Approximate entropy test (section 2.12): phi_m = sum(p ln p)
+        def phi(m):
+            if m <= 0:
+                return 0.0
+            frequencies = counts[m - 1][counts[m - 1] > 0] / n
+            return float(np.dot(frequencies, np.log(frequencies)))
+
+        apen = phi(apen_block) - phi(apen_block + 1)
+        chi_squared = 2 * n * (math.log(2) - apen)
+        return {
+            'n_bits': n,
+            'bit_mean': proportion,
+            'block_entropy': entropies,
+            'entropy_per_bit': entropies / np.arange(1, max_block + 1),
+            'entropy_rate': np.diff(entropies, prepend=0.0),
+            'lz_complexity': lz_complexity,
+            'lz_blocks': self.lz_blocks,
+            'runs': runs,
+            'frequency_p_value': frequency_p,
+            'runs_p_value': runs_p,
+            'serial_block': serial_block,
+            'serial_statistics': (delta, delta2),
+            'serial_p_values': serial_p,
+            'apen_block': apen_block,
+            'approximate_entropy': apen,
+            'apen_p_value': _igamc(2**(apen_block - 1), chi_squared / 2)
+        }
+
+
+def randomness_metrics(packed, n_bits, chunk_bits=None, lz_block_bits=DEFAULT_LZ_BLOCK_BITS,
+                       lz_spacing=DEFAULT_LZ_SPACING, **kwargs):
+    """
+    Randomness metrics of a packed OffBit stream.
+
+    Args:
+        packed: Packed uint8 array
+        n_bits: Number of valid bits
+        chunk_bits: Bits per update (a multiple of 8; default: one update)
+        lz_block_bits: Bits per Lempel-Ziv block (0 disables the LZ metric)
+        lz_spacing: Bits between the starts of consecutive LZ blocks
+        **kwargs: Passed to RandomnessSketch.results()
+
+    Returns:
+        dict: See RandomnessSketch.results()
+    """
+    sketch = RandomnessSketch(lz_block_bits, lz_spacing)
+    chunk_bits = n_bits if not chunk_bits else chunk_bits
+    if chunk_bits % 8 and chunk_bits < n_bits:
+        raise ValueError(f"chunk_bits must be a multiple of 8, got {chunk_bits}")
+    for start in range(0, n_bits, chunk_bits):
+        sketch.update(packed[start // 8:(start + chunk_bits + 7) // 8], min(chunk_bits, n_bits - start))
+    return sketch.results(**kwargs)
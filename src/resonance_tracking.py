@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Time-Resolved Resonance Tracking
+
+analyze_resonance_frequencies() looks at one global spectrum, so transient
+resonances are averaged away. ResonanceTracker computes short-time spectra
+(Hann-window STFT or DPSS multitaper) over chunked input and keeps only the
+power in a band around each UBP target frequency:
+
+    times x targets   band power and significance (band PSD / frame mean PSD)
+
+Windows and tapers are built once per tracker and every FFT has the same
+length, so SciPy's FFT plan cache is reused for all frames. Memory is bounded
+by the carry-over buffer (< nperseg samples) plus one batch of frames; full
+spectrograms are never stored.
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+import numpy as np
+
+# Frames transformed per batched FFT call
+DEFAULT_FRAMES_PER_BATCH = 64
+
+
+class ResonanceTracker:
+    """
+    Streaming short-time band-power tracker for a set of target frequencies.
+
+    Usage:
+        tracker = ResonanceTracker(1e6, {'line': 50e3}, nperseg=4096)
+        for chunk in chunks:
+            tracker.update(chunk)
+        table = tracker.result()
+    """
+
+    def __init__(self, sampling_rate, targets, nperseg=4096, noverlap=None, method='stft',
+                 tolerance=0.1, n_tapers=4, time_bandwidth=2.5,
+                 frames_per_batch=DEFAULT_FRAMES_PER_BATCH):
+        """
+        Args:
+            sampling_rate: Sampling rate in Hz
+            targets: Dict name -> target frequency in Hz
+            nperseg: Samples per frame
+            noverlap: Overlap between frames (default: nperseg // 2)
+            method: 'stft' (Hann window) or 'multitaper' (DPSS tapers)
+            tolerance: Relative half-width of each target band (0.1 = +/-10%)
+            n_tapers: Number of DPSS tapers for 'multitaper'
+            time_bandwidth: DPSS time-half-bandwidth product NW
+            frames_per_batch: Frames per batched FFT (bounds working memory)
+        """
+        from scipy.fft import rfftfreq
+        from scipy.signal import get_window
+        from scipy.signal.windows import dpss
+
+        self.sampling_rate = float(sampling_rate)
+        self.nperseg = int(nperseg)
+        self.step = self.nperseg - (self.nperseg // 2 if noverlap is None else int(noverlap))
+        if self.step <= 0:
+            raise ValueError("noverlap must be smaller than nperseg")
+        self.method = method
+        self.frames_per_batch = frames_per_batch
+
+        # Windows (K x nperseg) and PSD scaling are computed once
+        if method == 'stft':
+            self.windows = get_window('hann', self.nperseg)[np.newaxis, :]
+        elif method == 'multitaper':
+            self.windows = dpss(self.nperseg, time_bandwidth, Kmax=n_tapers)
+        else:
+            raise ValueError(f"Unknown method '{method}'; expected 'stft' or 'multitaper'")
+        self.scale = 1.0 / (self.sampling_rate * np.sum(self.windows**2, axis=1))
+
+        # Frequency bins inside each target band
+        frequencies = rfftfreq(self.nperseg, 1 / self.sampling_rate)
+        self.df = frequencies[1]
+        self.target_names = list(targets)
+        self.target_freqs = np.array([targets[name] for name in self.target_names], dtype=np.float64)
+        self.bands = []
+        for freq in self.target_freqs:
+            in_band = np.flatnonzero((frequencies > 0) & (np.abs(frequencies - freq) <= tolerance * freq))
+            self.bands.append(in_band)
+        self.resolvable = np.array([band.size > 0 for band in self.bands])
+
+        self._carry = np.zeros(0)
+        self._n_frames = 0
+        self._band_power = []
+        self._significance = []
+
+    def _process(self, frames):
+        """Band power and significance of a batch of frames."""
+        from scipy.fft import rfft
+
+        frames = frames - frames.mean(axis=1, keepdims=True)
+        spectra = rfft(frames[:, np.newaxis, :] * self.windows, axis=-1)
+        psd = (spectra.real**2 + spectra.imag**2) * self.scale[:, np.newaxis]
+        psd = psd.mean(axis=1)
+        psd[:, 1:] *= 2  # one-sided
+        if self.nperseg % 2 == 0:
+            psd[:, -1] /= 2
+
+        mean_psd = psd[:, 1:].mean(axis=1)
+        band_power = np.full((len(frames), len(self.bands)), np.nan)
+        significance = np.full_like(band_power, np.nan)
+        for column, band in enumerate(self.bands):
+            if band.size:
+                band_psd = psd[:, band]
+                band_power[:, column] = band_psd.sum(axis=1) * self.df
+                significance[:, column] = band_psd.mean(axis=1) / mean_psd
+        self._band_power.append(band_power)
+        self._significance.append(significance)
+
+    def update(self, chunk):
+        """
+        Add the next chunk of samples.
+
+        Args:
+            chunk: 1-D array of samples following the previous chunk
+
+        Returns:
+            ResonanceTracker: self, for chaining
+        """
+        buffer = np.concatenate([self._carry, np.asarray(chunk, dtype=np.float64)])
+        if buffer.size < self.nperseg:
+            self._carry = buffer
+            return self
+
+        n_frames = 1 + (buffer.size - self.nperseg) // self.step
+        frames = np.lib.stride_tricks.sliding_window_view(buffer, self.nperseg)[::self.step][:n_frames]
+        for start in range(0, n_frames, self.frames_per_batch):
+            self._process(frames[start:start + self.frames_per_batch])
+        self._n_frames += n_frames
+        self._carry = buffer[n_frames * self.step:].copy()
+        return self
+
+    def result(self):
+        """
+        Time x target power table of all complete frames so far.
+
+        Returns:
+            dict: 'times' (frame centers, s), 'target_names', 'target_freqs',
+                'resolvable' (target band holds at least one bin),
+                'band_power' and 'significance' (n_frames x n_targets)
+        """
+        n_targets = len(self.target_names)
+        band_power = np.concatenate(self._band_power) if self._band_power else np.zeros((0, n_targets))
+        significance = np.concatenate(self._significance) if self._significance else np.zeros((0, n_targets))
+        return {
+            'times': (np.arange(self._n_frames) * self.step + self.nperseg / 2) / self.sampling_rate,
+            'target_names': list(self.target_names),
+            'target_freqs': self.target_freqs.copy(),
+            'resolvable': self.resolvable.copy(),
+            'band_power': band_power,
+            'significance': significance
+        }
+
+
+def track_resonances(signal, sampling_rate, targets, chunk_size=1 << 20, **tracker_options):
+    """
+    Track target band power over time for a complete signal, chunk by chunk.
+
+    Args:
+        signal: 1-D signal array (or memmap)
+        sampling_rate: Sampling rate in Hz
+        targets: Dict name -> target frequency in Hz
+        chunk_size: Samples fed to the tracker per update
+        **tracker_options: ResonanceTracker options (nperseg, method, ...)
+
+    Returns:
+        dict: ResonanceTracker.result()
+    """
+    tracker = ResonanceTracker(sampling_rate, targets, **tracker_options)
+    for start in range(0, len(signal), chunk_size):
+        tracker.update(signal[start:start + chunk_size])
+    return tracker.result()
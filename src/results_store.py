@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Columnar HDF5 Results Store for Batch and Sweep Outputs
+
+Per-series validation summaries (see validation_results.py) are appended to an
+HDF5 file with one chunked, compressed, resizable dataset per column:
+
+    /<table>/<column>      1-D dataset, maxshape=(None,)
+    /<table>.attrs         n_rows (committed row count), schema
+
+Rows only count once `n_rows` is updated after every column has been written,
+so a run that crashes mid-append is truncated back to the last committed row
+when the store is reopened, and appends resume from there. Single columns can
+be read without touching the others.
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+import json
+
+import h5py
+import numpy as np
+
+from validation_results import SUMMARY_DTYPE, ValidationSummary
+
+# Default store layout: NIST row (or configuration) index plus the summary
+RESULTS_DTYPE = np.dtype([('series_index', np.int64)] + SUMMARY_DTYPE.descr)
+
+
+class ResultsStore:
+    """
+    Append-only columnar store of validation summaries in HDF5.
+
+    Usage:
+        with ResultsStore('results.h5') as store:
+            store.append(summaries, series_index=range(100, 200))
+            nrci = store.read_column('nrci')
+    """
+
+    def __init__(self, path, mode='a', table='summaries', dtype=RESULTS_DTYPE,
+                 chunk_rows=4096, compression='gzip', compression_opts=4):
+        """
+        Open (or create) a results store.
+
+        Args:
+            path: HDF5 file path
+            mode: h5py file mode ('r' for read-only, 'a' to create/append)
+            table: Group name holding the columns
+            dtype: Structured dtype of a row (used when creating the table)
+            chunk_rows: HDF5 chunk length per column
+            compression: HDF5 compression filter
+            compression_opts: Compression level
+        """
+        self.path = path
+        self.table = table
+        self._file = h5py.File(path, mode)
+        self._writable = mode != 'r'
+
+        if table in self._file:
+            self._group = self._file[table]
+            self.dtype = np.dtype([tuple(field) for field in json.loads(self._group.attrs['schema'])])
+            if self._writable:
+                self._truncate_uncommitted()
+        elif self._writable:
+            self.dtype = np.dtype(dtype)
+            self._group = self._file.create_group(table)
+            self._group.attrs['schema'] = json.dumps(self.dtype.descr)
+            self._group.attrs['n_rows'] = 0
+            for name in self.dtype.names:
+                self._group.create_dataset(
+                    name, shape=(0,), maxshape=(None,), dtype=self.dtype[name],
+                    chunks=(chunk_rows,), compression=compression,
+                    compression_opts=compression_opts, shuffle=True
+                )
+        else:
+            self._file.close()
+            raise KeyError(f"Table '{table}' not found in {path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return int(self._group.attrs['n_rows'])
+
+    @property
+    def columns(self):
+        """Column names in row order."""
+        return list(self.dtype.names)
+
+    def _truncate_uncommitted(self):
+        """Drop rows written after the last committed n_rows (crash recovery)."""
+        n_rows = len(self)
+        for name in self.dtype.names:
+            if self._group[name].shape[0] != n_rows:
+                self._group[name].resize((n_rows,))
+
+    def _to_records(self, rows, series_index):
+        """Convert supported row containers to a structured array of self.dtype."""
+        if isinstance(rows, (ValidationSummary, dict)) or hasattr(rows, 'summary'):
+            rows = [rows]
+        if hasattr(rows, 'array'):
+            rows = rows.array
+        if not isinstance(rows, np.ndarray):
+            rows = [ValidationSummary.from_results(r) if isinstance(r, dict) else getattr(r, 'summary', r)
+                    for r in rows]
+            rows = np.fromiter((s.to_record() for s in rows), dtype=SUMMARY_DTYPE, count=len(rows))
+
+        records = np.zeros(rows.size, dtype=self.dtype)
+        for name in rows.dtype.names:
+            if name in self.dtype.names:
+                records[name] = rows[name]
+        if 'series_index' in self.dtype.names and 'series_index' not in rows.dtype.names:
+            if series_index is None:
+                series_index = np.arange(len(self), len(self) + rows.size)
+            records['series_index'] = np.asarray(series_index, dtype=np.int64)
+        return records
+
+    def append(self, rows, series_index=None):
+        """
+        Append rows and commit them.
+
+        Args:
+            rows: ValidationSummary/ValidationResult/results dict, a list of
+                those, a SummaryTable, or a structured array
+            series_index: Optional index per row (defaults to running row count)
+
+        Returns:
+            int: Number of committed rows after the append
+        """
+        if not self._writable:
+            raise IOError("Results store opened read-only")
+        records = self._to_records(rows, series_index)
+        start = len(self)
+        stop = start + records.size
+        for name in self.dtype.names:
+            dataset = self._group[name]
+            dataset.resize((stop,))
+            dataset[start:stop] = records[name]
+
+        # Commit only after every column holds the new rows
+        self._group.attrs['n_rows'] = stop
+        self._file.flush()
+        return stop
+
+    def read_column(self, name, start=0, stop=None):
+        """
+        Read one column (or a slice of it) without loading other columns.
+
+        Args:
+            name: Column name
+            start: First row
+            stop: One past the last row (defaults to the committed length)
+
+        Returns:
+            numpy.ndarray: Column values
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        return self._group[name][start:stop]
+
+    def read(self, columns=None, rows=None):
+        """
+        Read selected columns and rows as a structured array.
+
+        Args:
+            columns: Column names (defaults to all)
+            rows: slice, boolean mask or sorted index array (defaults to all)
+
+        Returns:
+            numpy.ndarray: Structured array with the requested columns
+        """
+        columns = columns or self.columns
+        n_rows = len(self)
+        if rows is None:
+            rows = slice(0, n_rows)
+        elif isinstance(rows, slice):
+            rows = slice(*rows.indices(n_rows))
+        elif isinstance(rows, np.ndarray) and rows.dtype == bool:
+            rows = np.flatnonzero(rows[:n_rows])
+
+        def read_rows(name):
+            if isinstance(rows, slice):
+                return self._group[name][rows]
+            return self._group[name][:n_rows][rows]
+
+        first = read_rows(columns[0])
+        out = np.zeros(len(first), dtype=[(name, self.dtype[name]) for name in columns])
+        out[columns[0]] = first
+        for name in columns[1:]:
+            out[name] = read_rows(name)
+        return out
+
+    def iter_column_chunks(self, name, chunk_rows=1 << 16):
+        """
+        Iterate over a column in fixed-size blocks.
+
+        Args:
+            name: Column name
+            chunk_rows: Rows per block
+
+        Yields:
+            tuple: (start_row, values)
+        """
+        n_rows = len(self)
+        for start in range(0, n_rows, chunk_rows):
+            yield start, self._group[name][start:min(start + chunk_rows, n_rows)]
+
+    def to_npz(self, path, columns=None):
+        """
+        Export columns to a compressed .npz archive (one array per column).
+
+        Args:
+            path: Output .npz path
+            columns: Column names (defaults to all)
+        """
+        columns = columns or self.columns
+        np.savez_compressed(path, **{name: self.read_column(name) for name in columns})
+
+    def close(self):
+        """Flush and close the underlying HDF5 file."""
+        if self._file.id.valid:
+            if self._writable:
+                self._file.flush()
+            self._file.close()
+
+
+def load_results_npz(path):
+    """
+    Load a store exported with ResultsStore.to_npz as a structured array.
+
+    Args:
+        path: .npz path
+
+    Returns:
+        numpy.ndarray: Structured array with one field per stored column
+    """
+    with np.load(path) as archive:
+        names = list(archive.files)
+        out = np.zeros(archive[names[0]].shape[0], dtype=[(n, archive[n].dtype) for n in names])
+        for name in names:
+            out[name] = archive[name]
+    return out
+
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Resumable Checkpoints for Long NIST and Comprehensive Runs
+
+A RunCheckpoint records which work items (NIST rows, noise configurations)
+have completed together with their compact summaries. Summaries are buffered
+in memory and committed to a ResultsStore every `flush_every` items or
+`flush_seconds` seconds, whichever comes first. When a run is restarted with
+the same checkpoint path, completed items are skipped and their summaries are
+loaded from the store instead.
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+import time
+
+import numpy as np
+
+from results_store import ResultsStore
+from validation_results import SummaryTable, ValidationSummary
+
+
+class RunCheckpoint:
+    """
+    Periodic checkpoint of completed work items backed by a ResultsStore.
+
+    Usage:
+        with RunCheckpoint('run.h5') as checkpoint:
+            for i in range(n_series):
+                if checkpoint.is_done(i):
+                    continue
+                checkpoint.record(i, validator.validate_noise_hypothesis(...))
+    """
+
+    def __init__(self, path, flush_every=50, flush_seconds=60.0):
+        """
+        Open (or create) a checkpoint.
+
+        Args:
+            path: HDF5 results store used as checkpoint
+            flush_every: Commit after this many new items
+            flush_seconds: Commit when this many seconds passed since the last commit
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.store = ResultsStore(path)
+        self._done = set(self.store.read_column('series_index').tolist())
+        self._pending = SummaryTable(capacity=flush_every)
+        self._pending_index = []
+        self._last_flush = time.monotonic()
+
+        if self._done:
+            print(f"Resuming from checkpoint {path}: {len(self._done)} items already completed")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return len(self._done) + len(self._pending_index)
+
+    def is_done(self, index):
+        """Return True if the work item has been recorded (committed or pending)."""
+        return index in self._done or index in self._pending_index
+
+    @property
+    def completed(self):
+        """Sorted indices of all recorded work items."""
+        return sorted(self._done.union(self._pending_index))
+
+    def record(self, index, results):
+        """
+        Record a completed work item.
+
+        Args:
+            index: Integer work item index (NIST row, configuration number)
+            results: Validation results dict, ValidationResult or ValidationSummary
+        """
+        self._pending.append(results)
+        self._pending_index.append(int(index))
+        if (len(self._pending_index) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_seconds):
+            self.flush()
+
+    def flush(self):
+        """Commit all pending items to the store."""
+        if self._pending_index:
+            self.store.append(self._pending.array, series_index=self._pending_index)
+            self._done.update(self._pending_index)
+            self._pending = SummaryTable(capacity=self.flush_every)
+            self._pending_index = []
+        self._last_flush = time.monotonic()
+
+    def summaries(self, indices=None):
+        """
+        Load the summaries of completed items.
+
+        Args:
+            indices: Optional iterable restricting the returned items
+
+        Returns:
+            dict: index -> ValidationSummary, in index order
+        """
+        self.flush()
+        records = self.store.read()
+        if indices is not None:
+            records = records[np.isin(records['series_index'], np.fromiter(indices, dtype=np.int64))]
+        records = records[np.argsort(records['series_index'], kind='stable')]
+        return {int(record['series_index']): ValidationSummary.from_record(record) for record in records}
+
+    def close(self):
+        """Commit pending items and close the store."""
+        self.flush()
+        self.store.close()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Top-K Spectral Peak Extraction
+
+find_peaks(power, height=mean) on a noise spectrum keeps about a third of all
+bins, and every later step (storing, target matching) scales with that. This
+module returns only the K strongest local maxima:
+
+1. Local maxima by one vectorized comparison with both neighbours
+2. Optional normalization by a local noise floor: medians of blocks of
+   `noise_window` bins (one partition per block), linearly interpolated
+   between block centres and evaluated at the maxima only. The floor is
+   smooth, so maxima and prominences are taken on the raw spectrum and
+   divided by the floor at the peak
+3. Partial selection with argpartition: O(n) for the candidates instead of a
+   full sort, then a sort of the K survivors only
+4. Ranking by power or by prominence; prominences are computed only for the
+   candidates_factor * K highest maxima, within a bounded window (wlen)
+
+match_targets() pairs target frequencies with the nearest selected peak by
+binary search over the sorted peak frequencies.
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+import numpy as np
+
+# Peaks returned by default, and prominence candidates per returned peak
+DEFAULT_TOP_K = 32
+DEFAULT_CANDIDATES_FACTOR = 4
+
+# Window (bins) searched for the bases of each peak's prominence
+DEFAULT_PROMINENCE_WLEN = 1025
+
+
+def local_maxima(power):
+    """
+    Indices of the local maxima of a 1-D array.
+
+    A plateau counts once, at its first sample; the end points are never maxima.
+
+    Args:
+        power: 1-D array
+
+    Returns:
+        numpy.ndarray: int64 indices in ascending order
+    """
+    power = np.asarray(power)
+    if power.size < 3:
+        return np.empty(0, dtype=np.int64)
+    middle = power[1:-1]
+    is_peak = (middle > power[:-2]) & (middle >= power[2:])
+    return np.flatnonzero(is_peak) + 1
+
+
+def noise_floor(power, window, at=None):
+    """
+    Local noise floor: block medians interpolated between block centres.
+
+    Args:
+        power: 1-D power spectrum
+        window: Bins per block
+        at: Optional bin indices to evaluate (default: every bin)
+
+    Returns:
+        numpy.ndarray: Floor estimate (float64, strictly positive)
+    """
+    power = np.asarray(power)
+    n_blocks = max(1, power.size // max(1, int(window)))
+    blocks = power[:power.size // n_blocks * n_blocks].reshape(n_blocks, -1)
+    middle = blocks.shape[1] // 2
+    medians = np.partition(blocks, middle, axis=1)[:, middle]
+    centres = (np.arange(n_blocks) + 0.5) * blocks.shape[1]
+    at = np.arange(power.size) if at is None else at
+    floor = np.interp(at, centres, medians)
+    return np.maximum(floor, np.finfo(np.float64).tiny)
+
+
+def _top_indices(values, k):
+    """Positions of the k largest values, in descending order of value."""
+    if k >= values.size:
+        return np.argsort(values)[::-1]
+    selected = np.argpartition(values, values.size - k)[values.size - k:]
+    return selected[np.argsort(values[selected])[::-1]]
+
+
+def top_k_peaks(power, k=DEFAULT_TOP_K, rank='power', noise_window=None,
+                candidates_factor=DEFAULT_CANDIDATES_FACTOR, wlen=DEFAULT_PROMINENCE_WLEN):
+    """
+    The K strongest local maxima of a power spectrum.
+
+    Args:
+        power: 1-D power spectrum
+        k: Number of peaks to return (fewer if the spectrum has fewer maxima)
+        rank: 'power' or 'prominence'
+        noise_window: Bins per block of the local noise floor; when set,
+            peaks are ranked on power / floor
+        candidates_factor: Maxima per returned peak whose prominence is computed
+        wlen: Window (bins) for the prominence bases
+
+    Returns:
+        tuple: (indices in ascending order, ranking score of each peak)
+    """
+    if rank not in ('power', 'prominence'):
+        raise ValueError(f"Unknown peak rank '{rank}'; expected 'power' or 'prominence'")
+    power = np.asarray(power)
+
+    # 1. Local maxima and their (floor-normalized) heights
+    maxima = local_maxima(power)
+    if maxima.size == 0 or k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    heights = power[maxima].astype(np.float64)
+    if noise_window is not None:
+        heights /= noise_floor(power, noise_window, at=maxima)
+
+    # 2. Partial selection of the highest maxima
+    n_candidates = k if rank == 'power' else k * max(1, int(candidates_factor))
+    selected = _top_indices(heights, n_candidates)
+    candidates, scores = maxima[selected], heights[selected]
+
+    # 3. Prominence of the candidates only, then the final top K
+    if rank == 'prominence':
+        from scipy.signal import peak_prominences
+
+        candidates = np.sort(candidates)
+        scores = peak_prominences(power, candidates, wlen=wlen)[0]
+        if noise_window is not None:
+            scores = scores / noise_floor(power, noise_window, at=candidates)
+        keep = _top_indices(scores, k)
+        candidates, scores = candidates[keep], scores[keep]
+
+    order = np.argsort(candidates)
+    return candidates[order], np.asarray(scores[order], dtype=np.float64)
+
+
+def match_targets(peak_freqs, targets, tolerance=0.1):
+    """
+    Nearest peak to each target frequency by binary search.
+
+    Args:
+        peak_freqs: Peak frequencies in ascending order
+        targets: Dict of name -> target frequency
+        tolerance: Largest relative distance |peak - target| / target
+
+    Returns:
+        dict: name -> index into peak_freqs of the matched peak (matches only)
+    """
+    peak_freqs = np.asarray(peak_freqs)
+    if peak_freqs.size == 0 or not targets:
+        return {}
+    names = list(targets)
+    target_freqs = np.array([targets[name] for name in names], dtype=np.float64)
+
+    right = np.clip(np.searchsorted(peak_freqs, target_freqs), 1, peak_freqs.size - 1) \
+        if peak_freqs.size > 1 else np.zeros(target_freqs.size, dtype=np.int64)
+    left = np.maximum(right - 1, 0)
+    use_left = np.abs(peak_freqs[left] - target_freqs) <= np.abs(peak_freqs[right] - target_freqs)
+    nearest = np.where(use_left, left, right)
+    distance = np.abs(peak_freqs[nearest] - target_freqs)
+    return {name: int(index) for name, index, diff, target in zip(names, nearest, distance, target_freqs)
+            if diff / target <= tolerance}
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Asyncio Ingestion of Live Sample Streams
+
+Acquisition hardware pushes framed sample blocks over a local TCP or Unix
+socket. Each frame is a fixed header followed by the raw samples:
+
+    magic b'UBPF' | version u8 | dtype code u8 | reserved u16 |
+    sequence u32 | n_samples u32                  (little-endian, 16 bytes)
+
+with dtype code 1 = int16 (scaled to volts by the server's int16_scale) and
+2 = float32. IngestServer copies every payload straight into a preallocated
+float32 ring buffer; a consumer task hands ring views to the online
+validation stages in an executor and releases the space afterwards.
+
+Backpressure: when the ring has no room for the next frame, the connection
+handler stops reading the socket until the stages have caught up. The
+kernel socket buffers then fill and the sender's drain() blocks, so a slow
+analysis throttles the producer instead of dropping frames. Sequence gaps
+(frames lost upstream) are counted.
+
+On stop() connections get a grace period to finish; handlers still open
+after it (e.g. a client that never sends EOF) are cancelled, so stop()
+always returns.
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+import asyncio
+import struct
+
+import numpy as np
+
+from streaming_normality import NormalitySketch
+
+# Frame header: magic, version, dtype code, reserved, sequence, n_samples
+FRAME_HEADER = struct.Struct('<4sBBHII')
+FRAME_MAGIC = b'UBPF'
+FRAME_VERSION = 1
+
+# Wire dtype by header code
+FRAME_DTYPES = {1: np.dtype('<i2'), 2: np.dtype('<f4')}
+
+# Default ring capacity (samples) and samples per stage update
+DEFAULT_RING_CAPACITY = 1 << 22
+DEFAULT_BLOCK_SIZE = 1 << 16
+
+# Seconds stop() lets open connections finish before cancelling them
+DEFAULT_STOP_TIMEOUT = 5.0
+
+
+def encode_frame(samples, sequence):
+    """
+    Encode one frame.
+
+    Args:
+        samples: 1-D int16 or float32 array
+        sequence: Frame sequence number
+
+    Returns:
+        bytes: Header followed by the little-endian samples
+    """
+    samples = np.asarray(samples)
+    for code, dtype in FRAME_DTYPES.items():
+        if samples.dtype == dtype.newbyteorder('='):
+            break
+    else:
+        raise ValueError(f"Unsupported frame dtype {samples.dtype}; expected int16 or float32")
+    header = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, code, 0, sequence & 0xFFFFFFFF, samples.size)
+    return header + samples.astype(dtype, copy=False).tobytes()
+
+
+async def send_frames(writer, blocks, first_sequence=0):
+    """
+    Send sample blocks as frames, honouring transport backpressure.
+
+    Args:
+        writer: asyncio StreamWriter
+        blocks: Iterable of int16 or float32 arrays
+        first_sequence: Sequence number of the first frame
+
+    Returns:
+        int: Number of frames sent
+    """
+    n_frames = 0
+    for n_frames, block in enumerate(blocks, start=1):
+        writer.write(encode_frame(block, first_sequence + n_frames - 1))
+        await writer.drain()
+    return n_frames
+
+
+class SampleRing:
+    """
+    Preallocated single-producer/single-consumer float32 ring buffer.
+
+    The producer writes at the tail, the consumer peeks views at the head
+    and releases them once processed, so stage updates read the ring in
+    place without copying.
+    """
+
+    def __init__(self, capacity):
+        self.buffer = np.zeros(int(capacity), dtype=np.float32)
+        self.capacity = self.buffer.size
+        self.head = 0
+        self.available = 0
+
+    @property
+    def free(self):
+        return self.capacity - self.available
+
+    def write(self, samples, scale=1.0):
+        """Append samples (converted to float32). The caller ensures space."""
+        n = samples.size
+        if n > self.free:
+            raise ValueError(f"Ring overflow: {n} samples, {self.free} free")
+        tail = (self.head + self.available) % self.capacity
+        first = min(n, self.capacity - tail)
+        np.multiply(samples[:first], scale, out=self.buffer[tail:tail + first], casting='unsafe')
+        np.multiply(samples[first:], scale, out=self.buffer[:n - first], casting='unsafe')
+        self.available += n
+
+    def peek(self, n):
+        """Views of the next n samples (one or two, split at the wrap)."""
+        n = min(n, self.available)
+        first = min(n, self.capacity - self.head)
+        views = [self.buffer[self.head:self.head + first]]
+        if n > first:
+            views.append(self.buffer[:n - first])
+        return views
+
+    def release(self, n):
+        """Free the n samples at the head."""
+        self.head = (self.head + n) % self.capacity
+        self.available -= n
+
+
+class OnlineValidator:
+    """
+    Validation stages that accept samples incrementally.
+
+    Sign discretization with a carried previous state gives exact toggle
+    and ones counts across blocks; normality uses NormalitySketch and, if
+    requested, resonance band power comes from a ResonanceTracker.
+    """
+
+    def __init__(self, sampling_rate, resonance_targets=None, nperseg=4096):
+        """
+        Args:
+            sampling_rate: Sampling rate in Hz
+            resonance_targets: Optional dict name -> frequency to track
+            nperseg: Frame length of the resonance tracker
+        """
+        self.sampling_rate = sampling_rate
+        self.normality = NormalitySketch()
+        self.tracker = None
+        if resonance_targets:
+            from resonance_tracking import ResonanceTracker
+            self.tracker = ResonanceTracker(sampling_rate, resonance_targets, nperseg=nperseg)
+        self.n_samples = 0
+        self.ones = 0
+        self.toggles = 0
+        self._last_state = None
+
+    def update(self, block):
+        """Add the next block of samples."""
+        if block.size == 0:
+            return self
+        states = block > 0
+        self.ones += int(np.count_nonzero(states))
+        self.toggles += int(np.count_nonzero(states[1:] != states[:-1]))
+        if self._last_state is not None:
+            self.toggles += int(states[0] != self._last_state)
+        self._last_state = states[-1]
+        self.n_samples += block.size
+
+        self.normality.update(block)
+        if self.tracker is not None:
+            self.tracker.update(block)
+        return self
+
+    def result(self):
+        """
+        Online results so far.
+
+        Returns:
+            dict: 'n_samples', 'signal_stats' (mean, std), 'toggle_analysis'
+                (toggle_rate, ones_fraction), 'statistical_tests' and, if
+                tracked, 'resonance_tracking'
+        """
+        n = self.n_samples
+        moments = self.normality.moments
+        results = {
+            'n_samples': n,
+            'signal_stats': {
+                'mean': moments.mean if n else np.nan,
+                'std': moments.std() if n else np.nan
+            },
+            'toggle_analysis': {
+                'total_toggles': self.toggles,
+                'toggle_rate': self.toggles / (n - 1) if n > 1 else np.nan,
+                'ones_fraction': self.ones / n if n else np.nan
+            },
+            'statistical_tests': self.normality.result() if n else {}
+        }
+        if self.tracker is not None:
+            results['resonance_tracking'] = self.tracker.result()
+        return results
+
+
+class IngestServer:
+    """
+    Asyncio server feeding framed sample streams to online validation stages.
+
+    Usage:
+        server = IngestServer(OnlineValidator(1e6))
+        await server.start_tcp('127.0.0.1', 9000)   # or start_unix(path)
+        ...
+        results = await server.stop()
+    """
+
+    def __init__(self, stages, capacity=DEFAULT_RING_CAPACITY, block_size=DEFAULT_BLOCK_SIZE,
+                 int16_scale=1.0, executor=None):
+        """
+        Args:
+            stages: Object with update(block) and result(), e.g. OnlineValidator
+            capacity: Ring buffer capacity in samples (must hold one frame)
+            block_size: Maximum samples per stage update
+            int16_scale: Volts per count for int16 frames
+            executor: concurrent.futures executor for stage updates
+                (default: the event loop's default executor)
+        """
+        self.stages = stages
+        self.ring = SampleRing(capacity)
+        self.block_size = int(block_size)
+        self.int16_scale = int16_scale
+        self.executor = executor
+        self.stats = {'frames': 0, 'samples': 0, 'sequence_gaps': 0, 'backpressure_waits': 0,
+                      'max_fill': 0, 'connections': 0}
+        self._server = None
+        self._consumer = None
+        self._changed = None
+        self._connection_lock = None
+        self._handlers = set()
+        self._closing = False
+        self._error = None
+
+    async def _start(self, server_factory):
+        self._changed = asyncio.Condition()
+        self._connection_lock = asyncio.Lock()
+        self._consumer = asyncio.ensure_future(self._consume())
+        self._server = await server_factory(self._handle)
+        return self._server
+
+    async def start_tcp(self, host='127.0.0.1', port=0):
+        """Listen on TCP; returns the asyncio Server (port 0 picks a free port)."""
+        return await self._start(lambda handler: asyncio.start_server(handler, host, port))
+
+    async def start_unix(self, path):
+        """Listen on a Unix domain socket; returns the asyncio Server."""
+        return await self._start(lambda handler: asyncio.start_unix_server(handler, path))
+
+    async def _handle(self, reader, writer):
+        """Receive frames of one connection into the ring."""
+        self._handlers.add(asyncio.current_task())
+
+        # One stream at a time keeps the samples in order
+        async with self._connection_lock:
+            self.stats['connections'] += 1
+            expected_sequence = None
+            try:
+                while True:
+                    try:
+                        header = await reader.readexactly(FRAME_HEADER.size)
+                    except asyncio.IncompleteReadError as error:
+                        if error.partial:
+                            raise ValueError("Connection closed inside a frame header") from None
+                        break
+
+                    magic, version, code, _, sequence, n_samples = FRAME_HEADER.unpack(header)
+                    if magic != FRAME_MAGIC or version != FRAME_VERSION or code not in FRAME_DTYPES:
+                        raise ValueError(f"Invalid frame header {header!r}")
+                    if n_samples > self.ring.capacity:
+                        raise ValueError(f"Frame of {n_samples} samples exceeds the ring capacity")
+                    dtype = FRAME_DTYPES[code]
+                    payload = await reader.readexactly(n_samples * dtype.itemsize)
+
+                    if expected_sequence is not None and sequence != expected_sequence:
+                        self.stats['sequence_gaps'] += 1
+                    expected_sequence = (sequence + 1) & 0xFFFFFFFF
+
+                    # Backpressure: stop reading the socket until there is room
+                    async with self._changed:
+                        if self.ring.free < n_samples:
+                            self.stats['backpressure_waits'] += 1
+                            await self._changed.wait_for(
+                                lambda: self.ring.free >= n_samples or self._error is not None)
+                        if self._error is not None:
+                            break
+                        scale = self.int16_scale if code == 1 else 1.0
+                        self.ring.write(np.frombuffer(payload, dtype=dtype), scale)
+                        self.stats['frames'] += 1
+                        self.stats['samples'] += n_samples
+                        self.stats['max_fill'] = max(self.stats['max_fill'], self.ring.available)
+                        self._changed.notify_all()
+            except (ValueError, ConnectionError) as error:
+                self._error = self._error or error
+            finally:
+                writer.close()
+                self._handlers.discard(asyncio.current_task())
+
+    async def _consume(self):
+        """Hand ring blocks to the stages in the executor."""
+        loop = asyncio.get_running_loop()
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: self.ring.available or self._closing)
+                if not self.ring.available:
+                    return
+                views = self.ring.peek(self.block_size)
+
+            try:
+                for view in views:
+                    await loop.run_in_executor(self.executor, self.stages.update, view)
+            except Exception as error:
+                self._error = error
+                async with self._changed:
+                    self._changed.notify_all()
+                return
+
+            async with self._changed:
+                self.ring.release(sum(view.size for view in views))
+                self._changed.notify_all()
+
+    async def stop(self, timeout=DEFAULT_STOP_TIMEOUT):
+        """
+        Stop accepting connections, drain the ring and return the results.
+
+        Args:
+            timeout: Seconds open connections may keep sending before their
+                handlers are cancelled (a partially received frame is dropped)
+
+        Returns:
+            dict: stages.result() plus 'ingest_stats'
+
+        Raises:
+            Exception: The first protocol or stage error of the run
+        """
+        self._server.close()
+        handlers = set(self._handlers)
+        if handlers:
+            _, still_open = await asyncio.wait(handlers, timeout=timeout)
+            for handler in still_open:
+                handler.cancel()
+            await asyncio.gather(*handlers, return_exceptions=True)
+        await self._server.wait_closed()
+        async with self._changed:
+            self._closing = True
+            self._changed.notify_all()
+        await self._consumer
+        if self._error is not None:
+            raise self._error
+
+        results = self.stages.result()
+        results['ingest_stats'] = dict(self.stats)
+        return results
@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Scalable Normality Testing for the UBP Statistical Stage
+
+The statistical stage of the validator compares each noise signal against a
+normal distribution (Kolmogorov-Smirnov, Anderson-Darling). The exact tests
+sort every sample, which costs O(N log N) time and a full extra copy of the
+signal. This module provides a streaming alternative:
+
+1. StreamingMoments - mergeable mean/variance/skewness/kurtosis accumulator
+2. LogBinnedHistogram - mergeable log-bucketed quantile sketch (empirical CDF)
+3. NormalitySketch - KS, Anderson-Darling and Jarque-Bera from the two above
+
+All accumulators can be updated chunk by chunk and merged across workers, so
+the same statistics are available for parallel and out-of-core runs.
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+import warnings
+
+import numpy as np
+
+# Default chunk size (samples) used when a full signal is fed to a sketch
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Signals up to this length are tested exactly in 'auto' mode
+DEFAULT_EXACT_MAX_SAMPLES = 1 << 20
+
+# Anderson-Darling critical values for the normal case (as used by SciPy)
+AD_NORM_CRITICAL = np.array([0.561, 0.631, 0.752, 0.873, 1.035])
+AD_NORM_SIGNIFICANCE = np.array([15, 10, 5, 2.5, 1])
+
+# Buckets holding more than this multiple of their expected normal mass are
+# treated as ties (point masses) in the sketched Anderson-Darling statistic
+AD_SPREAD_RATIO = 16.0
+
+
+class StreamingMoments:
+    """
+    Mergeable accumulator for the first four central moments.
+
+    Uses the pairwise update formulas of Chan et al. / Pebay, so chunks may be
+    added in any order and partial accumulators from different workers can be
+    combined with merge().
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        """
+        Add a chunk of samples.
+
+        Args:
+            values: Array of samples
+
+        Returns:
+            StreamingMoments: self, for chaining
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return self
+
+        chunk = StreamingMoments()
+        chunk.count = values.size
+        chunk.mean = float(np.mean(values))
+        deviations = values - chunk.mean
+        squared = deviations * deviations
+        chunk.m2 = float(np.sum(squared))
+        chunk.m3 = float(np.dot(squared, deviations))
+        chunk.m4 = float(np.dot(squared, squared))
+        chunk.min = float(np.min(values))
+        chunk.max = float(np.max(values))
+
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """
+        Combine another accumulator into this one.
+
+        Args:
+            other: StreamingMoments built from a disjoint set of samples
+
+        Returns:
+            StreamingMoments: self, for chaining
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean = other.count, other.mean
+            self.m2, self.m3, self.m4 = other.m2, other.m3, other.m4
+            self.min, self.max = other.min, other.max
+            return self
+
+        na, nb = float(self.count), float(other.count)
+        n = na + nb
+        delta = other.mean - self.mean
+        delta2 = delta * delta
+
+        m2 = self.m2 + other.m2 + delta2 * na * nb / n
+        m3 = (self.m3 + other.m3
+              + delta2 * delta * na * nb * (na - nb) / (n * n)
+              + 3.0 * delta * (na * other.m2 - nb * self.m2) / n)
+        m4 = (self.m4 + other.m4
+              + delta2 * delta2 * na * nb * (na * na - na * nb + nb * nb) / (n ** 3)
+              + 6.0 * delta2 * (na * na * other.m2 + nb * nb * self.m2) / (n * n)
+              + 4.0 * delta * (na * other.m3 - nb * self.m3) / n)
+
+        self.count += other.count
+        self.mean += delta * nb / n
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def variance(self, ddof=0):
+        """Sample variance with the given delta degrees of freedom."""
+        if self.count - ddof <= 0:
+            return np.nan
+        return self.m2 / (self.count - ddof)
+
+    def std(self, ddof=0):
+        """Sample standard deviation with the given delta degrees of freedom."""
+        return np.sqrt(self.variance(ddof))
+
+    @property
+    def skewness(self):
+        """Biased sample skewness (matches scipy.stats.skew)."""
+        if self.count == 0 or self.m2 == 0:
+            return np.nan
+        return np.sqrt(self.count) * self.m3 / self.m2 ** 1.5
+
+    @property
+    def kurtosis(self):
+        """Biased excess kurtosis (matches scipy.stats.kurtosis)."""
+        if self.count == 0 or self.m2 == 0:
+            return np.nan
+        return self.count * self.m4 / (self.m2 * self.m2) - 3.0
+
+    def jarque_bera(self):
+        """
+        Jarque-Bera normality test from the accumulated moments.
+
+        Returns:
+            tuple: (statistic, pvalue)
+        """
+        import scipy.stats
+
+        skew, kurt = self.skewness, self.kurtosis
+        if not np.isfinite(skew) or not np.isfinite(kurt):
+            return np.nan, np.nan
+        statistic = self.count / 6.0 * (skew * skew + kurt * kurt / 4.0)
+        return statistic, scipy.stats.chi2.sf(statistic, 2)
+
+
+class _DenseStore:
+    """Contiguous bucket counts indexed by integer key starting at offset."""
+
+    def __init__(self):
+        self.offset = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def _extend(self, key_min, key_max):
+        if self.counts.size == 0:
+            self.offset = key_min
+            self.counts = np.zeros(key_max - key_min + 1, dtype=np.int64)
+            return
+        new_min = min(key_min, self.offset)
+        new_max = max(key_max, self.offset + self.counts.size - 1)
+        if new_min == self.offset and new_max == self.offset + self.counts.size - 1:
+            return
+        counts = np.zeros(new_max - new_min + 1, dtype=np.int64)
+        start = self.offset - new_min
+        counts[start:start + self.counts.size] = self.counts
+        self.offset, self.counts = new_min, counts
+
+    def add_keys(self, keys):
+        if keys.size == 0:
+            return
+        key_min, key_max = int(keys.min()), int(keys.max())
+        self._extend(key_min, key_max)
+        self.counts += np.bincount(keys - self.offset, minlength=self.counts.size)
+
+    def merge(self, other):
+        if other.counts.size == 0:
+            return
+        self._extend(other.offset, other.offset + other.counts.size - 1)
+        start = other.offset - self.offset
+        self.counts[start:start + other.counts.size] += other.counts
+
+    def keys(self):
+        return np.arange(self.offset, self.offset + self.counts.size)
+
+
+class LogBinnedHistogram:
+    """
+    Mergeable quantile sketch with logarithmically spaced buckets.
+
+    Every sample is assigned to a bucket whose bounds differ by a factor
+    gamma = (1 + a) / (1 - a), so any quantile is recovered with relative
+    error at most `relative_accuracy` regardless of the signal scale. Positive
+    and negative samples are kept in separate stores; exact zeros are counted
+    separately. Sketches with the same accuracy can be merged by adding counts.
+    """
+
+    def __init__(self, relative_accuracy=0.005):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = np.log(self.gamma)
+        self._min_key = int(np.ceil(np.log(np.finfo(np.float64).tiny) / self._log_gamma))
+        self.positive = _DenseStore()
+        self.negative = _DenseStore()
+        self.zero_count = 0
+        self.count = 0
+
+    def _keys(self, magnitudes):
+        keys = np.ceil(np.log(magnitudes) / self._log_gamma)
+        return np.maximum(keys, self._min_key).astype(np.int64)
+
+    def update(self, values):
+        """
+        Add a chunk of samples to the sketch.
+
+        Args:
+            values: Array of samples (non-finite values are ignored)
+
+        Returns:
+            LogBinnedHistogram: self, for chaining
+        """
+        values = np.asarray(values).ravel()
+        values = values[np.isfinite(values)]
+        positive = values[values > 0]
+        negative = values[values < 0]
+        self.positive.add_keys(self._keys(positive))
+        self.negative.add_keys(self._keys(-negative))
+        self.zero_count += values.size - positive.size - negative.size
+        self.count += values.size
+        return self
+
+    def merge(self, other):
+        """
+        Combine another sketch into this one.
+
+        Args:
+            other: LogBinnedHistogram with the same relative accuracy
+
+        Returns:
+            LogBinnedHistogram: self, for chaining
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        self.positive.merge(other.positive)
+        self.negative.merge(other.negative)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def buckets(self):
+        """
+        Non-empty buckets in ascending value order.
+
+        Returns:
+            tuple: (lower_edges, upper_edges, values, counts) where values are
+            the representative sample value of each bucket
+        """
+        pos_mask = self.positive.counts > 0
+        neg_mask = self.negative.counts > 0
+        pos_keys = self.positive.keys()[pos_mask].astype(np.float64)
+        neg_keys = self.negative.keys()[neg_mask][::-1].astype(np.float64)
+
+        pos_upper = self.gamma ** pos_keys
+        neg_upper_mag = self.gamma ** neg_keys
+        scale = 2.0 / (self.gamma + 1.0)
+
+        zero = np.zeros(1 if self.zero_count else 0)
+        lower = np.concatenate([-neg_upper_mag, zero, pos_upper / self.gamma])
+        upper = np.concatenate([-neg_upper_mag / self.gamma, zero, pos_upper])
+        values = np.concatenate([-neg_upper_mag * scale, zero, pos_upper * scale])
+        counts = np.concatenate([
+            self.negative.counts[neg_mask][::-1],
+            np.full(zero.size, self.zero_count, dtype=np.int64),
+            self.positive.counts[pos_mask],
+        ])
+        return lower, upper, values, counts
+
+    def quantile(self, q):
+        """
+        Approximate quantile(s) of the accumulated samples.
+
+        Args:
+            q: Quantile or array of quantiles in [0, 1]
+
+        Returns:
+            float or numpy.array: Quantile estimate(s)
+        """
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        _, _, values, counts = self.buckets()
+        ranks = np.asarray(q, dtype=np.float64) * (self.count - 1)
+        idx = np.searchsorted(np.cumsum(counts), ranks, side='right')
+        result = values[np.minimum(idx, values.size - 1)]
+        return result if np.ndim(q) else float(result)
+
+
+class NormalitySketch:
+    """
+    Streaming normality tests built from StreamingMoments and LogBinnedHistogram.
+
+    The KS statistic is evaluated at the bucket edges of the empirical CDF, the
+    Anderson-Darling statistic uses the grouped (binned) form of the usual
+    order-statistic sum, and Jarque-Bera comes directly from the moments.
+    """
+
+    def __init__(self, relative_accuracy=0.005):
+        self.moments = StreamingMoments()
+        self.histogram = LogBinnedHistogram(relative_accuracy)
+
+    @property
+    def count(self):
+        return self.moments.count
+
+    def update(self, values):
+        """Add a chunk of samples. Returns self."""
+        values = np.asarray(values).ravel()
+        self.moments.update(values)
+        self.histogram.update(values)
+        return self
+
+    def merge(self, other):
+        """Combine a sketch built from disjoint samples. Returns self."""
+        self.moments.merge(other.moments)
+        self.histogram.merge(other.histogram)
+        return self
+
+    def result(self):
+        """
+        Compute the normality test results.
+
+        Returns:
+            dict: Test statistics in the validator's 'statistical_tests' layout
+        """
+        import scipy.stats
+
+        n = self.moments.count
+        mean = self.moments.mean
+        std = self.moments.std(ddof=0)
+        jb_stat, jb_pvalue = self.moments.jarque_bera()
+        results = {
+            'mode': 'sketch',
+            'n_samples': n,
+            'ks_statistic': np.nan,
+            'ks_pvalue': np.nan,
+            'ad_statistic': np.nan,
+            'ad_critical_values': np.round(AD_NORM_CRITICAL / (1.0 + 0.75 / max(n, 1) + 2.25 / max(n, 1) ** 2), 3),
+            'ad_significance_levels': AD_NORM_SIGNIFICANCE.astype(np.float64),
+            'skewness': self.moments.skewness,
+            'kurtosis': self.moments.kurtosis,
+            'jb_statistic': jb_stat,
+            'jb_pvalue': jb_pvalue
+        }
+        if n < 2 or not std > 0:
+            return results
+
+        lower, upper, values, counts = self.histogram.buckets()
+        cum = np.cumsum(counts)
+        cum_before = cum - counts
+
+        # 1. Kolmogorov-Smirnov: supremum of |F_n - F| over all bucket edges
+        cdf_upper = scipy.stats.norm.cdf((upper - mean) / std)
+        cdf_lower = scipy.stats.norm.cdf((lower - mean) / std)
+        ks_stat = max(np.max(np.abs(cum / n - cdf_upper)),
+                      np.max(np.abs(cum_before / n - cdf_lower)))
+        results['ks_statistic'] = float(ks_stat)
+        results['ks_pvalue'] = float(scipy.stats.kstwo.sf(ks_stat, n))
+
+        # 2. Anderson-Darling: n * integral of (F_n - F)^2 / (F (1 - F)) dF.
+        # Each bucket is split at its representative value. Samples are spread
+        # uniformly in F across the bucket when its mass is plausible under the
+        # fitted normal, otherwise treated as a point mass (ties); F_n is flat
+        # in the gaps between buckets.
+        std1 = self.moments.std(ddof=1)
+        m = values.size
+        edges = np.empty(3 * m + 2)
+        edges[0], edges[-1] = -np.inf, np.inf
+        edges[1:-1:3], edges[2:-1:3], edges[3:-1:3] = lower, values, upper
+        w = (edges - mean) / std1
+        cdf, sf = scipy.stats.norm.cdf(w), scipy.stats.norm.sf(w)
+        logcdf, logsf = scipy.stats.norm.logcdf(w), scipy.stats.norm.logsf(w)
+        lower_half = cdf[:-1] + cdf[1:] < 1.0
+
+        # Probability of each half bucket under the fitted normal
+        seg_width = np.where(lower_half, cdf[1:] - cdf[:-1], sf[:-1] - sf[1:])
+        left_width, right_width = seg_width[1::3], seg_width[2::3]
+        mass = counts / n
+        spread = mass <= AD_SPREAD_RATIO * (left_width + right_width)
+        split = np.divide(left_width, left_width + right_width,
+                          out=np.zeros_like(left_width), where=spread)
+
+        fn_start = np.empty(3 * m + 1)
+        fn_end = np.empty(3 * m + 1)
+        fn_start[0::3] = fn_end[0::3] = np.concatenate([cum_before, [n]]) / n
+        fn_start[1::3] = cum_before / n
+        midpoint = cum_before / n + split * mass
+        fn_end[1::3] = np.where(spread, midpoint, cum_before / n)
+        fn_start[2::3] = np.where(spread, midpoint, cum / n)
+        fn_end[2::3] = cum / n
+
+        # Upper-half segments are integrated in the mirrored variable 1 - u
+        # so that slopes are computed from accurate survival probabilities
+        integrals = np.where(
+            lower_half,
+            _ad_segment_integrals(cdf[:-1], cdf[1:], logcdf[:-1], logcdf[1:],
+                                  logsf[:-1], logsf[1:], fn_start, fn_end),
+            _ad_segment_integrals(sf[1:], sf[:-1], logsf[1:], logsf[:-1],
+                                  logcdf[1:], logcdf[:-1], 1.0 - fn_end, 1.0 - fn_start))
+        results['ad_statistic'] = float(n * np.sum(integrals))
+
+        return results
+
+
+def _ad_segment_integrals(a, b, log_a, log_b, log1m_a, log1m_b, g_a, g_b):
+    """
+    Integral of (g(u) - u)^2 / (u (1 - u)) over each segment [a, b], where g is
+    linear from g_a to g_b.
+
+    With g(u) - u = p + q u the integrand splits into partial fractions
+    -q^2 + p^2 / u + (p + q)^2 / (1 - u), which integrate in closed form.
+    """
+    width = b - a
+    valid = width > 0
+    slope = np.divide(g_b - g_a, width, out=np.zeros_like(width), where=valid)
+    p = g_a - slope * a
+    q = slope - 1.0
+    with np.errstate(invalid='ignore'):
+        term_u = np.where(p == 0, 0.0, p * p * (log_b - log_a))
+        term_1mu = np.where(p + q == 0, 0.0, (p + q) ** 2 * (log1m_a - log1m_b))
+    return np.where(valid, -q * q * width + term_u + term_1mu, 0.0)
+
+
+def exact_normality_tests(signal):
+    """
+    Normality tests on the full signal using SciPy's exact implementations.
+
+    Args:
+        signal: Input signal array
+
+    Returns:
+        dict: Test statistics in the validator's 'statistical_tests' layout
+    """
+    import scipy.stats
+
+    signal = np.asarray(signal)
+    moments = StreamingMoments().update(signal)
+    jb_stat, jb_pvalue = moments.jarque_bera()
+
+    # Kolmogorov-Smirnov test against normal distribution
+    ks_stat, ks_pvalue = scipy.stats.kstest(signal, 'norm', args=(np.mean(signal), np.std(signal)))
+
+    # Anderson-Darling test for normality (critical-value tables; newer SciPy
+    # warns that this interface is being replaced by p-value methods)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)
+        ad_stat, ad_critical, ad_significance = scipy.stats.anderson(signal, dist='norm')
+
+    return {
+        'mode': 'exact',
+        'n_samples': signal.size,
+        'ks_statistic': ks_stat,
+        'ks_pvalue': ks_pvalue,
+        'ad_statistic': ad_stat,
+        'ad_critical_values': ad_critical,
+        'ad_significance_levels': ad_significance,
+        'skewness': moments.skewness,
+        'kurtosis': moments.kurtosis,
+        'jb_statistic': jb_stat,
+        'jb_pvalue': jb_pvalue
+    }
+
+
+def sketch_normality_tests(signal, chunk_size=DEFAULT_CHUNK_SIZE, relative_accuracy=0.005):
+    """
+    Normality tests on the signal using a NormalitySketch fed chunk by chunk.
+
+    Args:
+        signal: Input signal array (may be a memmap)
+        chunk_size: Number of samples per chunk
+        relative_accuracy: Bucket accuracy of the quantile sketch
+
+    Returns:
+        dict: Test statistics in the validator's 'statistical_tests' layout
+    """
+    sketch = NormalitySketch(relative_accuracy)
+    for start in range(0, len(signal), chunk_size):
+        sketch.update(signal[start:start + chunk_size])
+    return sketch.result()
+
+
+def normality_tests(signal, mode='auto', exact_max_samples=DEFAULT_EXACT_MAX_SAMPLES,
+                    chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Run the normality stage in exact or sketch mode.
+
+    Args:
+        signal: Input signal array
+        mode: 'exact', 'sketch' or 'auto' (exact up to exact_max_samples)
+        exact_max_samples: Largest signal tested exactly in 'auto' mode
+        chunk_size: Chunk size used in sketch mode
+
+    Returns:
+        dict: Test statistics in the validator's 'statistical_tests' layout
+    """
+    if mode == 'auto':
+        mode = 'exact' if len(signal) <= exact_max_samples else 'sketch'
+    if mode == 'exact':
+        return exact_normality_tests(signal)
+    if mode == 'sketch':
+        return sketch_normality_tests(signal, chunk_size=chunk_size)
+    raise ValueError(f"Unknown normality mode: {mode}")
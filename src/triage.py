@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Cascade Triage for Corpus-Scale Screening
+
+Most series of a noise corpus are plain noise, yet a full validation spends
+most of its time in the FFT, peak search and normality tests. TriageScreen
+runs the validator in two steps:
+
+1. Bit-level stages (coherence, NRCI, toggles): O(N) on the binarized signal
+2. Gates on their metrics; only series that pass are escalated to the
+   spectral and normality stages, and the merged results are re-assessed
+
+Gates compare z-scores against uniformly random bits, so the same thresholds
+work for any series length:
+
+    bit_bias_z     = |bit mean - 0.5| / (0.5 / sqrt(N))         = (1 - NRCI) sqrt(N)
+    toggle_rate_z  = (toggle rate - 0.5) / (0.5 / sqrt(N))
+    coherence_z    = (mean coherence - 0.25) / sqrt(0.3125 / M) (M = bits in compared segments)
+
+(0.3125 = 3/16 per AND of two random bits plus 2 x 1/16 covariance, since
+every inner segment appears in two adjacent pairs.)
+
+A gate passes when its metric lies outside [low, high]; a series is escalated
+when any (or, with require='all', every) gate passes. The metrics only need
+the summary fields, so triage_report() recomputes per-gate pass rates from
+stored ValidationSummary rows, e.g. after a parallel CLI run.
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from validation_results import ValidationResult
+
+# Stages run on every series, and stages run only on escalated series
+TRIAGE_STAGES = ('coherence', 'nrci', 'toggle')
+ESCALATION_STAGES = ('frequency', 'normality')
+
+# Segment length of UBPNoiseValidator.compute_coherence()
+COHERENCE_SEGMENT_LENGTH = 2000
+
+
+@dataclass
+class TriageGate:
+    """Escalation gate: passes when a triage metric lies outside [low, high]."""
+    __slots__ = ('metric', 'low', 'high')
+
+    metric: str
+    low: Optional[float]
+    high: Optional[float]
+
+    def passes(self, values):
+        """
+        Evaluate the gate (NaN never passes).
+
+        Args:
+            values: Metric value or array of values
+
+        Returns:
+            bool or numpy.ndarray: True where the gate passes
+        """
+        values = np.asarray(values, dtype=np.float64)
+        passed = np.zeros(values.shape, dtype=bool)
+        if self.low is not None:
+            passed |= values < self.low
+        if self.high is not None:
+            passed |= values > self.high
+        return passed if passed.ndim else bool(passed)
+
+
+# Escalate series that deviate from random bits by more than 4 sigma
+DEFAULT_GATES = (
+    TriageGate('bit_bias_z', None, 4.0),
+    TriageGate('toggle_rate_z', -4.0, 4.0),
+    TriageGate('coherence_z', -4.0, 4.0),
+)
+
+
+def triage_metrics(nrci, toggle_rate, mean_coherence, length,
+                   segment_length=COHERENCE_SEGMENT_LENGTH):
+    """
+    Bit-level metrics and their z-scores against uniformly random bits.
+
+    Works on scalars or on arrays (one entry per series).
+
+    Args:
+        nrci: Non-Random Coherence Index
+        toggle_rate: Toggles per sample
+        mean_coherence: Mean adjacent-segment coherence
+        length: Samples per series
+        segment_length: Coherence segment length
+
+    Returns:
+        dict: 'nrci', 'toggle_rate', 'mean_coherence', 'bit_bias_z',
+            'toggle_rate_z' and 'coherence_z'
+    """
+    length = np.asarray(length, dtype=np.float64)
+    compared = np.maximum(length // segment_length - 1, 0) * segment_length
+    with np.errstate(divide='ignore', invalid='ignore'):
+        coherence_z = np.where(compared > 0, (np.asarray(mean_coherence) - 0.25) / np.sqrt(0.3125 / compared),
+                               np.nan)
+    return {
+        'nrci': nrci,
+        'toggle_rate': toggle_rate,
+        'mean_coherence': mean_coherence,
+        'bit_bias_z': (1.0 - np.asarray(nrci)) * np.sqrt(length),
+        'toggle_rate_z': (np.asarray(toggle_rate) - 0.5) * 2.0 * np.sqrt(length),
+        'coherence_z': coherence_z[()] if np.ndim(coherence_z) == 0 else coherence_z
+    }
+
+
+def _escalate(passed, require):
+    """Combine per-gate results (gates x series) into the escalation decision."""
+    if require == 'any':
+        return np.any(passed, axis=0)
+    if require == 'all':
+        return np.all(passed, axis=0)
+    raise ValueError(f"Unknown gate combination '{require}'; expected 'any' or 'all'")
+
+
+class TriageScreen:
+    """
+    Two-step validation: bit-level stages first, full stages for candidates only.
+
+    Usage:
+        screen = TriageScreen(validator)
+        for series in corpus:
+            results = screen.validate(series, sampling_rate)
+        print(screen.pass_rates())
+    """
+
+    def __init__(self, validator=None, gates=DEFAULT_GATES, require='any',
+                 escalation_stages=ESCALATION_STAGES):
+        """
+        Args:
+            validator: UBPNoiseValidator (default: a new one)
+            gates: Sequence of TriageGate
+            require: 'any' or 'all' gates must pass to escalate
+            escalation_stages: Stages run on escalated series
+        """
+        if validator is None:
+            from noise_theory_validator import UBPNoiseValidator
+            validator = UBPNoiseValidator()
+        if require not in ('any', 'all'):
+            raise ValueError(f"Unknown gate combination '{require}'; expected 'any' or 'all'")
+        self.validator = validator
+        self.gates = tuple(gates)
+        self.require = require
+        self.escalation_stages = tuple(escalation_stages)
+        self.stats = {
+            'series': 0,
+            'escalated': 0,
+            'gate_passes': {gate.metric: 0 for gate in self.gates},
+            'triage_seconds': 0.0,
+            'escalation_seconds': 0.0
+        }
+
+    def evaluate(self, metrics):
+        """
+        Apply the gates to the metrics of one series.
+
+        Args:
+            metrics: Dict from triage_metrics()
+
+        Returns:
+            tuple: (escalate, list of metrics whose gate passed)
+        """
+        flags = [gate.passes(metrics[gate.metric]) for gate in self.gates]
+        passed = [gate.metric for gate, flag in zip(self.gates, flags) if flag]
+        combine = any if self.require == 'any' else all
+        return bool(self.gates) and combine(flags), passed
+
+    def validate(self, signal, sampling_rate, signal_name="Unknown", compact=False):
+        """
+        Triage one series and escalate it to the full stages if it passes.
+
+        Args:
+            signal: Input signal
+            sampling_rate: Sampling rate in Hz
+            signal_name: Name/description of the signal
+            compact: Return a ValidationResult instead of the nested dict
+
+        Returns:
+            dict or ValidationResult: Results of the stages that ran, plus a
+                'triage' section (escalated, metrics, passed_gates)
+        """
+        # 1. Bit-level stages and gates
+        started = time.perf_counter()
+        results = self.validator.validate_noise_hypothesis(signal, sampling_rate, signal_name,
+                                                           stages=TRIAGE_STAGES)
+        metrics = triage_metrics(results['nrci'], results['toggle_analysis']['toggle_rate'],
+                                 results['coherence_analysis']['mean_coherence'],
+                                 results['signal_stats']['length'])
+        escalate, passed = self.evaluate(metrics)
+        checked = time.perf_counter()
+
+        self.stats['series'] += 1
+        self.stats['triage_seconds'] += checked - started
+        for metric in passed:
+            self.stats['gate_passes'][metric] += 1
+
+        # 2. Spectral, normality and optional stages for candidates, then re-assessment
+        if escalate and self.escalation_stages:
+            full = self.validator.validate_noise_hypothesis(signal, sampling_rate, signal_name,
+                                                            stages=self.escalation_stages)
+            for key in ('frequency_analysis', 'statistical_tests', 'golay_analysis', 'randomness_analysis'):
+                if key in full:
+                    results[key] = full[key]
+            results['ubp_assessment'] = self.validator.assess_ubp_compatibility(results)
+            self.stats['escalated'] += 1
+            self.stats['escalation_seconds'] += time.perf_counter() - checked
+
+        results['triage'] = {'escalated': escalate, 'metrics': metrics, 'passed_gates': passed}
+        if compact:
+            return ValidationResult.from_results(results)
+        return results
+
+    def pass_rates(self):
+        """Fraction of screened series passing each gate, and escalated."""
+        series = max(self.stats['series'], 1)
+        rates = {metric: count / series for metric, count in self.stats['gate_passes'].items()}
+        rates['escalated'] = self.stats['escalated'] / series
+        return rates
+
+
+def triage_report(summaries, gates=DEFAULT_GATES, require='any'):
+    """
+    Per-gate pass rates recomputed from stored summaries.
+
+    Args:
+        summaries: Iterable of ValidationSummary
+        gates: Sequence of TriageGate
+        require: 'any' or 'all'
+
+    Returns:
+        dict: 'series', 'escalated' (count) and 'pass_rates' (per gate and 'escalated')
+    """
+    rows = list(summaries)
+    metrics = triage_metrics(np.array([s.nrci for s in rows], dtype=np.float64),
+                             np.array([s.toggle_rate for s in rows], dtype=np.float64),
+                             np.array([s.mean_coherence for s in rows], dtype=np.float64),
+                             np.array([s.length for s in rows], dtype=np.float64))
+    passed = np.array([gate.passes(metrics[gate.metric]) for gate in gates], dtype=bool).reshape(len(gates), -1)
+    escalated = _escalate(passed, require) if len(gates) else np.zeros(len(rows), dtype=bool)
+    series = max(len(rows), 1)
+    rates = {gate.metric: float(np.count_nonzero(row)) / series for gate, row in zip(gates, passed)}
+    rates['escalated'] = float(np.count_nonzero(escalated)) / series
+    return {'series': len(rows), 'escalated': int(np.count_nonzero(escalated)), 'pass_rates': rates}
@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Command-Line Batch Driver for UBP Noise Validation
+
+Runs validate_noise_hypothesis() over many series from one of three sources
+and streams compact summaries into a resumable results store:
+
+1. HDF5 - NIST-style files with one series per row (test.h5 / train.h5)
+2. Raw  - flat binary sample files or .npy arrays, cut into fixed-length series
+3. Synthetic - generated thermal, white, pink, shot or brownian noise
+
+Work is split into chunks of series that are validated in a process pool.
+Workers, chunk size and the number of chunks in flight come from one
+memory_scheduler.RunPlan for the memory budget, and progress is streamed
+to stderr. Example:
+
+    ubp-noise /data/band3/test.h5 --workers 8 --output band3_results.h5
+    ubp-noise synthetic:pink --n-series 200 --stages coherence,nrci
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from discretization import DEFAULT_WINDOW, THRESHOLD_MODES
+from memory_scheduler import plan_run
+from prefetch import ChunkPrefetcher, contiguous_chunks as _contiguous_chunks
+from noise_theory_validator import ANALYSIS_STAGES, OPTIONAL_STAGES, PRECISION_DTYPES, UBPNoiseValidator
+from triage import ESCALATION_STAGES, TriageScreen, triage_report
+from validation_results import ValidationSummary
+
+# Noise types accepted as 'synthetic:<type>'
+SYNTHETIC_TYPES = ('thermal', 'white', 'pink', 'shot', 'brownian', 'fgn', 'fbm', 'fdwn', 'bg', 'sas', 'bitfield')
+
+# Defaults for the batch controls
+DEFAULT_CHUNK_SIZE = 8
+DEFAULT_MEMORY_BUDGET_MB = 2048
+
+
+class HDF5Source:
+    """
+    Series stored as rows of a 2-D dataset in an HDF5 file.
+
+    NIST files keep the target parameter of each row in column 0
+    (targ_data = dataset[:, 1:]); with param_column it is not part of the series.
+    """
+
+    def __init__(self, path, dataset=None, param_column=True):
+        import h5py
+
+        self.path = path
+        with h5py.File(path, 'r') as h5f:
+            if dataset is None:
+                names = [name for name in ('test', 'train') if name in h5f] or list(h5f.keys())
+                if not names:
+                    raise ValueError(f"No datasets found in {path}")
+                dataset = names[0]
+            shape = h5f[dataset].shape
+        self.dataset = dataset
+        self.param_column = param_column and len(shape) == 2
+        if len(shape) == 1:
+            shape = (1, shape[0])
+        self.n_series = shape[0]
+        self.series_length = shape[1] - 1 if self.param_column else shape[1]
+
+    def describe(self):
+        return f"{self.path}[{self.dataset}]"
+
+    def read(self, start, stop):
+        """Return series [start, stop) as a 2-D array."""
+        import h5py
+
+        with h5py.File(self.path, 'r') as h5f:
+            data = h5f[self.dataset]
+            if data.ndim == 1:
+                return data[:][np.newaxis, :]
+            if self.param_column:
+                return data[start:stop, 1:]
+            return data[start:stop]
+
+
+class ArraySource:
+    """Series cut from a flat raw sample file or a .npy array (memory-mapped)."""
+
+    def __init__(self, path, dtype='float64', series_length=None):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        data = self._open()
+        if data.ndim == 2:
+            self.n_series, self.series_length = data.shape
+        else:
+            self.series_length = int(series_length or data.size)
+            self.n_series = data.size // self.series_length
+        if self.n_series == 0:
+            raise ValueError(f"{path} holds fewer than {self.series_length} samples")
+
+    def describe(self):
+        return self.path
+
+    def _open(self):
+        if self.path.endswith('.npy'):
+            return np.load(self.path, mmap_mode='r')
+        return np.memmap(self.path, dtype=self.dtype, mode='r')
+
+    def read(self, start, stop):
+        """Return series [start, stop) as a 2-D array."""
+        data = self._open()
+        if data.ndim == 2:
+            return np.array(data[start:stop])
+        n = self.series_length
+        return np.array(data[start * n:stop * n]).reshape(-1, n)
+
+
+class SyntheticSource:
+    """Generated noise series; series i is reproducible from seed + i."""
+
+    def __init__(self, noise_type, n_series, duration, sampling_rate, seed=0):
+        if noise_type not in SYNTHETIC_TYPES:
+            raise ValueError(f"Unknown noise type '{noise_type}'; expected one of {SYNTHETIC_TYPES}")
+        self.noise_type = noise_type
+        self.n_series = n_series
+        self.duration = duration
+        self.sampling_rate = sampling_rate
+        self.seed = seed
+        self.series_length = int(duration * sampling_rate)
+
+    def describe(self):
+        return f"synthetic {self.noise_type} noise"
+
+    def read(self, start, stop):
+        """Generate series [start, stop) as a 2-D array."""
+        if self.noise_type == 'thermal':
+            generate = UBPNoiseValidator().generate_thermal_noise
+        else:
+            from comprehensive_noise_analysis import ComprehensiveNoiseAnalyzer
+            generate = getattr(ComprehensiveNoiseAnalyzer(), f"generate_{self.noise_type}_noise")
+
+        series = []
+        for index in range(start, stop):
+            np.random.seed(self.seed + index)
+            time_array, noise = generate(sampling_rate=self.sampling_rate, duration=self.duration)
+            series.append(noise)
+        return np.array(series)
+
+
+def open_source(spec, args):
+    """
+    Create the series source for an input specification.
+
+    Args:
+        spec: 'synthetic:<type>', an HDF5 path, a .npy path or a raw sample file
+        args: Parsed command-line arguments
+
+    Returns:
+        Source object with n_series, series_length, describe() and read()
+    """
+    if spec.startswith('synthetic:'):
+        return SyntheticSource(spec.split(':', 1)[1], args.n_series or 10, args.duration,
+                               args.sampling_rate, seed=args.seed)
+    if not os.path.exists(spec):
+        raise FileNotFoundError(spec)
+    if spec.endswith(('.h5', '.hdf5')):
+        return HDF5Source(spec, dataset=args.dataset, param_column=args.param_column)
+    return ArraySource(spec, dtype=args.raw_dtype, series_length=args.series_length)
+
+
+# Per-process state of pool workers
+_worker = {}
+
+
+def _init_worker(source, sampling_rate, stages, verbose, settings=None, triage=False):
+    """Create the validator (and triage screen) once per worker process."""
+    validator = UBPNoiseValidator()
+    for name, value in (settings or {}).items():
+        setattr(validator, name, value)
+    screen = None
+    if triage:
+        escalation = [stage for stage in (stages or ANALYSIS_STAGES)
+                      if stage in ESCALATION_STAGES + OPTIONAL_STAGES]
+        screen = TriageScreen(validator, escalation_stages=escalation)
+    _worker.update(source=source, sampling_rate=sampling_rate, stages=stages,
+                   verbose=verbose, validator=validator, screen=screen)
+
+
+def _validate_chunk(start, stop):
+    """Validate series [start, stop), read by the worker, and return their summaries."""
+    return _validate_rows(start, _worker['source'].read(start, stop))
+
+
+def _validate_rows(start, rows):
+    """Validate already-read rows (series start, start + 1, ...) and return their summaries."""
+    validator = _worker['validator']
+    screen = _worker['screen']
+    output = contextlib.nullcontext() if _worker['verbose'] else contextlib.redirect_stdout(io.StringIO())
+    summaries = []
+    with output:
+        for offset, series in enumerate(rows):
+            if screen is not None:
+                # Bit-level stages first; spectral/normality only for candidates
+                results = screen.validate(series, _worker['sampling_rate'], f"Series {start + offset}")
+            else:
+                results = validator.validate_noise_hypothesis(
+                    series, _worker['sampling_rate'], f"Series {start + offset}",
+                    stages=_worker['stages']
+                )
+            summaries.append((start + offset, ValidationSummary.from_results(results)))
+    return summaries
+
+
+class ProgressReporter:
+    """Single-line progress (count, rate, ETA) streamed to a text stream."""
+
+    def __init__(self, total, stream=None, enabled=True):
+        self.total = total
+        self.stream = stream or sys.stderr
+        self.enabled = enabled
+        self.done = 0
+        self._start = time.monotonic()
+
+    def update(self, n):
+        self.done += n
+        if not self.enabled:
+            return
+        elapsed = time.monotonic() - self._start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - self.done) / rate if rate > 0 else float('nan')
+        self.stream.write(f"\r[{self.done:>{len(str(self.total))}}/{self.total}] "
+                          f"{100.0 * self.done / max(self.total, 1):5.1f}%  "
+                          f"{rate:7.2f} series/s  ETA {eta:6.0f} s")
+        self.stream.flush()
+
+    def close(self):
+        if self.enabled:
+            self.stream.write("\n")
+            self.stream.flush()
+
+
+def run_batch(source, indices, sampling_rate, stages=None, workers=1, chunk_size=DEFAULT_CHUNK_SIZE,
+              memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, checkpoint=None, progress=None, verbose=False,
+              settings=None, prefetch_depth=0, read_ahead=1, triage=False, plan=None):
+    """
+    Validate a set of series, in parallel when workers > 1.
+
+    Args:
+        source: Series source (see open_source)
+        indices: Sorted series indices to process
+        sampling_rate: Sampling rate in Hz
+        stages: Optional subset of ANALYSIS_STAGES
+        workers: Upper bound on worker processes (1 runs in-process)
+        chunk_size: Upper bound on series per work item
+        memory_budget_mb: RAM budget of the run
+        checkpoint: Optional RunCheckpoint receiving each summary
+        progress: Optional ProgressReporter
+        verbose: Keep the validator's per-series console output
+        settings: Optional validator attributes, e.g. {'precision': 'single'}
+        prefetch_depth: When > 0, chunks are read ahead on a reader thread of
+            this process (up to prefetch_depth waiting) while the current ones
+            are validated; otherwise each worker reads its own chunks
+        read_ahead: Consecutive chunks fetched per read when prefetching
+        triage: Run the bit-level stages first and the remaining stages only
+            on series that pass the triage gates (see triage.TriageScreen)
+        plan: memory_scheduler.RunPlan to follow; by default one is made with
+            plan_run() from workers, chunk_size and memory_budget_mb, and its
+            precision and normality mode fill in missing settings
+
+    Returns:
+        dict: series index -> ValidationSummary for the processed series
+    """
+    settings = settings or {}
+    if plan is None:
+        plan = plan_run(len(indices), source.series_length, memory_budget_mb, stages=stages,
+                        max_workers=workers, chunk_size=chunk_size,
+                        precision=settings.get('precision', 'double'),
+                        prefetch_depth=prefetch_depth, read_ahead=read_ahead)
+        settings = dict(plan.settings(), **settings)
+    workers = plan.workers
+    chunks = _contiguous_chunks(indices, plan.chunk_size)
+    summaries = {}
+
+    def collect(chunk_summaries):
+        for index, summary in chunk_summaries:
+            summaries[index] = summary
+            if checkpoint is not None:
+                checkpoint.record(index, summary)
+        if progress is not None:
+            progress.update(len(chunk_summaries))
+
+    # Work items: chunk bounds read by the workers, or rows prefetched here
+    prefetcher = None
+    if prefetch_depth > 0:
+        prefetcher = ChunkPrefetcher(source.read, chunks, depth=prefetch_depth, read_ahead=read_ahead)
+        work = ((_validate_rows, start, rows) for start, stop, rows in prefetcher)
+    else:
+        work = ((_validate_chunk, start, stop) for start, stop in chunks)
+
+    try:
+        if workers <= 1:
+            _init_worker(source, sampling_rate, stages, verbose, settings, triage)
+            for function, *arguments in work:
+                collect(function(*arguments))
+            return summaries
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(source, sampling_rate, stages, verbose, settings, triage)) as executor:
+            pending = set()
+            for function, *arguments in work:
+                # Bound the number of chunks in flight by the memory budget
+                if len(pending) >= plan.max_in_flight:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        collect(future.result())
+                pending.add(executor.submit(function, *arguments))
+            for future in wait(pending).done:
+                collect(future.result())
+        return summaries
+    finally:
+        if prefetcher is not None:
+            prefetcher.close()
+
+
+def parse_series(spec, n_series):
+    """Parse a 'start:stop' (or single index) series selection."""
+    if not spec:
+        return range(n_series)
+    if ':' in spec:
+        start, stop = spec.split(':', 1)
+        return range(*slice(int(start) if start else None, int(stop) if stop else None).indices(n_series))
+    return range(int(spec), int(spec) + 1)
+
+
+def _int_at_least(minimum):
+    """argparse type: an integer no smaller than minimum."""
+    def parse(text):
+        value = int(text)
+        if value < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}, got {value}")
+        return value
+    return parse
+
+
+def build_parser():
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog='ubp-noise',
+        description='Batch validation of the UBP Noise theory on HDF5, raw or synthetic series.'
+    )
+    parser.add_argument('input', help="HDF5 file, raw sample file, .npy array or 'synthetic:<type>' "
+                                      f"with type in {', '.join(SYNTHETIC_TYPES)}")
+    parser.add_argument('-o', '--output', help='Results store (HDF5); existing stores are resumed')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: all cores)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='Series per work item (default: %(default)s)')
+    parser.add_argument('--memory-budget', type=float, default=DEFAULT_MEMORY_BUDGET_MB,
+                        help='RAM budget of the run in MB; workers, chunk size and normality mode '
+                             'are planned to fit (default: %(default)s)')
+    parser.add_argument('--stages', default=','.join(ANALYSIS_STAGES),
+                        help='Comma-separated analysis stages (default: %(default)s; optional: '
+                             + ','.join(OPTIONAL_STAGES) + ')')
+    parser.add_argument('--sampling-rate', type=float, default=1e6,
+                        help='Sampling rate in Hz (default: %(default)g)')
+    parser.add_argument('--precision', choices=sorted(PRECISION_DTYPES), default='double',
+                        help='Analysis precision: single halves memory and bandwidth (default: %(default)s)')
+    parser.add_argument('--allow-single', action='store_true',
+                        help='Fall back to single precision when double does not fit the memory budget')
+    parser.add_argument('--threshold', choices=THRESHOLD_MODES, default='sign',
+                        help='Discretization threshold (default: %(default)s)')
+    parser.add_argument('--hysteresis', type=float, default=0.0,
+                        help='Hysteresis half-width in signal standard deviations (default: off)')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW,
+                        help='Rolling-median window in samples (default: %(default)s)')
+    parser.add_argument('--triage', action='store_true',
+                        help='Run the bit-level stages on every series and the spectral and normality '
+                             'stages only on series that deviate from random bits')
+    parser.add_argument('--top-peaks', type=int, default=0, metavar='K',
+                        help='Keep only the K strongest spectral peaks (default: every peak above the mean)')
+    parser.add_argument('--peak-rank', choices=('power', 'prominence'), default='power',
+                        help='Ranking of --top-peaks (default: %(default)s)')
+    parser.add_argument('--noise-floor-window', type=int, metavar='BINS',
+                        help='Rank --top-peaks on power over the local noise floor of BINS-bin blocks')
+    parser.add_argument('--series', help="Series selection 'start:stop' (default: all)")
+    parser.add_argument('--n-series', type=int, help='Limit the number of series (synthetic: count)')
+    parser.add_argument('--dataset', help='HDF5 dataset name (default: test, train or the first)')
+    parser.add_argument('--no-param-column', dest='param_column', action='store_false',
+                        help='HDF5 rows hold samples only (default: column 0 is the NIST target parameter)')
+    parser.add_argument('--raw-dtype', default='float64', help='Sample dtype of raw files')
+    parser.add_argument('--series-length', type=int, help='Samples per series in raw files')
+    parser.add_argument('--duration', type=float, default=0.1, help='Synthetic series duration in s')
+    parser.add_argument('--seed', type=int, default=0, help='Base seed of synthetic series')
+    parser.add_argument('--prefetch', type=_int_at_least(0), default=0, metavar='DEPTH',
+                        help='Read up to DEPTH chunks ahead on a reader thread while validating '
+                             '(default: workers read their own chunks)')
+    parser.add_argument('--read-ahead', type=_int_at_least(1), default=1,
+                        help='Consecutive chunks fetched per prefetch read (default: %(default)s)')
+    parser.add_argument('--shared-memory', action='store_true',
+                        help='Load the selected series once into shared memory for the workers')
+    parser.add_argument('--checkpoint-every', type=int, default=100,
+                        help='Commit the results store every N series (default: %(default)s)')
+    parser.add_argument('--no-progress', dest='progress', action='store_false',
+                        help='Do not stream progress to stderr')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Print per-series validator output')
+    return parser
+
+
+def print_summary(summaries, stream=None):
+    """Print aggregate metrics of a batch."""
+    stream = stream or sys.stdout
+    if not summaries:
+        print("No series analyzed.", file=stream)
+        return
+    rows = list(summaries.values())
+    nrci = np.array([s.nrci for s in rows])
+    coherence = np.array([s.mean_coherence for s in rows])
+    scores = np.array([s.overall_score for s in rows])
+    print(f"Series analyzed: {len(rows)}", file=stream)
+    if not np.all(np.isnan(nrci)):
+        print(f"NRCI: mean {np.nanmean(nrci):.6f}, std {np.nanstd(nrci):.6f}", file=stream)
+    if not np.all(np.isnan(coherence)):
+        print(f"Mean coherence: mean {np.nanmean(coherence):.3f}, std {np.nanstd(coherence):.3f}", file=stream)
+    values, counts = np.unique(scores, return_counts=True)
+    print(f"UBP scores: {dict(zip(values.tolist(), counts.tolist()))}", file=stream)
+
+
+def validator_settings(args):
+    """Validator attributes selected on the command line."""
+    options = {}
+    if args.hysteresis > 0:
+        options['hysteresis'] = args.hysteresis
+    if args.threshold == 'rolling_median':
+        options['window'] = args.window
+    settings = {
+        'precision': args.precision,
+        'discretization_mode': args.threshold,
+        'discretization_options': options
+    }
+    if args.top_peaks > 0:
+        settings.update({'peak_mode': 'top_k', 'peak_count': args.top_peaks,
+                         'peak_rank': args.peak_rank, 'peak_noise_window': args.noise_floor_window})
+    return settings
+
+
+def main(argv=None):
+    """Entry point of the ubp-noise command."""
+    args = build_parser().parse_args(argv)
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = set(stages).difference(ANALYSIS_STAGES + OPTIONAL_STAGES)
+    if unknown:
+        build_parser().error(f"unknown stages {sorted(unknown)}; "
+                             f"choose from {', '.join(ANALYSIS_STAGES + OPTIONAL_STAGES)}")
+
+    source = open_source(args.input, args)
+    indices = list(parse_series(args.series, source.n_series))
+    if args.n_series is not None:
+        indices = indices[:args.n_series]
+
+    checkpoint = None
+    if args.output:
+        from run_checkpoint import RunCheckpoint
+        checkpoint = RunCheckpoint(args.output, flush_every=args.checkpoint_every)
+        indices = [i for i in indices if not checkpoint.is_done(i)]
+
+    # Workers, chunking and stage modes that keep the run (with the prefetch
+    # queue and the shared copy of the selection) within the budget
+    shared_series = indices[-1] + 1 - indices[0] if args.shared_memory and indices else 0
+    try:
+        plan = plan_run(len(indices), source.series_length, args.memory_budget, stages=stages,
+                        max_workers=args.workers, chunk_size=args.chunk_size, precision=args.precision,
+                        allow_single=args.allow_single, shared_series=shared_series,
+                        prefetch_depth=args.prefetch, read_ahead=args.read_ahead)
+    except ValueError as error:
+        build_parser().error(str(error))
+    settings = validator_settings(args)
+    settings.update(plan.settings())
+
+    print(f"Analyzing {len(indices)} series of {source.series_length} samples from {source.describe()} "
+          f"with {plan.describe()}", file=sys.stderr)
+    progress = ProgressReporter(len(indices), enabled=args.progress)
+    pool = None
+    if args.shared_memory and indices:
+        # Workers attach views onto one copy instead of reading the source
+        from shared_memory_pool import SharedArraySource, SharedBlockPool
+        pool = SharedBlockPool()
+        first, stop = indices[0], indices[-1] + 1
+        shared = pool.share(source.read(first, stop), dtype=PRECISION_DTYPES[plan.precision][0])
+        source = SharedArraySource(shared, first_index=first, description=f"{source.describe()} (shared)")
+    try:
+        summaries = run_batch(source, indices, args.sampling_rate, stages=stages, plan=plan,
+                              checkpoint=checkpoint, progress=progress, verbose=args.verbose,
+                              settings=settings, prefetch_depth=args.prefetch, read_ahead=args.read_ahead,
+                              triage=args.triage)
+        if checkpoint is not None:
+            summaries = checkpoint.summaries()
+    finally:
+        progress.close()
+        if checkpoint is not None:
+            checkpoint.close()
+        if pool is not None:
+            pool.close()
+
+    if checkpoint is not None:
+        print(f"Results stored in: {args.output}")
+    print_summary(summaries)
+    if args.triage and summaries:
+        report = triage_report(summaries.values())
+        rates = ', '.join(f"{name} {rate:.1%}" for name, rate in report['pass_rates'].items())
+        print(f"Triage pass rates: {rates}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
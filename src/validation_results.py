@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Compact Typed Results for UBP Noise Validation
+
+validate_noise_hypothesis() returns a nested dictionary that carries the full
+positive-frequency spectrum (two float64 arrays of N/2 samples) and every
+detected peak. Collecting thousands of those quickly exhausts memory. This
+module provides:
+
+1. ValidationSummary - slotted record holding only the scalar metrics
+2. SpectrumData - optional, separately stored (and downsampled) spectrum
+3. ValidationResult - summary plus optional spectrum
+4. SummaryTable / summaries_to_array - columnar structured-array aggregation
+
+Author: Analysis of UBP Noise Research
+Date: July 2025
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+# Columnar layout of one validation summary. Strings are fixed-width bytes so
+# the same dtype can be written directly to HDF5.
+SUMMARY_DTYPE = np.dtype([
+    ('signal_name', 'S64'),
+    ('length', np.int64),
+    ('duration', np.float64),
+    ('mean', np.float64),
+    ('std', np.float64),
+    ('min', np.float64),
+    ('max', np.float64),
+    ('nrci', np.float64),
+    ('mean_coherence', np.float64),
+    ('std_coherence', np.float64),
+    ('sub_coherent_fraction', np.float64),
+    ('toggle_detectable_fraction', np.float64),
+    ('toggle_count', np.int64),
+    ('toggle_rate', np.float64),
+    ('mean_interval', np.float64),
+    ('std_interval', np.float64),
+    ('ks_statistic', np.float64),
+    ('ks_pvalue', np.float64),
+    ('ad_statistic', np.float64),
+    ('skewness', np.float64),
+    ('kurtosis', np.float64),
+    ('jb_statistic', np.float64),
+    ('jb_pvalue', np.float64),
+    ('n_peaks', np.int64),
+    ('detected_resonances', 'S64'),
+    ('golay_codeword_fraction', np.float64),
+    ('golay_correction_rate', np.float64),
+    ('entropy_rate_16', np.float64),
+    ('lz_complexity', np.float64),
+    ('runs_p_value', np.float64),
+    ('serial_p_value', np.float64),
+    ('overall_score', np.int64),
+    ('confidence', 'S8'),
+])
+
+
+def _get(section, key, default=np.nan):
+    """Read a value from an optional results section."""
+    if not section:
+        return default
+    value = section.get(key, default)
+    return default if value is None else value
+
+
+def _text(value):
+    """Decode a fixed-width bytes field."""
+    return value.decode('utf-8', 'replace') if isinstance(value, bytes) else str(value)
+
+
+@dataclass
+class ValidationSummary:
+    """
+    Scalar metrics of one validate_noise_hypothesis() run.
+
+    Field order matches SUMMARY_DTYPE, so a summary converts to a structured
+    array row with to_record() and back with from_record().
+    """
+    __slots__ = SUMMARY_DTYPE.names
+
+    signal_name: str
+    length: int
+    duration: float
+    mean: float
+    std: float
+    min: float
+    max: float
+    nrci: float
+    mean_coherence: float
+    std_coherence: float
+    sub_coherent_fraction: float
+    toggle_detectable_fraction: float
+    toggle_count: int
+    toggle_rate: float
+    mean_interval: float
+    std_interval: float
+    ks_statistic: float
+    ks_pvalue: float
+    ad_statistic: float
+    skewness: float
+    kurtosis: float
+    jb_statistic: float
+    jb_pvalue: float
+    n_peaks: int
+    detected_resonances: str
+    golay_codeword_fraction: float
+    golay_correction_rate: float
+    entropy_rate_16: float
+    lz_complexity: float
+    runs_p_value: float
+    serial_p_value: float
+    overall_score: int
+    confidence: str
+
+    @classmethod
+    def from_results(cls, results):
+        """
+        Build a summary from a validate_noise_hypothesis() results dict.
+
+        Args:
+            results: Validation results dictionary
+
+        Returns:
+            ValidationSummary: Compact summary (no arrays retained)
+        """
+        stats = results.get('signal_stats')
+        coherence = results.get('coherence_analysis')
+        toggles = results.get('toggle_analysis')
+        tests = results.get('statistical_tests')
+        freq = results.get('frequency_analysis') or {}
+        golay = results.get('golay_analysis')
+        randomness = results.get('randomness_analysis')
+        entropy_rate = _get(randomness, 'entropy_rate', ())
+        assessment = results.get('ubp_assessment')
+        peaks = freq.get('peaks') or {}
+
+        return cls(
+            signal_name=str(results.get('signal_name', 'Unknown')),
+            length=int(_get(stats, 'length', 0)),
+            duration=float(_get(stats, 'duration')),
+            mean=float(_get(stats, 'mean')),
+            std=float(_get(stats, 'std')),
+            min=float(_get(stats, 'min')),
+            max=float(_get(stats, 'max')),
+            nrci=float(results.get('nrci', np.nan)),
+            mean_coherence=float(_get(coherence, 'mean_coherence')),
+            std_coherence=float(_get(coherence, 'std_coherence')),
+            sub_coherent_fraction=float(_get(coherence, 'sub_coherent_fraction')),
+            toggle_detectable_fraction=float(_get(coherence, 'toggle_detectable_fraction')),
+            toggle_count=int(_get(toggles, 'toggle_count', 0)),
+            toggle_rate=float(_get(toggles, 'toggle_rate')),
+            mean_interval=float(_get(toggles, 'mean_interval')),
+            std_interval=float(_get(toggles, 'std_interval')),
+            ks_statistic=float(_get(tests, 'ks_statistic')),
+            ks_pvalue=float(_get(tests, 'ks_pvalue')),
+            ad_statistic=float(_get(tests, 'ad_statistic')),
+            skewness=float(_get(tests, 'skewness')),
+            kurtosis=float(_get(tests, 'kurtosis')),
+            jb_statistic=float(_get(tests, 'jb_statistic')),
+            jb_pvalue=float(_get(tests, 'jb_pvalue')),
+            n_peaks=len(peaks.get('frequencies', ())),
+            detected_resonances=','.join(freq.get('detected_resonances', {}).keys()),
+            golay_codeword_fraction=float(_get(golay, 'codeword_fraction')),
+            golay_correction_rate=float(_get(golay, 'correction_rate')),
+            entropy_rate_16=float(entropy_rate[15]) if len(entropy_rate) >= 16 else np.nan,
+            lz_complexity=float(_get(randomness, 'lz_complexity')),
+            runs_p_value=float(_get(randomness, 'runs_p_value')),
+            serial_p_value=float(_get(randomness, 'serial_p_values', (np.nan,))[0]),
+            overall_score=int(_get(assessment, 'overall_score', 0)),
+            confidence=str(_get(assessment, 'confidence', 'low')),
+        )
+
+    @classmethod
+    def from_record(cls, record):
+        """
+        Build a summary from one row of a SUMMARY_DTYPE structured array.
+
+        Columns missing from older stores (the optional-stage metrics) read
+        as NaN.
+        """
+        values = [record[name] if name in record.dtype.names else np.nan for name in SUMMARY_DTYPE.names]
+        values = [_text(v) if isinstance(v, bytes) else v.item() if hasattr(v, 'item') else v
+                  for v in values]
+        return cls(*values)
+
+    @property
+    def resonance_names(self):
+        """Names of the detected UBP resonances."""
+        return [name for name in self.detected_resonances.split(',') if name]
+
+    def to_record(self):
+        """Return the summary as a tuple in SUMMARY_DTYPE field order."""
+        return tuple(
+            getattr(self, name).encode('utf-8')[:SUMMARY_DTYPE[name].itemsize]
+            if SUMMARY_DTYPE[name].kind == 'S' else getattr(self, name)
+            for name in SUMMARY_DTYPE.names
+        )
+
+    def to_dict(self):
+        """Return the summary as a flat dictionary."""
+        return {name: getattr(self, name) for name in SUMMARY_DTYPE.names}
+
+    def to_results(self, validator=None):
+        """
+        Rebuild a nested results dictionary without the heavy arrays.
+
+        The layout matches validate_noise_hypothesis(), so report and summary
+        code that only reads scalar metrics works on compact summaries too.
+
+        Args:
+            validator: Optional UBPNoiseValidator used to regenerate the
+                assessment indicator texts
+
+        Returns:
+            dict: Nested results dictionary
+        """
+        results = {
+            'signal_name': self.signal_name,
+            'signal_stats': {
+                'mean': self.mean, 'std': self.std, 'min': self.min, 'max': self.max,
+                'length': self.length, 'duration': self.duration
+            },
+            'coherence_analysis': {
+                'mean_coherence': self.mean_coherence,
+                'std_coherence': self.std_coherence,
+                'sub_coherent_fraction': self.sub_coherent_fraction,
+                'toggle_detectable_fraction': self.toggle_detectable_fraction
+            },
+            'frequency_analysis': {
+                'n_peaks': self.n_peaks,
+                'detected_resonances': {name: {} for name in self.resonance_names}
+            },
+            'nrci': self.nrci,
+            'toggle_analysis': {
+                'toggle_count': self.toggle_count,
+                'toggle_rate': self.toggle_rate,
+                'mean_interval': self.mean_interval,
+                'std_interval': self.std_interval,
+                'total_samples': self.length
+            },
+            'statistical_tests': {
+                'ks_statistic': self.ks_statistic,
+                'ks_pvalue': self.ks_pvalue,
+                'ad_statistic': self.ad_statistic,
+                'skewness': self.skewness,
+                'kurtosis': self.kurtosis,
+                'jb_statistic': self.jb_statistic,
+                'jb_pvalue': self.jb_pvalue
+            },
+            'ubp_assessment': {
+                'compatible_indicators': [],
+                'incompatible_indicators': [],
+                'overall_score': self.overall_score,
+                'confidence': self.confidence
+            }
+        }
+        if not np.isnan(self.golay_codeword_fraction):
+            results['golay_analysis'] = {
+                'codeword_fraction': self.golay_codeword_fraction,
+                'correction_rate': self.golay_correction_rate
+            }
+        if not np.isnan(self.runs_p_value):
+            results['randomness_analysis'] = {
+                'lz_complexity': self.lz_complexity,
+                'runs_p_value': self.runs_p_value
+            }
+        if validator is not None:
+            results['ubp_assessment'] = validator.assess_ubp_compatibility(results)
+        return results
+
+
+def downsample_spectrum(frequencies, power, n_points, method='mean'):
+    """
+    Reduce a positive-frequency spectrum to about n_points log-spaced bins.
+
+    With method='mean' each bin keeps the mean frequency and mean power of the
+    samples it covers, so the average spectral level is preserved on a log
+    axis. With method='minmax' each bin contributes its minimum and maximum
+    power at the bin's mean frequency (two points per bin), which keeps the
+    visual envelope of the full spectrum when plotted.
+
+    Args:
+        frequencies: Positive, increasing frequency array
+        power: Power spectrum array of the same length
+        n_points: Target number of output points
+        method: 'mean' or 'minmax'
+
+    Returns:
+        tuple: (frequencies, power) of at most n_points samples
+    """
+    frequencies = np.asarray(frequencies)
+    power = np.asarray(power)
+    if frequencies.size <= n_points:
+        return frequencies.copy(), power.copy()
+    if method not in ('mean', 'minmax'):
+        raise ValueError(f"Unknown downsampling method: {method}")
+
+    n_bins = n_points // 2 if method == 'minmax' else n_points
+    edges = np.geomspace(frequencies[0], frequencies[-1], n_bins + 1)
+    starts = np.unique(np.searchsorted(frequencies, edges[:-1], side='left'))
+    counts = np.diff(np.append(starts, frequencies.size))
+    freq_out = np.add.reduceat(frequencies, starts) / counts
+    if method == 'mean':
+        return freq_out, np.add.reduceat(power, starts) / counts
+
+    power_out = np.empty((starts.size, 2), dtype=power.dtype)
+    power_out[:, 0] = np.minimum.reduceat(power, starts)
+    power_out[:, 1] = np.maximum.reduceat(power, starts)
+    return np.repeat(freq_out, 2), power_out.ravel()
+
+
+@dataclass
+class SpectrumData:
+    """Positive-frequency spectrum and peaks, kept apart from the summary."""
+    __slots__ = ('frequencies', 'power_spectrum', 'peak_frequencies', 'peak_powers', 'downsampled')
+
+    frequencies: np.ndarray
+    power_spectrum: np.ndarray
+    peak_frequencies: np.ndarray
+    peak_powers: np.ndarray
+    downsampled: bool
+
+    @classmethod
+    def from_frequency_analysis(cls, freq_analysis, max_points=None):
+        """
+        Extract the spectrum from a 'frequency_analysis' results section.
+
+        Args:
+            freq_analysis: Output of analyze_resonance_frequencies()
+            max_points: Downsample to this many log-spaced points (None keeps
+                the full spectrum)
+
+        Returns:
+            SpectrumData: Spectrum container
+        """
+        frequencies = freq_analysis['frequencies']
+        power = freq_analysis['power_spectrum']
+        downsampled = max_points is not None and len(frequencies) > max_points
+        if downsampled:
+            frequencies, power = downsample_spectrum(frequencies, power, max_points)
+        peaks = freq_analysis.get('peaks') or {}
+        return cls(
+            frequencies=frequencies,
+            power_spectrum=power,
+            peak_frequencies=np.asarray(peaks.get('frequencies', np.empty(0))),
+            peak_powers=np.asarray(peaks.get('powers', np.empty(0))),
+            downsampled=downsampled,
+        )
+
+    @property
+    def nbytes(self):
+        """Memory held by the spectrum arrays."""
+        return sum(np.asarray(getattr(self, name)).nbytes for name in
+                   ('frequencies', 'power_spectrum', 'peak_frequencies', 'peak_powers'))
+
+
+@dataclass
+class ValidationResult:
+    """Compact validation result: scalar summary plus optional spectrum."""
+    __slots__ = ('summary', 'spectrum')
+
+    summary: ValidationSummary
+    spectrum: Optional[SpectrumData]
+
+    @classmethod
+    def from_results(cls, results, spectrum='none', spectrum_points=2048):
+        """
+        Convert a validate_noise_hypothesis() results dict.
+
+        Args:
+            results: Validation results dictionary
+            spectrum: 'none' (drop), 'downsampled' or 'full'
+            spectrum_points: Target size when spectrum='downsampled'
+
+        Returns:
+            ValidationResult: Compact result
+        """
+        if spectrum not in ('none', 'downsampled', 'full'):
+            raise ValueError(f"Unknown spectrum option: {spectrum}")
+        spectrum_data = None
+        if spectrum != 'none' and 'frequency_analysis' in results:
+            spectrum_data = SpectrumData.from_frequency_analysis(
+                results['frequency_analysis'],
+                max_points=spectrum_points if spectrum == 'downsampled' else None
+            )
+        return cls(summary=ValidationSummary.from_results(results), spectrum=spectrum_data)
+
+
+def summaries_to_array(summaries):
+    """
+    Pack many summaries into one SUMMARY_DTYPE structured array.
+
+    Args:
+        summaries: Iterable of ValidationSummary (or ValidationResult)
+
+    Returns:
+        numpy.ndarray: Structured array with one row per summary
+    """
+    summaries = list(summaries)
+    records = (getattr(s, 'summary', s).to_record() for s in summaries)
+    return np.fromiter(records, dtype=SUMMARY_DTYPE, count=len(summaries))
+
+
+class SummaryTable:
+    """
+    Growable columnar table of validation summaries.
+
+    Rows are written straight into a preallocated SUMMARY_DTYPE array, so
+    `array` and `column()` return views without copying.
+    """
+
+    def __init__(self, capacity=1024):
+        self._data = np.zeros(max(int(capacity), 1), dtype=SUMMARY_DTYPE)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, n_rows):
+        if n_rows <= self._data.size:
+            return
+        data = np.zeros(max(n_rows, 2 * self._data.size), dtype=SUMMARY_DTYPE)
+        data[:self._size] = self._data[:self._size]
+        self._data = data
+
+    def append(self, summary):
+        """Append a ValidationSummary, ValidationResult or results dict."""
+        if isinstance(summary, dict):
+            summary = ValidationSummary.from_results(summary)
+        summary = getattr(summary, 'summary', summary)
+        self._reserve(self._size + 1)
+        self._data[self._size] = summary.to_record()
+        self._size += 1
+
+    def extend(self, records):
+        """Append a SUMMARY_DTYPE structured array in one copy."""
+        records = np.asarray(records, dtype=SUMMARY_DTYPE)
+        self._reserve(self._size + records.size)
+        self._data[self._size:self._size + records.size] = records
+        self._size += records.size
+
+    @property
+    def array(self):
+        """View of the filled rows."""
+        return self._data[:self._size]
+
+    def column(self, name):
+        """View of a single column."""
+        return self._data[name][:self._size]
+
+    def __getitem__(self, index):
+        return ValidationSummary.from_record(self.array[index])
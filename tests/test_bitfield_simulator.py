@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the sparse OffBit Bitfield toggle simulator.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+import numpy as np
+from bitfield_simulator import BITFIELD_SHAPE, Bitfield, bitfield_signal
+from coherence_analysis import segment_coherence
+
+
+class TestBitfieldSimulator(unittest.TestCase):
+    """Test cases for the sparse state store, toggle dynamics and observable."""
+
+    def test_sparse_store(self):
+        """Test placement, coordinates and the CSR view of the default Bitfield."""
+        field = Bitfield.random(rng=1)
+        n_cells = int(np.prod(BITFIELD_SHAPE))
+        self.assertEqual(field.n_active, round(0.01 * n_cells))
+        self.assertTrue(np.all(np.diff(field.coords) > 0))
+        self.assertLess(field.coords[-1], n_cells)
+        self.assertLess(int(field.words.max()), 1 << 24)
+
+        coordinates = field.coordinates()[:100]
+        np.testing.assert_array_equal(np.ravel_multi_index(coordinates.T, BITFIELD_SHAPE), field.coords[:100])
+        csr = field.to_csr()
+        self.assertEqual(csr.shape, (170**3, 20))
+        self.assertEqual(csr.nnz, field.n_active)
+        row, column = divmod(int(field.coords[7]), 20)
+        self.assertEqual(csr[row, column], field.words[7])
+
+        with self.assertRaises(ValueError):
+            Bitfield([5, 3], [1, 1])
+
+    def test_incremental_observable(self):
+        """Test that the incremental projection matches the state after the run."""
+        field = Bitfield.random((20, 20, 20, 5, 2, 2), n_active=5000, rng=2)
+        words = field.words.copy()
+        signal = field.simulate(500, toggle_rate=0.05, coherence=0.3, rng=3)
+        self.assertAlmostEqual(signal[-1], field.observe(), places=12)
+        np.testing.assert_array_equal(field.words & ~np.uint32(1 << 12), words & ~np.uint32(1 << 12))
+
+        weights = np.random.default_rng(4).random(field.n_active)
+        weighted = field.simulate(200, toggle_rate=0.05, weights=weights, rng=5)
+        self.assertAlmostEqual(weighted[-1], field.observe(weights), places=9)
+
+        np.testing.assert_array_equal(bitfield_signal(256, rng=6), bitfield_signal(256, rng=6))
+
+    def test_coherence_control(self):
+        """Test that binarized coherence rises from 0.25 toward 0.5 with coherence."""
+        measured = []
+        for coherence in (0.0, 0.3, 1.0):
+            signal = bitfield_signal(16384, coherence=coherence, rng=7)
+            values, _ = segment_coherence((signal > 0).view(np.uint8), 512)
+            measured.append(values.mean())
+        self.assertLess(abs(measured[0] - 0.25), 0.03)
+        self.assertGreater(measured[1], 0.4)
+        self.assertGreater(measured[2], measured[0] + 0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
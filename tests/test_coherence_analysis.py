@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for vectorized and multi-scale coherence analysis.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+import numpy as np
+from bitstream import pack_bits
+from coherence_analysis import (SCALE_DTYPE, default_scales, multiscale_coherence, segment_coherence,
+                                lag_coherence_profile, lag_coherence_profile_batch)
+from noise_theory_validator import UBPNoiseValidator
+
+
+def loop_coherence(binary_signal, segment_length):
+    """Reference implementation: the original per-segment loop."""
+    n_segments = len(binary_signal) // segment_length
+    return np.array([np.mean(binary_signal[i * segment_length:(i + 1) * segment_length] *
+                             binary_signal[(i + 1) * segment_length:(i + 2) * segment_length])
+                     for i in range(n_segments - 1)])
+
+
+class TestCoherenceAnalysis(unittest.TestCase):
+    """Test cases for segment and multi-scale coherence."""
+
+    def setUp(self):
+        """Set up a random binary stream."""
+        rng = np.random.default_rng(21)
+        self.binary = (rng.normal(size=50000) > 0).astype(np.uint8)
+
+    def test_segment_coherence_matches_loop(self):
+        """Test the vectorized coherence against the original loop."""
+        for length in (2000, 333):
+            values, positions = segment_coherence(self.binary, length)
+            np.testing.assert_allclose(values, loop_coherence(self.binary, length))
+            np.testing.assert_array_equal(positions, np.arange(values.size) * length)
+
+        validator = UBPNoiseValidator()
+        values, positions = validator.compute_coherence(self.binary)
+        np.testing.assert_allclose(values, loop_coherence(self.binary, 2000))
+
+    def test_multiscale_matches_single_scales(self):
+        """Test that every ladder row equals a separate single-scale run."""
+        lengths = [8, 24, 100, 1024, 4096]
+        table, values = multiscale_coherence(self.binary, lengths, return_values=True)
+
+        self.assertEqual(table.dtype, SCALE_DTYPE)
+        np.testing.assert_array_equal(table['segment_length'], lengths)
+        for row, length in zip(table, lengths):
+            expected = loop_coherence(self.binary, length)
+            np.testing.assert_allclose(values[length], expected)
+            self.assertEqual(row['n_pairs'], expected.size)
+            self.assertAlmostEqual(row['mean_coherence'], expected.mean())
+            self.assertAlmostEqual(row['sub_coherent_fraction'], np.mean(expected < 0.5))
+
+    def test_packed_input_and_default_scales(self):
+        """Test packed input and the default power-of-two ladder."""
+        table = multiscale_coherence(pack_bits(self.binary))
+        self.assertEqual(list(table['segment_length']), default_scales(self.binary.size))
+        self.assertEqual(table['segment_length'][-1], 16384)
+        np.testing.assert_allclose(table['mean_coherence'], 0.25, atol=0.02)
+
+    def test_lag_profile_fft_matches_direct(self):
+        """Test that the FFT lag profile equals direct AND/count per lag."""
+        lags, fft_profile = lag_coherence_profile(self.binary, 300, min_lag=5, method='fft')
+        direct_lags, direct_profile = lag_coherence_profile(self.binary, 300, min_lag=5, method='direct')
+
+        np.testing.assert_array_equal(lags, np.arange(5, 301))
+        np.testing.assert_array_equal(fft_profile, direct_profile)
+        n = self.binary.size
+        self.assertAlmostEqual(fft_profile[0], np.mean(self.binary[:n - 5] & self.binary[5:]))
+
+    def test_lag_profile_detects_periodicity(self):
+        """Test that a periodic bitstream shows coherence peaks at its period."""
+        periodic = (np.sin(2 * np.pi * np.arange(20000) / 50) > 0).astype(np.uint8)
+        lags, profile = lag_coherence_profile(periodic, 200)
+        self.assertAlmostEqual(profile[lags == 50][0], 0.5, delta=0.01)
+        self.assertAlmostEqual(profile[lags == 25][0], 0.0, delta=0.01)
+
+    def test_batched_lag_profiles(self):
+        """Test the batched FFT against per-series profiles."""
+        batch = self.binary[:48000].reshape(6, 8000)
+        lags, profiles = lag_coherence_profile_batch(batch, 64)
+        self.assertEqual(profiles.shape, (6, 64))
+        for series, profile in zip(batch, profiles):
+            np.testing.assert_array_equal(profile, lag_coherence_profile(series, 64, method='direct')[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
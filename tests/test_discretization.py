@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the discretization engine and bit-packed streams.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+import numpy as np
+from bitstream import pack_bits, unpack_bits, popcount
+from discretization import (discretize, quantile_threshold, rolling_median,
+                            hysteresis_threshold, quantize_levels, bit_planes)
+from noise_theory_validator import UBPNoiseValidator
+
+
+class TestDiscretization(unittest.TestCase):
+    """Test cases for thresholds, hysteresis, multi-level codes and packing."""
+
+    def setUp(self):
+        """Set up a reproducible generator."""
+        self.rng = np.random.default_rng(11)
+
+    def test_median_balances_non_negative_signal(self):
+        """Test that median thresholding fixes degenerate sign bitstreams."""
+        shot = self.rng.poisson(3.0, 100000).astype(np.float64)
+        self.assertEqual(discretize(shot, 'sign').mean(), np.mean(shot > 0))
+
+        binary = discretize(shot + self.rng.uniform(0, 1e-3, shot.size), 'median')
+        self.assertEqual(binary.dtype, np.uint8)
+        self.assertAlmostEqual(binary.mean(), 0.5, places=3)
+
+    def test_sketch_quantile_close_to_exact(self):
+        """Test that the streaming quantile matches the exact quantile."""
+        signal = self.rng.normal(5.0, 1.0, 200000)
+        exact = quantile_threshold(signal, 0.9)
+        approx = quantile_threshold(signal, 0.9, sketch=True, chunk_size=10000)
+        self.assertLess(abs(approx - exact) / exact, 0.005)
+
+    def test_rolling_median_tracks_drift(self):
+        """Test that the rolling baseline removes Brownian drift."""
+        brownian = np.cumsum(self.rng.normal(0, 1, 200000))
+        baseline = rolling_median(brownian, window=1000)
+        self.assertEqual(baseline.shape, brownian.shape)
+        self.assertLess(abs(discretize(brownian, 'rolling_median', window=1000).mean() - 0.5), 0.05)
+        self.assertGreater(abs(discretize(brownian, 'sign').mean() - 0.5), 0.05)
+
+    def test_hysteresis_suppresses_chatter(self):
+        """Test that hysteresis holds state inside the band."""
+        signal = np.array([-1.0, 0.05, -0.05, 0.05, 1.0, 0.05, -0.05, -1.0, 0.05])
+        np.testing.assert_array_equal(hysteresis_threshold(signal, -0.5, 0.5),
+                                      [0, 0, 0, 0, 1, 1, 1, 0, 0])
+
+        noisy = np.sin(np.linspace(0, 20 * np.pi, 20000)) + self.rng.normal(0, 0.2, 20000)
+        plain_toggles = np.count_nonzero(np.diff(discretize(noisy).astype(int)))
+        hysteresis_toggles = np.count_nonzero(np.diff(discretize(noisy, hysteresis=1.0).astype(int)))
+        self.assertEqual(hysteresis_toggles, 19)
+        self.assertGreater(plain_toggles, hysteresis_toggles)
+
+    def test_levels_and_bit_planes(self):
+        """Test multi-level codes and their bit-plane decomposition."""
+        signal = self.rng.normal(0, 1, 80000)
+        codes, edges = quantize_levels(signal, n_bits=2)
+        self.assertEqual(edges.size, 3)
+        np.testing.assert_allclose(np.bincount(codes) / codes.size, 0.25, atol=1e-3)
+
+        msb, lsb = bit_planes(codes, 2)
+        np.testing.assert_array_equal(msb * 2 + lsb, codes)
+        np.testing.assert_array_equal(msb, discretize(signal, 'median'))
+
+    def test_packed_pipeline(self):
+        """Test bit packing round trip and LUT popcount."""
+        binary = (self.rng.random(1001) > 0.3).astype(np.uint8)
+        packed, n_bits = pack_bits(binary)
+        self.assertEqual(packed.size, 126)
+        np.testing.assert_array_equal(unpack_bits(packed, n_bits), binary)
+        self.assertEqual(popcount(packed), int(binary.sum()))
+
+        packed_stream, n_bits = discretize(binary - 0.5, packed=True)
+        np.testing.assert_array_equal(packed_stream, packed)
+
+    def test_validator_discretization_mode(self):
+        """Test that the validator uses the configured discretization."""
+        validator = UBPNoiseValidator()
+        signal = self.rng.exponential(1.0, 10000)
+        self.assertEqual(validator.discretize_signal(signal).mean(), 1.0)
+
+        validator.discretization_mode = 'median'
+        self.assertAlmostEqual(validator.discretize_signal(signal).mean(), 0.5, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
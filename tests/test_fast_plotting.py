@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the headless fast-render plotting path.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import tempfile
+import unittest
+import numpy as np
+from noise_theory_validator import UBPNoiseValidator
+from validation_results import downsample_spectrum
+from fast_plotting import AnalysisPlotter, BackgroundPlotter, light_results, use_headless_backend
+
+
+class TestFastPlotting(unittest.TestCase):
+    """Test cases for decimation, figure reuse and background rendering."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Run one validation shared by all tests."""
+        use_headless_backend()
+        cls.validator = UBPNoiseValidator()
+        np.random.seed(5)
+        time, noise = cls.validator.generate_thermal_noise(sampling_rate=1e6, duration=0.01)
+        cls.results = cls.validator.validate_noise_hypothesis(noise, 1e6, "Plot Test")
+
+    def test_minmax_decimation_keeps_extremes(self):
+        """Test that the min/max envelope keeps isolated spectral lines."""
+        freqs = np.arange(1, 100001, dtype=np.float64)
+        power = np.ones(freqs.size)
+        power[54321] = 1e6
+        f_out, p_out = downsample_spectrum(freqs, power, 512, method='minmax')
+
+        self.assertLessEqual(f_out.size, 512)
+        self.assertEqual(p_out.max(), 1e6)
+        self.assertEqual(p_out.min(), 1.0)
+
+    def test_light_results_drop_full_spectrum(self):
+        """Test that queued results only carry the decimated spectrum."""
+        light = light_results(self.results, max_points=256)
+
+        self.assertLessEqual(light['frequency_analysis']['frequencies'].size, 256)
+        self.assertNotIn('peaks', light['frequency_analysis'])
+        self.assertIs(light['coherence_analysis'], self.results['coherence_analysis'])
+
+    def test_plotter_reuses_figure(self):
+        """Test that consecutive renders share one figure and write images."""
+        plotter = AnalysisPlotter(self.validator, dpi=40, max_points=512)
+        fig = plotter.fig
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(2):
+                path = os.path.join(tmp, f"series_{i}.png")
+                plotter.render(self.results, path)
+                self.assertGreater(os.path.getsize(path), 0)
+        self.assertIs(plotter.fig, fig)
+        self.assertEqual(len(fig.axes), 6)
+
+    def test_background_plotter_future(self):
+        """Test that background plots resolve to their output path."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "background.png")
+            with BackgroundPlotter(self.validator, dpi=40, max_points=512) as plotter:
+                future = plotter.submit(self.results, path)
+            self.assertEqual(future.result(), path)
+            self.assertTrue(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the bit-packed Golay(24,12) codec.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import contextlib
+import io
+import unittest
+import numpy as np
+import golay
+from bitstream import pack_bits, unpack_bits
+from noise_theory_validator import UBPNoiseValidator
+
+
+class TestGolay(unittest.TestCase):
+    """Test cases for the code tables, the codec and the syndrome metric."""
+
+    def test_code_tables(self):
+        """Test distance 8, coset sizes and byte-table syndromes."""
+        messages = np.arange(4096, dtype=np.uint32)
+        codewords = (messages << 12) | golay.PARITY_TABLE[messages]
+        weights = {int(bin(int(word)).count('1')) for word in codewords}
+        self.assertEqual(weights, {0, 8, 12, 16, 24})
+        np.testing.assert_array_equal(np.bincount(golay.ERROR_WEIGHT), [1, 24, 276, 2024, 1771])
+
+        packed = np.random.default_rng(0).integers(0, 256, 3000, dtype=np.uint8)
+        fields = golay.unpack_fields(packed, 2000)
+        np.testing.assert_array_equal(golay.syndromes(packed, 24000),
+                                      golay.PARITY_TABLE[fields[0::2]] ^ fields[1::2])
+        np.testing.assert_array_equal(golay.pack_fields(fields)[0], packed)
+
+    def test_encode_decode_corrects_three_errors(self):
+        """Test that up to three flipped bits per word are corrected and four are flagged."""
+        rng = np.random.default_rng(1)
+        bits = rng.integers(0, 2, 1201, dtype=np.uint8)
+        codewords, n_code_bits = golay.encode(*pack_bits(bits))
+        self.assertEqual(n_code_bits, 24 * 101)
+
+        received = unpack_bits(codewords, n_code_bits).reshape(-1, 24)
+        for index, word in enumerate(received):
+            word[rng.choice(24, index % 5, replace=False)] ^= 1
+        messages, n_message_bits, error_weights = golay.decode(*pack_bits(received.reshape(-1)))
+
+        np.testing.assert_array_equal(error_weights, np.arange(101) % 5)
+        decoded = unpack_bits(messages, n_message_bits).reshape(-1, 12)
+        original = np.concatenate([bits, np.zeros(11, dtype=np.uint8)]).reshape(-1, 12)
+        correctable = error_weights < golay.UNCORRECTABLE
+        np.testing.assert_array_equal(decoded[correctable], original[correctable])
+
+    def test_syndrome_metric(self):
+        """Test the metric on random bits, on codewords and through the validator."""
+        rng = np.random.default_rng(2)
+        packed = rng.integers(0, 256, 3 * 200000, dtype=np.uint8)
+        result = golay.golay_analysis(packed, packed.size * 8, block_words=30000)
+        self.assertEqual(result['n_words'], 200000)
+        self.assertAlmostEqual(result['correction_rate'], 2324 / 4096, delta=0.005)
+        self.assertLess(result['random_deviation'], 0.01)
+        self.assertAlmostEqual(result['syndrome_weight_distribution'].sum(), 1.0)
+
+        codewords, n_bits = golay.encode(packed[:3000], 24000)
+        coded = golay.golay_analysis(codewords, n_bits)
+        self.assertEqual(coded['codeword_fraction'], 1.0)
+        self.assertEqual(coded['syndrome_weight_distribution'][0], 1.0)
+
+        validator = UBPNoiseValidator()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = validator.validate_noise_hypothesis(rng.normal(size=48000), 1e6,
+                                                          stages=['nrci', 'golay'])
+        self.assertEqual(results['golay_analysis']['n_words'], 2000)
+        self.assertNotIn('coherence_analysis', results)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests that importing the validator stays light (heavy dependencies are lazy).
+"""
+
+import sys
+import os
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.append(SRC_DIR)
+
+import json
+import subprocess
+import unittest
+
+# Modules that must only be imported by the stages that need them
+HEAVY_MODULES = ('matplotlib', 'matplotlib.pyplot', 'scipy.signal', 'scipy.stats',
+                 'scipy.fft', 'scipy.sparse', 'h5py')
+
+# Wall-clock budget for importing the validator in a fresh interpreter (seconds)
+IMPORT_TIME_BUDGET = 1.0
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+import noise_theory_validator
+elapsed = time.perf_counter() - start
+import numpy as np
+validator = noise_theory_validator.UBPNoiseValidator()
+validator.compute_nrci(np.random.randn(4096))
+print(json.dumps({{'elapsed': elapsed,
+                   'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+class TestLazyImports(unittest.TestCase):
+    """Test cases for validator import cost."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Import the validator in a fresh interpreter and record the outcome."""
+        probe = PROBE.format(src=os.path.abspath(SRC_DIR), heavy=HEAVY_MODULES)
+        output = subprocess.run([sys.executable, '-c', probe], check=True,
+                                capture_output=True, text=True).stdout
+        cls.report = json.loads(output.strip().splitlines()[-1])
+
+    def test_heavy_modules_not_loaded(self):
+        """Test that import plus an NRCI-only job loads no heavy dependency."""
+        self.assertEqual(self.report['loaded'], [])
+
+    def test_import_time_budget(self):
+        """Test that importing the validator stays within the time budget."""
+        self.assertLess(self.report['elapsed'], IMPORT_TIME_BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()
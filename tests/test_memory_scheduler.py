@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for memory estimation and budget-aware run planning.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import contextlib
+import io
+import tracemalloc
+import unittest
+import numpy as np
+from memory_scheduler import estimate_series_memory, plan_run, stage_memory
+from noise_theory_validator import UBPNoiseValidator
+
+
+class TestMemoryScheduler(unittest.TestCase):
+    """Test cases for the stage memory model and the planner."""
+
+    def test_estimate_bounds_measured_peak(self):
+        """Test that the estimate covers the traced peak of a full validation."""
+        validator = UBPNoiseValidator()
+        for precision, mode in (('double', 'exact'), ('single', 'exact'), ('double', 'sketch')):
+            validator.precision = precision
+            validator.normality_mode = mode
+            signal = validator.as_signal(np.random.default_rng(1).normal(size=1 << 18))
+            with contextlib.redirect_stdout(io.StringIO()):
+                validator.validate_noise_hypothesis(signal[:4096], 1e6)
+                tracemalloc.start()
+                validator.validate_noise_hypothesis(signal, 1e6)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+            estimate = estimate_series_memory(signal.size, precision=precision, normality_mode=mode)
+            self.assertGreaterEqual(estimate['peak'] - estimate['signal'], peak)
+            self.assertLess(estimate['peak'], 2.5 * (peak + estimate['signal']))
+
+    def test_stage_model(self):
+        """Test the per-stage model and the sketch chunk bound."""
+        n = 1 << 24
+        self.assertEqual(stage_memory('nrci', n, itemsize=4), 4 * n)
+        self.assertEqual(stage_memory('normality', n, normality_mode='sketch'),
+                         stage_memory('normality', 1 << 20, normality_mode='sketch'))
+        self.assertGreater(stage_memory('normality', n), 8 * stage_memory('nrci', n))
+        self.assertEqual(estimate_series_memory(n)['normality_mode'], 'sketch')
+        with self.assertRaises(ValueError):
+            stage_memory('spectrum', n)
+
+    def test_bit_stage_models_bound_measured_peak(self):
+        """Test the Golay and randomness estimates against their traced peaks."""
+        validator = UBPNoiseValidator()
+        for stage, compute in (('golay', validator.compute_golay_analysis),
+                               ('randomness', validator.compute_randomness_metrics)):
+            for n in (1 << 16, 1 << 20):
+                binary = validator.discretize_signal(np.random.default_rng(2).normal(size=n))
+                tracemalloc.start()
+                compute(binary)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                self.assertGreaterEqual(stage_memory(stage, n), peak)
+                self.assertLess(stage_memory(stage, n), 2.0 * peak)
+
+    def test_plan_degrades_modes_to_fit(self):
+        """Test exact -> sketch -> single precision fallback and worker counts."""
+        n = 1 << 20
+        roomy = plan_run(100, n, 16384, max_workers=8)
+        self.assertEqual((roomy.workers, roomy.normality_mode, roomy.precision), (8, 'exact', 'double'))
+
+        tight = plan_run(100, n, 1024, max_workers=8)
+        self.assertEqual(tight.normality_mode, 'sketch')
+        self.assertLessEqual(tight.total_bytes, tight.budget_bytes)
+
+        single = plan_run(100, n, 1024, max_workers=8, allow_single=True)
+        self.assertEqual(single.precision, 'single')
+        self.assertGreaterEqual(single.workers, tight.workers)
+        self.assertEqual(single.settings(), {'precision': 'single', 'normality_mode': 'sketch'})
+
+        no_normality = plan_run(100, n, 1024, stages=['coherence', 'nrci'], max_workers=8)
+        self.assertGreater(no_normality.workers, tight.workers)
+
+        for plan in (roomy, tight, single, no_normality):
+            self.assertLessEqual(plan.total_bytes, plan.budget_bytes)
+        with self.assertRaises(ValueError):
+            plan_run(1, 1 << 30, 512)
+
+    def test_plan_counts_shared_copy(self):
+        """Test that the shared-memory copy is budgeted and refused when it cannot fit."""
+        n = 1 << 20
+        plain = plan_run(1000, n, 4096, stages=['coherence', 'nrci'], max_workers=16)
+        shared = plan_run(1000, n, 4096, stages=['coherence', 'nrci'], max_workers=16, shared_series=200)
+        self.assertEqual(shared.shared_bytes, 200 * n * 8)
+        self.assertLess(shared.workers, plain.workers)
+        self.assertLessEqual(shared.total_bytes, shared.budget_bytes)
+        self.assertEqual(shared.max_in_flight, 2 * shared.workers)
+        with self.assertRaises(ValueError):
+            plan_run(1000, n, 4096, stages=['coherence', 'nrci'], shared_series=1000)
+
+    def test_plan_counts_prefetch_queue(self):
+        """Test that chunks queued by the prefetcher and the pool are budgeted."""
+        n = 1 << 20
+        plain = plan_run(1000, n, 4096, stages=['coherence', 'nrci'], max_workers=16, chunk_size=64)
+        prefetched = plan_run(1000, n, 4096, stages=['coherence', 'nrci'], max_workers=16, chunk_size=64,
+                              prefetch_depth=4, read_ahead=2)
+        self.assertEqual(plain.queued_chunks, 0)
+        self.assertEqual(prefetched.queued_chunks, 4 + 2 + prefetched.max_in_flight)
+        self.assertLess(prefetched.chunk_size, plain.chunk_size)
+        self.assertLessEqual(prefetched.total_bytes, prefetched.budget_bytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for multi-channel cross-coherence.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import tempfile
+import unittest
+import numpy as np
+import scipy.signal
+from multichannel import coherence_pairs, multichannel_coherence
+from noise_theory_validator import UBPNoiseValidator
+
+
+class TestMultichannel(unittest.TestCase):
+    """Test cases for pairwise binary and spectral coherence."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Twelve channels, the first four sharing a common component."""
+        rng = np.random.default_rng(8)
+        cls.fs = 1e4
+        cls.data = rng.normal(size=(12, 30000))
+        cls.data[:4] += rng.normal(size=30000)
+        cls.result = multichannel_coherence(cls.data, cls.fs, nperseg=256, segments_per_batch=7,
+                                            block_channels=5, workers=3)
+
+    def test_binary_coherence_matches_matrix_product(self):
+        """Test the chunked binary coherence against one B @ B.T."""
+        binary = (self.data > 0).astype(np.float64)
+        np.testing.assert_allclose(self.result['binary_coherence'], binary @ binary.T / binary.shape[1])
+
+    def test_msc_matches_scipy(self):
+        """Test pairwise MSC against scipy.signal.coherence in both orders."""
+        for i, j in [(0, 1), (2, 9), (10, 11)]:
+            freqs, expected = scipy.signal.coherence(self.data[i], self.data[j], fs=self.fs, nperseg=256)
+            np.testing.assert_allclose(self.result['msc'][:, i, j], expected)
+            np.testing.assert_allclose(self.result['msc'][:, j, i], expected)
+        np.testing.assert_allclose(self.result['frequencies'], freqs)
+
+    def test_common_component_pairs(self):
+        """Test that only the coupled channels show spectral coherence."""
+        i, j, values = coherence_pairs(self.result['mean_msc'])
+        coupled = (i < 4) & (j < 4)
+        self.assertEqual(values.size, 66)
+        self.assertGreater(values[coupled].min(), 0.15)
+        self.assertLess(values[~coupled].max(), 0.05)
+
+    def test_memmap_input_via_validator(self):
+        """Test a memmapped capture through the validator entry point."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'capture.f32')
+            capture = np.memmap(path, dtype=np.float32, mode='w+', shape=self.data.shape)
+            capture[:] = self.data
+            capture.flush()
+            mapped = np.memmap(path, dtype=np.float32, mode='r', shape=self.data.shape)
+
+            result = UBPNoiseValidator().compute_multichannel_coherence(mapped, self.fs, nperseg=256)
+            np.testing.assert_allclose(result['binary_coherence'], self.result['binary_coherence'])
+            np.testing.assert_allclose(result['mean_msc'], self.result['mean_msc'], atol=1e-5)
+            del mapped, capture
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the indexed NIST corpus catalog.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import json
+import shutil
+import tempfile
+import unittest
+import h5py
+import numpy as np
+from nist_catalog import NISTCatalog
+from analyze_nist_data import load_catalog_data
+
+
+def write_subset(root, noise_type, subset, metadata, param_values, chunked=False):
+    """Write one parameter-set directory in the NIST layout."""
+    directory = os.path.join(root, noise_type, subset)
+    os.makedirs(directory)
+    with open(os.path.join(directory, 'noise_params.json'), 'w') as f:
+        json.dump(metadata, f)
+    for split, n_rows in (('train', 12), ('test', 4)):
+        rows = np.arange(n_rows * 33, dtype=np.float64).reshape(n_rows, 33)
+        rows[:, 0] = param_values[:n_rows]
+        with h5py.File(os.path.join(directory, f'{split}.h5'), 'w') as h5f:
+            h5f.create_dataset(split, data=rows, chunks=(2, 33) if chunked else None)
+
+
+class TestNISTCatalog(unittest.TestCase):
+    """Test cases for corpus scanning, queries and row reads."""
+
+    def setUp(self):
+        """Set up a small corpus with FBM, FGN and bandpass subsets."""
+        self.root = tempfile.mkdtemp()
+        write_subset(self.root, 'FBM', 'H0p2', {'H': 0.2}, np.full(12, 0.2))
+        write_subset(self.root, 'FBM', 'H0p7', {'H': 0.7}, np.full(12, 0.7), chunked=True)
+        write_subset(self.root, 'FBM', 'Hmix', {'H': 'mixed'}, np.linspace(0.05, 0.95, 12))
+        write_subset(self.root, 'FGN', 'H0p3', {'H': 0.3}, np.full(12, 0.3))
+        write_subset(self.root, 'bandpass', 'band3', {'band': 3}, np.full(12, 3.0))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_build_and_reload(self):
+        """Test that the scan records every dataset and survives a reload."""
+        catalog = NISTCatalog.build(self.root)
+        self.assertEqual(len(catalog), 10)
+        self.assertEqual(catalog.noise_types, ['FBM', 'FGN', 'bandpass'])
+
+        reloaded = NISTCatalog.load(os.path.join(self.root, 'nist_catalog.h5'))
+        np.testing.assert_array_equal(reloaded.files, catalog.files)
+        np.testing.assert_array_equal(reloaded.row_params, catalog.row_params)
+        entry = reloaded.entry(0)
+        self.assertEqual(entry['metadata'], {'H': 0.2})
+        self.assertEqual(entry['row_length'], 32)
+        self.assertGreaterEqual(entry['offset'], 0)
+
+    def test_parameter_queries_read_only_selected_rows(self):
+        """Test metadata and per-row parameter queries on both read paths."""
+        catalog = NISTCatalog.build(self.root)
+
+        selection = catalog.query(noise_type='FBM', split='train', params={'H': (0.2, 0.4)})
+        self.assertEqual([catalog.entry(i)['subset'] for i, _ in selection], [os.path.join('FBM', 'H0p2')])
+
+        selection = catalog.query(noise_type='FBM', split='train', target_range=(0.25, 0.45))
+        (index, rows), = selection
+        self.assertEqual(catalog.entry(index)['subset'], os.path.join('FBM', 'Hmix'))
+        (entry, values, data), = catalog.read(selection)
+        self.assertTrue(np.all((values >= 0.25) & (values <= 0.45)))
+        np.testing.assert_array_equal(data[:, 0], rows * 33 + 1)
+
+        # Chunked datasets are read through HDF5 hyperslabs
+        (index, rows), = catalog.query(noise_type='FBM', split='train', params={'H': 0.7})
+        self.assertEqual(catalog.files[index]['offset'], -1)
+        values, data = catalog.read_rows(index, [1, 2, 3, 7])
+        np.testing.assert_array_equal(data[:, 0], np.array([1, 2, 3, 7]) * 33 + 1)
+        np.testing.assert_array_equal(values, 0.7)
+
+    def test_incremental_rescan(self):
+        """Test that a rescan picks up new subsets and keeps unchanged ones."""
+        NISTCatalog.build(self.root)
+        write_subset(self.root, 'SAS', 'alpha1p5', {'alpha': 1.5}, np.full(12, 1.5))
+        catalog = NISTCatalog.build(self.root)
+        self.assertIn('SAS', catalog.noise_types)
+        self.assertEqual(len(catalog), 12)
+        selection = catalog.query(noise_type='SAS', params={'alpha': 1.5})
+        self.assertEqual(sum(rows.size for _, rows in selection), 16)
+
+    def test_load_catalog_data(self):
+        """Test the analysis driver's catalog loader."""
+        param_values, noise_data = load_catalog_data(self.root, noise_type='FGN', split=None, max_rows=14)
+        self.assertEqual(noise_data.shape, (14, 32))
+        np.testing.assert_array_equal(param_values, 0.3)
+
+        param_values, noise_data = load_catalog_data(self.root, noise_type='shot')
+        self.assertIsNone(noise_data)
+
+
+if __name__ == "__main__":
+    unittest.main()
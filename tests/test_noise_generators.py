@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized NIST-style noise generators.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+import numpy as np
+from noise_generators import (circulant_sqrt_eigenvalues, fdwn_autocovariance, fgn_autocovariance,
+                              fbm, fgn, fdwn, bernoulli_gaussian, symmetric_alpha_stable,
+                              generate_batch)
+from comprehensive_noise_analysis import ComprehensiveNoiseAnalyzer
+
+
+def empirical_autocovariance(batch, n_lags):
+    """Autocovariance averaged over series and time."""
+    n = batch.shape[1]
+    return np.array([np.mean(batch[:, :n - k] * batch[:, k:]) for k in range(n_lags)])
+
+
+class TestNoiseGenerators(unittest.TestCase):
+    """Test cases for circulant embedding and impulsive noise generators."""
+
+    def test_fgn_and_fdwn_autocovariance(self):
+        """Test that batches reproduce the theoretical autocovariance."""
+        for hurst in (0.2, 0.8):
+            batch = fgn(1024, hurst, n_series=2000, rng=1)
+            np.testing.assert_allclose(empirical_autocovariance(batch, 4), fgn_autocovariance(4, hurst),
+                                       atol=0.02)
+
+        batch = fdwn(1024, 0.3, n_series=2000, rng=2)
+        np.testing.assert_allclose(empirical_autocovariance(batch, 4), fdwn_autocovariance(4, 0.3),
+                                   rtol=0.03)
+        self.assertAlmostEqual(fdwn_autocovariance(2, 0.0)[0], 1.0)
+
+    def test_eigenvalue_cache_and_reproducibility(self):
+        """Test the per-(length, H) cache, seeding and batch shapes."""
+        circulant_sqrt_eigenvalues.cache_clear()
+        first = fgn(512, 0.6, n_series=5, rng=7)
+        second = fgn(512, 0.6, n_series=5, rng=7)
+        np.testing.assert_array_equal(first, second)
+        self.assertEqual(first.shape, (5, 512))
+        self.assertEqual(circulant_sqrt_eigenvalues.cache_info().hits, 1)
+        self.assertFalse(circulant_sqrt_eigenvalues('fgn', 512, 0.6).flags.writeable)
+
+        np.testing.assert_allclose(fbm(512, 0.6, n_series=5, rng=7), np.cumsum(first, axis=1))
+        with self.assertRaises(ValueError):
+            fgn(16, 1.2)
+
+    def test_impulsive_noise(self):
+        """Test Bernoulli-Gaussian impulse rate and alpha-stable limits."""
+        bg = bernoulli_gaussian(20000, 0.05, n_series=10, rng=3)
+        self.assertAlmostEqual(np.mean(bg != 0), 0.05, delta=0.005)
+
+        gaussian = symmetric_alpha_stable(200000, 2.0, rng=4)
+        self.assertAlmostEqual(gaussian.var(), 2.0, delta=0.05)
+        cauchy = symmetric_alpha_stable(200000, 1.0, rng=5)
+        self.assertAlmostEqual(np.median(np.abs(cauchy)), 1.0, delta=0.02)
+        heavy = symmetric_alpha_stable(200000, 1.5, rng=6)
+        self.assertAlmostEqual(np.median(heavy), 0.0, delta=0.02)
+        self.assertGreater(np.max(np.abs(heavy)), 50)
+
+    def test_analyzer_wrappers(self):
+        """Test the ComprehensiveNoiseAnalyzer entry points."""
+        analyzer = ComprehensiveNoiseAnalyzer()
+        for name in ('fgn', 'fbm', 'fdwn', 'bg', 'sas'):
+            time, noise = getattr(analyzer, f"generate_{name}_noise")(duration=0.001, sampling_rate=1e6)
+            self.assertEqual(noise.shape, time.shape)
+            self.assertTrue(np.all(np.isfinite(noise)))
+
+        batch = analyzer.generate_reference_batch('FBM', 0.3, 8, rng=0)
+        self.assertEqual(batch.shape, (8, 4096))
+        np.testing.assert_array_equal(batch, generate_batch('FBM', 4096, 0.3, n_series=8, rng=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -208,6 +208,33 @@ class TestUBPNoiseValidator(unittest.TestCase):
             places=10
         )
 
+    def test_single_precision_policy(self):
+        """Test that single precision keeps float32 signals and spectra."""
+        self.validator.precision = 'single'
+        time, noise = self.validator.generate_thermal_noise(
+            sampling_rate=self.test_sampling_rate, duration=self.test_duration
+        )
+        self.assertEqual(noise.dtype, np.float32)
+        self.assertEqual(self.validator.discretize_signal(noise).dtype, np.uint8)
+
+        freq_analysis = self.validator.analyze_resonance_frequencies(noise, self.test_sampling_rate)
+        self.assertEqual(freq_analysis['power_spectrum'].dtype, np.float32)
+        self.assertEqual(len(freq_analysis['frequencies']), len(noise) // 2 - 1)
+
+    def test_precision_check(self):
+        """Test that single precision matches float64 on thermal noise."""
+        np.random.seed(7)
+        time, noise = self.validator.generate_thermal_noise(
+            sampling_rate=self.test_sampling_rate, duration=self.test_duration
+        )
+        report = self.validator.check_precision(noise, self.test_sampling_rate)
+
+        self.assertEqual(self.validator.precision, 'double')
+        self.assertLess(report['max_relative_error'], 1e-3)
+        self.assertTrue(report['resonances_match'])
+        double, single, error = report['metrics']['mean_coherence']
+        self.assertEqual(double, single)
+
 class TestPackageIntegration(unittest.TestCase):
     """Integration tests for the complete package."""
     
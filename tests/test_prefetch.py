@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the prefetching chunk reader.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import contextlib
+import io
+import tempfile
+import threading
+import time
+import unittest
+import h5py
+import numpy as np
+from prefetch import ChunkPrefetcher, contiguous_chunks, prefetch_series
+from analyze_nist_data import analyze_nist_thermal_noise
+from ubp_cli import run_batch
+
+
+class SlowReader:
+    """Row reader with a fixed latency that records how far it ran ahead."""
+
+    def __init__(self, data, latency=0.0):
+        self.data = data
+        self.latency = latency
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def read(self, start, stop):
+        time.sleep(self.latency)
+        with self.lock:
+            self.calls.append((start, stop))
+        return self.data[start:stop]
+
+
+class TestPrefetch(unittest.TestCase):
+    """Test cases for ordering, bounded read-ahead, overlap and errors."""
+
+    def setUp(self):
+        self.data = np.arange(40 * 16, dtype=np.float64).reshape(40, 16)
+
+    def test_order_and_read_ahead_grouping(self):
+        """Test in-order delivery, coalesced reads and index gaps."""
+        reader = SlowReader(self.data)
+        chunks = contiguous_chunks([0, 1, 2, 3, 4, 5, 9, 10, 11], 2)
+        self.assertEqual(chunks, [(0, 2), (2, 4), (4, 6), (9, 11), (11, 12)])
+
+        with ChunkPrefetcher(reader.read, chunks, depth=2, read_ahead=3) as prefetcher:
+            delivered = [(start, stop, rows.copy()) for start, stop, rows in prefetcher]
+        self.assertEqual([(start, stop) for start, stop, _ in delivered], chunks)
+        for start, stop, rows in delivered:
+            np.testing.assert_array_equal(rows, self.data[start:stop])
+        self.assertEqual(reader.calls, [(0, 6), (9, 12)])
+        self.assertEqual(prefetcher.stats['reads'], 2)
+
+        series = list(prefetch_series(reader.read, [3, 4, 7], chunk_size=8))
+        self.assertEqual([index for index, _ in series], [3, 4, 7])
+        np.testing.assert_array_equal(series[2][1], self.data[7])
+
+    def test_reader_is_bounded_and_overlaps(self):
+        """Test that reads stay within depth chunks ahead and hide latency."""
+        reader = SlowReader(self.data, latency=0.02)
+        chunks = contiguous_chunks(range(40), 2)
+        ahead = []
+        started = time.perf_counter()
+        with ChunkPrefetcher(reader.read, chunks, depth=2) as prefetcher:
+            for consumed, (start, stop, rows) in enumerate(prefetcher, start=1):
+                time.sleep(0.02)
+                ahead.append(len(reader.calls) - consumed)
+        elapsed = time.perf_counter() - started
+
+        self.assertLessEqual(max(ahead), 3)
+        self.assertLess(elapsed, 0.75 * 2 * 0.02 * len(chunks))
+
+    def test_errors_and_early_close(self):
+        """Test that read errors reach the consumer and close() stops the reader."""
+        def failing(start, stop):
+            if start >= 4:
+                raise OSError("disk went away")
+            return self.data[start:stop]
+
+        with self.assertRaises(OSError):
+            with ChunkPrefetcher(failing, contiguous_chunks(range(10), 2)) as prefetcher:
+                for item in prefetcher:
+                    pass
+
+        reader = SlowReader(self.data)
+        prefetcher = ChunkPrefetcher(reader.read, contiguous_chunks(range(40), 1), depth=1)
+        next(iter(prefetcher))
+        prefetcher.close()
+        self.assertFalse(prefetcher._thread.is_alive())
+        self.assertLess(len(reader.calls), 40)
+
+    def test_batch_and_nist_driver_results_unchanged(self):
+        """Test that prefetching does not change run_batch or NIST driver results."""
+        rng = np.random.default_rng(5)
+        rows = rng.normal(size=(6, 4097))
+        rows[:, 0] = 3.0
+
+        class MatrixSource:
+            n_series, series_length = rows.shape
+
+            def describe(self):
+                return "matrix"
+
+            def read(self, start, stop):
+                return rows[start:stop]
+
+        stages = ['coherence', 'nrci', 'toggle']
+        direct = run_batch(MatrixSource(), range(6), 1e6, stages=stages, chunk_size=2)
+        prefetched = run_batch(MatrixSource(), range(6), 1e6, stages=stages, chunk_size=2, prefetch_depth=2)
+        self.assertEqual({i: s.nrci for i, s in direct.items()}, {i: s.nrci for i, s in prefetched.items()})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'test.h5')
+            with h5py.File(path, 'w') as h5f:
+                h5f.create_dataset('test', data=rows)
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, streamed = analyze_nist_thermal_noise(path, os.path.join(tmp, 'none.json'), n_analyze=6,
+                                                         plot_mode='none', prefetch_chunk=4)
+                _, loaded = analyze_nist_thermal_noise(path, os.path.join(tmp, 'none.json'), n_analyze=6,
+                                                       plot_mode='none', prefetch_depth=0)
+        self.assertEqual(streamed, loaded)
+        self.assertEqual(len(streamed['nrci_values']), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
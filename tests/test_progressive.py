@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for progressive-precision metric estimation.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+import numpy as np
+from noise_theory_validator import UBPNoiseValidator
+from progressive import PROGRESSIVE_METRICS, progressive_metrics, strided_order
+
+
+class TestProgressive(unittest.TestCase):
+    """Test cases for orders, early stopping and exact full consumption."""
+
+    def setUp(self):
+        self.signal = np.random.default_rng(0).normal(size=4_000_000).astype(np.float32)
+        self.validator = UBPNoiseValidator()
+
+    def test_strided_order_is_permutation(self):
+        """Test that the bit-reversal order visits every pair once, spread evenly."""
+        order = strided_order(1000)
+        np.testing.assert_array_equal(np.sort(order), np.arange(1000))
+        self.assertEqual(sorted(order[:4].tolist()), [0, 256, 512, 768])
+
+    def test_stops_at_target_precision(self):
+        """Test early stopping and that the interval covers the full-signal value."""
+        binary = self.validator.discretize_signal(self.signal)
+        exact_coherence = self.validator.compute_coherence(binary)[0].mean()
+        for order in ('random', 'strided'):
+            result = self.validator.compute_progressive_metrics(self.signal, precision=4e-3,
+                                                                order=order, rng=1)
+            self.assertTrue(result['converged'])
+            self.assertLess(result['fraction_consumed'], 0.5)
+            self.assertLessEqual(result['half_widths']['nrci'], 4e-3)
+            self.assertLess(abs(result['estimates']['mean_coherence'] - exact_coherence),
+                            2 * result['half_widths']['mean_coherence'])
+
+        precise = progressive_metrics(self.signal, precision={'mean_coherence': 5e-4}, rng=1)
+        self.assertGreater(precise['pairs_used'], result['pairs_used'])
+
+    def test_full_consumption_is_exact(self):
+        """Test that an unreachable precision reads everything and matches the validator."""
+        signal = self.signal[:400_000]
+        result = progressive_metrics(signal, metrics=PROGRESSIVE_METRICS, precision=0.0)
+        binary = self.validator.discretize_signal(signal)
+        self.assertTrue(result['converged'])
+        self.assertEqual(result['fraction_consumed'], 1.0)
+        self.assertAlmostEqual(result['estimates']['mean_coherence'],
+                               self.validator.compute_coherence(binary)[0].mean(), places=12)
+        self.assertAlmostEqual(result['estimates']['nrci'], self.validator.compute_nrci(signal), places=2)
+        self.assertEqual(result['half_widths']['toggle_rate'], 0.0)
+
+        self.validator.discretization_mode = 'median'
+        with self.assertRaises(ValueError):
+            self.validator.compute_progressive_metrics(signal)
+        with self.assertRaises(ValueError):
+            progressive_metrics(signal, metrics=['spectrum'])
+        with self.assertRaises(ValueError):
+            progressive_metrics(signal, growth=1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the bit-packed randomness metrics.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import contextlib
+import io
+import unittest
+import numpy as np
+import randomness_metrics
+from bitstream import pack_bits
+from noise_theory_validator import UBPNoiseValidator
+
+
+def _metrics(text, **kwargs):
+    bits = np.array([int(c) for c in text], dtype=np.uint8)
+    return randomness_metrics.randomness_metrics(*pack_bits(bits), **kwargs)
+
+
+class TestRandomnessMetrics(unittest.TestCase):
+    """Test cases for the window histogram, NIST examples and chunk merging."""
+
+    def test_window_histogram_matches_brute_force(self):
+        """Test the packed kernel against direct window counts at odd lengths."""
+        rng = np.random.default_rng(0)
+        for n_bits in (15, 16, 23, 24, 1003, 40001):
+            bits = rng.integers(0, 2, n_bits, dtype=np.uint8)
+            expected = np.bincount(randomness_metrics._window_values(bits), minlength=1 << 16)
+            counts = randomness_metrics.window_histogram(*pack_bits(bits), block_bytes=1000)
+            np.testing.assert_array_equal(counts, expected)
+
+    def test_nist_examples(self):
+        """Test the worked examples of NIST SP 800-22."""
+        self.assertAlmostEqual(_metrics('1011010101')['frequency_p_value'], 0.527089, places=6)
+        runs = _metrics('1001101011')
+        self.assertEqual(runs['runs'], 7)
+        self.assertAlmostEqual(runs['runs_p_value'], 0.147232, places=6)
+        serial = _metrics('0011011101', serial_block=3)
+        np.testing.assert_allclose(serial['serial_statistics'], (1.6, 0.8))
+        np.testing.assert_allclose(serial['serial_p_values'], (0.808792, 0.670320), atol=1e-6)
+        apen = _metrics('0100110101', apen_block=3)
+        self.assertAlmostEqual(apen['approximate_entropy'], 0.190954, places=6)
+        self.assertAlmostEqual(apen['apen_p_value'], 0.261961, places=6)
+        self.assertEqual(randomness_metrics.lempel_ziv_phrases(b'\0\0\0\1\1\0\1\0\0\1\0\0\0\1\0\1'), 6)
+
+    def test_chunks_merge_exactly(self):
+        """Test that chunked and split-and-merged runs equal one pass."""
+        rng = np.random.default_rng(2)
+        bits = rng.integers(0, 2, 300_001, dtype=np.uint8)
+        packed, n_bits = pack_bits(bits)
+        whole = randomness_metrics.randomness_metrics(packed, n_bits, lz_spacing=1 << 16)
+        chunked = randomness_metrics.randomness_metrics(packed, n_bits, chunk_bits=8 * 4099,
+                                                        lz_spacing=1 << 16)
+
+        # Independent sketches of bit-aligned pieces, merged afterwards
+        pieces = [randomness_metrics.RandomnessSketch(lz_spacing=1 << 16).update(*pack_bits(piece))
+                  for piece in np.split(bits, [7, 100_003, 100_010])]
+        merged = pieces[0].merge(pieces[1]).merge(pieces[2]).merge(pieces[3]).results()
+        for result in (chunked, merged):
+            np.testing.assert_allclose(result['block_entropy'], whole['block_entropy'], rtol=1e-12)
+            self.assertEqual(result['runs'], whole['runs'])
+            np.testing.assert_allclose(result['serial_p_values'], whole['serial_p_values'], rtol=1e-9)
+            self.assertAlmostEqual(result['apen_p_value'], whole['apen_p_value'], places=9)
+        self.assertEqual(chunked['lz_blocks'], whole['lz_blocks'])
+        self.assertEqual(chunked['lz_complexity'], whole['lz_complexity'])
+        self.assertAlmostEqual(whole['lz_complexity'], 1.0, delta=0.1)
+        self.assertGreater(whole['serial_p_values'][0], 0.001)
+
+        # A period-4 stream passes NRCI but not the sequential metrics
+        periodic = randomness_metrics.randomness_metrics(*pack_bits(np.tile([0, 0, 1, 1], 5000)))
+        self.assertAlmostEqual(periodic['bit_mean'], 0.5)
+        self.assertAlmostEqual(periodic['block_entropy'][7], 2.0)
+        self.assertLess(periodic['serial_p_values'][0], 1e-6)
+        self.assertLess(periodic['lz_complexity'], 0.1)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = UBPNoiseValidator().validate_noise_hypothesis(rng.normal(size=50000), 1000.0,
+                                                                    stages=['nrci', 'randomness'])
+        self.assertEqual(results['randomness_analysis']['n_bits'], 50000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for time-resolved resonance tracking.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+import numpy as np
+import scipy.signal
+from noise_theory_validator import UBPNoiseValidator
+from resonance_tracking import ResonanceTracker, track_resonances
+
+
+class TestResonanceTracking(unittest.TestCase):
+    """Test cases for the chunked short-time band-power tracker."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Noise with a 5 kHz tone between 1.0 s and 1.5 s."""
+        cls.fs = 1e5
+        rng = np.random.default_rng(4)
+        t = np.arange(int(2 * cls.fs)) / cls.fs
+        cls.signal = rng.normal(size=t.size)
+        burst = (t >= 1.0) & (t < 1.5)
+        cls.signal[burst] += 2 * np.sin(2 * np.pi * 5000 * t[burst])
+        cls.targets = {'tone': 5000.0, 'quiet': 20000.0, 'too_low': 1.0}
+
+    def test_matches_scipy_spectrogram(self):
+        """Test band power against scipy.signal.spectrogram."""
+        table = track_resonances(self.signal, self.fs, {'tone': 5000.0}, nperseg=1024)
+        freqs, times, psd = scipy.signal.spectrogram(self.signal, self.fs, window='hann', nperseg=1024,
+                                                     noverlap=512, detrend='constant', scaling='density')
+        band = (freqs > 0) & (np.abs(freqs - 5000) <= 500)
+        np.testing.assert_allclose(table['band_power'][:, 0], psd[band].sum(axis=0) * freqs[1])
+        np.testing.assert_allclose(table['times'], times)
+
+    def test_chunking_does_not_change_result(self):
+        """Test that arbitrary chunk boundaries give the same table."""
+        small = track_resonances(self.signal, self.fs, self.targets, chunk_size=7777, nperseg=1024)
+        whole = track_resonances(self.signal, self.fs, self.targets, chunk_size=10**7, nperseg=1024)
+        np.testing.assert_allclose(small['band_power'], whole['band_power'])
+
+    def test_transient_is_localized(self):
+        """Test that the burst shows up only in frames inside it, for both methods."""
+        for method in ('stft', 'multitaper'):
+            table = track_resonances(self.signal, self.fs, self.targets, nperseg=1024, method=method)
+            times, significance = table['times'], table['significance']
+            inside = (times > 1.01) & (times < 1.49)
+            outside = (times < 0.99) | (times > 1.51)
+
+            self.assertGreater(significance[inside, 0].min(), 10)
+            self.assertLess(np.median(significance[outside, 0]), 2)
+            self.assertLess(significance[:, 1].max(), 5)
+            self.assertEqual(list(table['resolvable']), [True, True, False])
+            self.assertTrue(np.isnan(table['band_power'][:, 2]).all())
+
+    def test_validator_default_targets(self):
+        """Test the validator entry point with the UBP resonance targets."""
+        validator = UBPNoiseValidator()
+        tracker = ResonanceTracker(1e6, validator.resonance_targets(), nperseg=2**21)
+        table = validator.track_resonances(self.signal[:50000], 1e6, nperseg=4096)
+
+        self.assertEqual(table['target_names'], list(validator.resonance_targets()))
+        self.assertEqual(table['band_power'].shape, (23, 4))
+        self.assertTrue(tracker.resolvable[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
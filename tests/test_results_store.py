@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar HDF5 results store.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import tempfile
+import unittest
+import h5py
+import numpy as np
+from noise_theory_validator import UBPNoiseValidator
+from results_store import ResultsStore, load_results_npz
+from validation_results import SummaryTable
+
+
+class TestResultsStore(unittest.TestCase):
+    """Test cases for appending, resuming and reading stored results."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Validate a few short signals shared by all tests."""
+        validator = UBPNoiseValidator()
+        cls.table = SummaryTable()
+        for i in range(6):
+            time, noise = validator.generate_thermal_noise(sampling_rate=1e5, duration=0.02)
+            cls.table.append(validator.validate_noise_hypothesis(noise, 1e5, f"Series {i}"))
+
+    def setUp(self):
+        """Create a temporary store path."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'results.h5')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_append_and_read_columns(self):
+        """Test incremental appends and single-column reads."""
+        with ResultsStore(self.path) as store:
+            store.append(self.table.array[:4], series_index=[10, 11, 12, 13])
+            store.append(self.table.array[4:])
+
+        with ResultsStore(self.path, mode='r') as store:
+            self.assertEqual(len(store), 6)
+            np.testing.assert_array_equal(store.read_column('series_index'), [10, 11, 12, 13, 4, 5])
+            np.testing.assert_allclose(store.read_column('nrci'), self.table.column('nrci'))
+
+            subset = store.read(columns=['signal_name', 'mean_coherence'],
+                                rows=store.read_column('series_index') >= 12)
+            self.assertEqual(subset['signal_name'].tolist(), [b'Series 2', b'Series 3'])
+
+    def test_uncommitted_rows_are_dropped_on_reopen(self):
+        """Test that a partially written append is discarded when resuming."""
+        with ResultsStore(self.path) as store:
+            store.append(self.table.array[:3])
+
+        # Simulate a crash after one column was extended but before commit
+        with h5py.File(self.path, 'a') as h5f:
+            h5f['summaries/nrci'].resize((5,))
+
+        with ResultsStore(self.path) as store:
+            self.assertEqual(len(store), 3)
+            self.assertEqual(store.read_column('nrci').size, 3)
+            store.append(self.table.array[3:])
+            self.assertEqual(len(store), 6)
+            np.testing.assert_array_equal(store.read_column('series_index'), np.arange(6))
+
+    def test_npz_export(self):
+        """Test exporting the columns to an npz archive."""
+        npz_path = os.path.join(self.tmpdir.name, 'results.npz')
+        with ResultsStore(self.path) as store:
+            store.append(self.table)
+            store.to_npz(npz_path, columns=['series_index', 'nrci', 'overall_score'])
+
+        loaded = load_results_npz(npz_path)
+        self.assertEqual(loaded.dtype.names, ('series_index', 'nrci', 'overall_score'))
+        np.testing.assert_allclose(loaded['nrci'], self.table.column('nrci'))
+
+
+if __name__ == "__main__":
+    unittest.main()
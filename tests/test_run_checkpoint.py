@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for resumable run checkpoints.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import tempfile
+import unittest
+from noise_theory_validator import UBPNoiseValidator
+from comprehensive_noise_analysis import ComprehensiveNoiseAnalyzer
+from run_checkpoint import RunCheckpoint
+from validation_results import ValidationSummary
+
+
+class TestRunCheckpoint(unittest.TestCase):
+    """Test cases for periodic commits and resuming."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Validate one short signal shared by all tests."""
+        validator = UBPNoiseValidator()
+        time, noise = validator.generate_thermal_noise(sampling_rate=1e5, duration=0.02)
+        cls.summary = ValidationSummary.from_results(
+            validator.validate_noise_hypothesis(noise, 1e5, "Checkpoint Test"))
+
+    def setUp(self):
+        """Create a temporary checkpoint path."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'checkpoint.h5')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_periodic_commit_and_resume(self):
+        """Test that only committed items survive an interrupted run."""
+        checkpoint = RunCheckpoint(self.path, flush_every=3, flush_seconds=3600)
+        for index in [0, 1, 2, 5]:
+            checkpoint.record(index, self.summary)
+        self.assertTrue(checkpoint.is_done(5))
+
+        # Simulate a crash: the pending item 5 is never flushed
+        checkpoint.store.close()
+
+        with RunCheckpoint(self.path) as resumed:
+            self.assertEqual(resumed.completed, [0, 1, 2])
+            self.assertFalse(resumed.is_done(5))
+            resumed.record(5, self.summary)
+
+        with RunCheckpoint(self.path) as reopened:
+            summaries = reopened.summaries([1, 5])
+            self.assertEqual(list(summaries), [1, 5])
+            self.assertEqual(summaries[5].nrci, self.summary.nrci)
+
+    def test_comprehensive_run_restores_completed_configurations(self):
+        """Test that finished noise types are restored instead of re-run."""
+        with RunCheckpoint(self.path) as checkpoint:
+            for index in range(5):
+                checkpoint.record(index, self.summary)
+
+        analyzer = ComprehensiveNoiseAnalyzer()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("completed configuration was re-generated")
+
+        analyzer.generate_white_noise = fail
+        results = analyzer.analyze_all_noise_types(checkpoint_path=self.path)
+
+        self.assertEqual(list(results), ['thermal', 'white', 'pink', 'shot', 'brownian'])
+        self.assertEqual(results['pink']['nrci'], self.summary.nrci)
+        self.assertTrue(results['pink']['ubp_assessment']['compatible_indicators'])
+        self.assertIn('Executive Summary', analyzer.generate_summary_report())
+
+
+if __name__ == "__main__":
+    unittest.main()
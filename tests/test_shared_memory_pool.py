@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared-memory dataset handoff.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pickle
+import unittest
+from multiprocessing import shared_memory
+import numpy as np
+from shared_memory_pool import SharedArraySource, SharedBlockPool, validate_shared
+from ubp_cli import run_batch
+
+
+class TestSharedMemoryPool(unittest.TestCase):
+    """Test cases for shared blocks, views and the batch handoff."""
+
+    def setUp(self):
+        """Set up a small signal matrix."""
+        rng = np.random.default_rng(8)
+        self.matrix = rng.normal(size=(6, 20000))
+
+    def test_views_share_pages_and_blocks_are_unlinked(self):
+        """Test zero-copy attachment, packed bits and cleanup."""
+        with SharedBlockPool() as pool:
+            shared = pool.share(self.matrix)
+            bits = pool.share_bits(self.matrix > 0)
+            self.assertLess(len(pickle.dumps(shared)), 300)
+
+            view = shared.attach()
+            np.testing.assert_array_equal(view, self.matrix)
+            self.assertFalse(view.flags.writeable)
+            self.assertTrue(np.shares_memory(view, shared.attach()))
+
+            self.assertEqual(bits.shape, (6, 2500))
+            self.assertEqual(bits.n_bits, 20000)
+            np.testing.assert_array_equal(np.unpackbits(bits.attach(), axis=1), self.matrix > 0)
+            self.assertEqual(pool.nbytes, shared.nbytes + bits.nbytes)
+            del view
+
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=shared.name)
+
+    def test_source_offsets_and_single_precision_storage(self):
+        """Test the batch source over a shared span of series."""
+        with SharedBlockPool() as pool:
+            shared = pool.share(self.matrix[2:5], dtype=np.float32)
+            source = SharedArraySource(shared, first_index=2)
+            self.assertEqual((source.n_series, source.series_length), (5, 20000))
+            rows = source.read(3, 5)
+            self.assertEqual(rows.dtype, np.float32)
+            np.testing.assert_allclose(rows, self.matrix[3:5], rtol=1e-6)
+            del rows
+
+    def test_parallel_validation_matches_serial(self):
+        """Test that workers on shared views reproduce the serial summaries."""
+        class MatrixSource:
+            n_series, series_length = self.matrix.shape
+
+            def describe(self):
+                return "matrix"
+
+            def read(inner, start, stop):
+                return self.matrix[start:stop]
+
+        stages = ['coherence', 'nrci', 'toggle']
+        serial = run_batch(MatrixSource(), range(6), 1e6, stages=stages)
+        with SharedBlockPool() as pool:
+            shared = pool.share(self.matrix)
+            parallel = validate_shared(pool, shared, 1e6, stages=stages, workers=2, chunk_size=2)
+            with self.assertRaises(ValueError):
+                validate_shared(SharedBlockPool(), shared, 1e6)
+
+        self.assertEqual(sorted(parallel), list(range(6)))
+        for index in range(6):
+            self.assertEqual(parallel[index].nrci, serial[index].nrci)
+            self.assertEqual(parallel[index].toggle_count, serial[index].toggle_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for top-K spectral peak extraction and target matching.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+import numpy as np
+from scipy.signal import find_peaks, peak_prominences
+from noise_theory_validator import UBPNoiseValidator
+from spectral_peaks import local_maxima, match_targets, top_k_peaks
+
+
+class TestSpectralPeaks(unittest.TestCase):
+    """Test cases for maxima, partial selection, noise floor and matching."""
+
+    def setUp(self):
+        self.power = np.random.default_rng(0).exponential(size=1 << 16)
+
+    def test_top_k_matches_exhaustive_search(self):
+        """Test maxima and top-K selection against find_peaks plus a full sort."""
+        peaks = find_peaks(self.power)[0]
+        np.testing.assert_array_equal(local_maxima(self.power), peaks)
+
+        indices, scores = top_k_peaks(self.power, 20)
+        expected = np.sort(peaks[np.argsort(self.power[peaks])[-20:]])
+        np.testing.assert_array_equal(indices, expected)
+        np.testing.assert_array_equal(scores, self.power[expected])
+
+        indices, scores = top_k_peaks(self.power, 5, rank='prominence', wlen=None)
+        prominences = peak_prominences(self.power, peaks)[0]
+        np.testing.assert_array_equal(indices, np.sort(peaks[np.argsort(prominences)[-5:]]))
+
+        self.assertEqual(top_k_peaks(np.ones(100), 4)[0].size, 0)
+        with self.assertRaises(ValueError):
+            top_k_peaks(self.power, 4, rank='height')
+
+    def test_noise_floor_normalization(self):
+        """Test that a weak tone outside a broad hump is found only against the floor."""
+        power = self.power.copy()
+        power[20000:30000] *= 20
+        power[50000] = 60
+        self.assertNotIn(50000, top_k_peaks(power, 4)[0])
+        self.assertIn(50000, top_k_peaks(power, 4, noise_window=512)[0])
+        self.assertIn(50000, top_k_peaks(power, 4, rank='prominence', noise_window=512)[0])
+
+    def test_matching_and_validator_mode(self):
+        """Test binary-search matching and the validator's top_k peak mode."""
+        peak_freqs = np.sort(np.random.default_rng(1).uniform(0, 1e5, 300))
+        targets = {'a': 5e3, 'b': 7.7e4, 'c': 1e7, 'd': 0.5}
+        matched = match_targets(peak_freqs, targets)
+        for name, target in targets.items():
+            nearest = int(np.argmin(np.abs(peak_freqs - target)))
+            if abs(peak_freqs[nearest] - target) / target <= 0.1:
+                self.assertEqual(matched[name], nearest)
+            else:
+                self.assertNotIn(name, matched)
+
+        validator = UBPNoiseValidator()
+        validator.peak_mode = 'top_k'
+        validator.peak_count = 8
+        validator.neural_freq = 31415.0
+        t = np.arange(100000) / 1e6
+        signal = np.random.default_rng(2).normal(size=t.size) + 0.2 * np.sin(2 * np.pi * 31410.0 * t)
+        analysis = validator.analyze_resonance_frequencies(signal, 1e6)
+        self.assertEqual(analysis['peaks']['frequencies'].size, 8)
+        self.assertEqual(analysis['peaks']['scores'].size, 8)
+        self.assertAlmostEqual(analysis['detected_resonances']['neural']['detected_freq'], 31410.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
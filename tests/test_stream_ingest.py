@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio sample-stream ingestion server.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import shutil
+import tempfile
+import time
+import unittest
+import numpy as np
+from stream_ingest import IngestServer, OnlineValidator, SampleRing, encode_frame, send_frames
+
+
+class SlowStages(OnlineValidator):
+    """Online stages that fall behind the producer."""
+
+    def update(self, block):
+        time.sleep(0.002)
+        return super().update(block)
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def wait_for_samples(server, n_samples, timeout=10.0):
+    """Wait until the server has received n_samples (accept is asynchronous)."""
+    deadline = time.monotonic() + timeout
+    while server.stats['samples'] < n_samples and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+
+
+class TestStreamIngest(unittest.TestCase):
+    """Test cases for framing, the ring buffer and backpressure."""
+
+    def setUp(self):
+        """Set up a stream of float32 and int16 frames."""
+        rng = np.random.default_rng(12)
+        self.float_blocks = [rng.normal(size=rng.integers(500, 3000)).astype(np.float32) for _ in range(60)]
+        self.int_blocks = [rng.integers(-2000, 2000, size=1024).astype(np.int16) for _ in range(20)]
+
+    def test_ring_wraps_without_copies(self):
+        """Test writes and views across the wrap point."""
+        ring = SampleRing(10)
+        ring.write(np.arange(7, dtype=np.float32))
+        ring.release(5)
+        ring.write(np.arange(7, 13, dtype=np.int16), scale=0.5)
+        views = ring.peek(100)
+        self.assertEqual([view.size for view in views], [5, 3])
+        np.testing.assert_array_equal(np.concatenate(views), [5, 6, 3.5, 4, 4.5, 5, 5.5, 6])
+        self.assertTrue(np.shares_memory(views[0], ring.buffer))
+        with self.assertRaises(ValueError):
+            ring.write(np.zeros(3, dtype=np.float32))
+
+    def test_tcp_stream_with_backpressure(self):
+        """Test that a slow analysis throttles the sender without losing samples."""
+        async def scenario():
+            stages = SlowStages(1e6)
+            server = IngestServer(stages, capacity=4096, block_size=1024)
+            listener = await server.start_tcp('127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            await send_frames(writer, self.float_blocks)
+            writer.close()
+            await writer.wait_closed()
+            await wait_for_samples(server, sum(block.size for block in self.float_blocks))
+            return await server.stop()
+
+        results = run(scenario())
+        signal = np.concatenate(self.float_blocks)
+        states = signal > 0
+        stats = results['ingest_stats']
+
+        self.assertEqual(stats['frames'], 60)
+        self.assertEqual(stats['samples'], signal.size)
+        self.assertEqual(stats['sequence_gaps'], 0)
+        self.assertGreater(stats['backpressure_waits'], 0)
+        self.assertLessEqual(stats['max_fill'], 4096)
+        self.assertEqual(results['toggle_analysis']['total_toggles'], np.count_nonzero(states[1:] != states[:-1]))
+        self.assertAlmostEqual(results['signal_stats']['mean'], signal.mean(), places=6)
+
+    def test_unix_stream_int16_and_gaps(self):
+        """Test int16 scaling, sequence gap counting and resonance tracking."""
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'ingest.sock')
+
+        async def scenario():
+            stages = OnlineValidator(1e6, resonance_targets={'line': 50e3}, nperseg=1024)
+            server = IngestServer(stages, int16_scale=1e-3)
+            await server.start_unix(path)
+            reader, writer = await asyncio.open_unix_connection(path)
+            await send_frames(writer, self.int_blocks[:10])
+            await send_frames(writer, self.int_blocks[10:], first_sequence=11)
+            writer.close()
+            await writer.wait_closed()
+            await wait_for_samples(server, 20 * 1024)
+            return await server.stop()
+
+        try:
+            results = run(scenario())
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertEqual(results['ingest_stats']['sequence_gaps'], 1)
+        self.assertEqual(results['n_samples'], 20 * 1024)
+        expected = np.concatenate(self.int_blocks) * 1e-3
+        self.assertAlmostEqual(results['signal_stats']['std'], expected.std(), places=4)
+        self.assertEqual(results['resonance_tracking']['band_power'].shape, (39, 1))
+
+    def test_invalid_frame_is_reported(self):
+        """Test that a corrupt header surfaces as an error on stop()."""
+        async def scenario():
+            server = IngestServer(OnlineValidator(1e6))
+            listener = await server.start_tcp('127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'XXXX' + encode_frame(np.zeros(4, dtype=np.float32), 0)[4:])
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+            await asyncio.sleep(0.05)
+            return await server.stop()
+
+        with self.assertRaises(ValueError):
+            run(scenario())
+
+
+    def test_stop_cancels_idle_connections(self):
+        """Test that a client holding its socket open without EOF cannot block stop()."""
+        async def scenario():
+            server = IngestServer(OnlineValidator(1e6))
+            listener = await server.start_tcp('127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            await send_frames(writer, self.float_blocks[:2])
+            await wait_for_samples(server, self.float_blocks[0].size + self.float_blocks[1].size)
+            results = await asyncio.wait_for(server.stop(timeout=0.1), 5.0)
+            writer.close()
+            return results
+
+        results = run(scenario())
+        self.assertEqual(results['ingest_stats']['frames'], 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming normality stage (moments, quantile sketch, KS/AD/JB).
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+import numpy as np
+import scipy.stats
+from streaming_normality import (StreamingMoments, LogBinnedHistogram, NormalitySketch,
+                                 exact_normality_tests, sketch_normality_tests)
+from noise_theory_validator import UBPNoiseValidator
+
+
+class TestStreamingNormality(unittest.TestCase):
+    """Test cases for the mergeable normality accumulators."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        rng = np.random.default_rng(7)
+        self.gaussian = rng.normal(0, 1e-7, 100000)
+        self.heavy_tailed = rng.standard_t(4, 100000)
+
+    def test_moments_merge_matches_full_signal(self):
+        """Test that merged chunk moments equal the full-signal moments."""
+        merged = StreamingMoments()
+        for chunk in np.array_split(self.heavy_tailed, 7):
+            merged.merge(StreamingMoments().update(chunk))
+
+        self.assertEqual(merged.count, self.heavy_tailed.size)
+        self.assertAlmostEqual(merged.mean, np.mean(self.heavy_tailed), places=12)
+        self.assertAlmostEqual(merged.std(), np.std(self.heavy_tailed), places=10)
+        self.assertAlmostEqual(merged.skewness, scipy.stats.skew(self.heavy_tailed), places=8)
+        self.assertAlmostEqual(merged.kurtosis, scipy.stats.kurtosis(self.heavy_tailed), places=8)
+
+        jb = scipy.stats.jarque_bera(self.heavy_tailed)
+        self.assertAlmostEqual(merged.jarque_bera()[0] / jb.statistic, 1.0, places=8)
+
+    def test_histogram_quantiles(self):
+        """Test that sketch quantiles are within the relative accuracy."""
+        sketch = LogBinnedHistogram(relative_accuracy=0.01).update(self.heavy_tailed)
+        for q in [0.05, 0.25, 0.75, 0.95]:
+            exact = np.quantile(self.heavy_tailed, q)
+            self.assertLess(abs(sketch.quantile(q) - exact), 0.03 * abs(exact))
+
+    def test_sketch_matches_exact_tests(self):
+        """Test that sketch KS/AD statistics track the exact SciPy values."""
+        for signal in [self.gaussian, self.heavy_tailed]:
+            exact = exact_normality_tests(signal)
+            sketch = sketch_normality_tests(signal, chunk_size=16384)
+
+            self.assertEqual(sketch['mode'], 'sketch')
+            self.assertAlmostEqual(sketch['ks_statistic'], exact['ks_statistic'], delta=5e-4)
+            self.assertLess(abs(sketch['ad_statistic'] - exact['ad_statistic']),
+                            0.02 * exact['ad_statistic'] + 0.05)
+            self.assertAlmostEqual(sketch['jb_statistic'] / exact['jb_statistic'], 1.0, places=6)
+
+    def test_sketch_merge_is_order_independent(self):
+        """Test that sketches built by different workers merge consistently."""
+        parts = np.array_split(self.heavy_tailed, 4)
+        left = NormalitySketch().update(parts[0]).update(parts[1])
+        right = NormalitySketch().update(parts[2]).update(parts[3])
+        merged = left.merge(right).result()
+        single = NormalitySketch().update(self.heavy_tailed).result()
+
+        self.assertAlmostEqual(merged['ks_statistic'], single['ks_statistic'], places=12)
+        self.assertAlmostEqual(merged['ad_statistic'], single['ad_statistic'], places=6)
+
+    def test_validator_sketch_mode(self):
+        """Test that the validator routes large signals to the sketch."""
+        validator = UBPNoiseValidator()
+        validator.exact_normality_max_samples = 1000
+
+        results = validator.compute_statistical_tests(self.gaussian)
+
+        self.assertEqual(results['mode'], 'sketch')
+        self.assertGreater(results['ks_pvalue'], 0.001)
+        self.assertEqual(len(results['ad_critical_values']), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
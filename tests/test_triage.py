@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for cascade triage screening.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import contextlib
+import io
+import unittest
+import numpy as np
+from coherence_analysis import segment_coherence
+from triage import TriageGate, TriageScreen, triage_metrics, triage_report
+from ubp_cli import run_batch
+from validation_results import ValidationSummary
+
+
+class MatrixSource:
+    """Series source over an in-memory matrix."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.n_series, self.series_length = rows.shape
+
+    def describe(self):
+        return "matrix"
+
+    def read(self, start, stop):
+        return self.rows[start:stop]
+
+
+class TestTriage(unittest.TestCase):
+    """Test cases for the z-score metrics, the gates and the two-step cascade."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        white = rng.normal(size=(6, 1 << 15))
+        brown = np.cumsum(rng.normal(size=(2, 1 << 15)), axis=1)
+        self.rows = np.concatenate([white, brown])
+
+    def test_metrics_are_standardized(self):
+        """Test that random bits give unit-variance z-scores, scalar or array."""
+        rng = np.random.default_rng(1)
+        bits = rng.integers(0, 2, (200, 1 << 14), dtype=np.uint8)
+        nrci = 1 - 2 * np.abs(bits.mean(axis=1) - 0.5)
+        toggles = np.count_nonzero(bits[:, 1:] != bits[:, :-1], axis=1) / bits.shape[1]
+        coherence = np.array([segment_coherence(row, 2000)[0].mean() for row in bits])
+
+        metrics = triage_metrics(nrci, toggles, coherence, bits.shape[1])
+        for name in ('toggle_rate_z', 'coherence_z'):
+            self.assertAlmostEqual(np.std(metrics[name]), 1.0, delta=0.2)
+        self.assertLess(np.max(metrics['bit_bias_z']), 4.0)
+        scalar = triage_metrics(nrci[0], toggles[0], coherence[0], bits.shape[1])
+        self.assertAlmostEqual(scalar['coherence_z'], metrics['coherence_z'][0])
+        self.assertTrue(np.isnan(triage_metrics(1.0, 0.5, 0.25, 3000)['coherence_z']))
+
+    def test_screen_escalates_candidates_only(self):
+        """Test that plain noise stops after triage and structured series are escalated."""
+        screen = TriageScreen()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = [screen.validate(row, 1e6) for row in self.rows]
+
+        escalated = [r['triage']['escalated'] for r in results]
+        self.assertEqual(escalated, [False] * 6 + [True] * 2)
+        self.assertNotIn('frequency_analysis', results[0])
+        self.assertIn('statistical_tests', results[-1])
+        self.assertEqual(screen.stats['escalated'], 2)
+        self.assertEqual(screen.pass_rates()['escalated'], 0.25)
+
+        report = triage_report([ValidationSummary.from_results(r) for r in results])
+        self.assertEqual(report['escalated'], 2)
+        self.assertEqual(report['pass_rates'], screen.pass_rates())
+
+        strict = TriageScreen(screen.validator, gates=[TriageGate('toggle_rate_z', -4.0, 4.0),
+                                                        TriageGate('nrci', 0.0, 1.0)], require='all')
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(strict.validate(self.rows[-1], 1e6)['triage']['escalated'])
+        with self.assertRaises(ValueError):
+            TriageScreen(screen.validator, require='most')
+
+    def test_batch_triage(self):
+        """Test that run_batch(triage=True) runs the full stages on candidates only."""
+        summaries = run_batch(MatrixSource(self.rows), range(8), 1e6, triage=True, chunk_size=4)
+        ks = np.array([summaries[i].ks_statistic for i in range(8)])
+        self.assertTrue(np.all(np.isnan(ks[:6])))
+        self.assertFalse(np.any(np.isnan(ks[6:])))
+        self.assertEqual(summaries[7].nrci, run_batch(MatrixSource(self.rows), [7], 1e6)[7].nrci)
+
+
+if __name__ == "__main__":
+    unittest.main()
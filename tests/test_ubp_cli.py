@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the command-line batch driver.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import contextlib
+import io
+import tempfile
+import unittest
+import numpy as np
+from noise_theory_validator import UBPNoiseValidator
+from memory_scheduler import plan_run
+from results_store import ResultsStore
+from ubp_cli import ArraySource, HDF5Source, main, run_batch, _contiguous_chunks
+
+
+class TestUBPCli(unittest.TestCase):
+    """Test cases for sources, chunk planning and end-to-end runs."""
+
+    def run_cli(self, *argv):
+        """Run the CLI and return its standard output."""
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(main(list(argv)), 0)
+        return stdout.getvalue()
+
+    def test_stage_selection(self):
+        """Test that skipped stages are omitted and the assessment still runs."""
+        validator = UBPNoiseValidator()
+        np.random.seed(1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = validator.validate_noise_hypothesis(np.random.randn(5000), 1e6, stages=['nrci'])
+        self.assertIn('nrci', results)
+        self.assertNotIn('coherence_analysis', results)
+        self.assertNotIn('frequency_analysis', results)
+        self.assertEqual(results['ubp_assessment']['overall_score'], 1)
+
+        with self.assertRaises(ValueError):
+            validator.validate_noise_hypothesis(np.random.randn(100), 1e6, stages=['spectrum'])
+
+    def test_run_batch_follows_plan(self):
+        """Test that run_batch reads the chunks of the memory plan it is given."""
+        rows = np.random.default_rng(4).normal(size=(7, 3000))
+        reads = []
+
+        class MatrixSource:
+            n_series, series_length = rows.shape
+
+            def read(self, start, stop):
+                reads.append((start, stop))
+                return rows[start:stop]
+
+        plan = plan_run(7, 3000, 1024, stages=['nrci'], chunk_size=3)
+        summaries = run_batch(MatrixSource(), range(7), 1e6, stages=['nrci'], plan=plan)
+        self.assertEqual(sorted(summaries), list(range(7)))
+        self.assertEqual(reads, [(0, 3), (3, 6), (6, 7)])
+        self.assertEqual(_contiguous_chunks([0, 1, 2, 3, 7, 8], 3), [(0, 3), (3, 4), (7, 9)])
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            for option in (['--prefetch', '-1'], ['--read-ahead', '0']):
+                with self.assertRaises(SystemExit):
+                    main(['synthetic:thermal', '--n-series', '1'] + option)
+
+    def test_raw_source_and_resume(self):
+        """Test a raw-file run with a worker pool, then resuming into the same store."""
+        with tempfile.TemporaryDirectory() as tmp:
+            raw_path = os.path.join(tmp, 'samples.f64')
+            np.random.seed(2)
+            np.random.randn(6 * 4000).tofile(raw_path)
+            self.assertEqual(ArraySource(raw_path, series_length=4000).n_series, 6)
+
+            store_path = os.path.join(tmp, 'results.h5')
+            self.run_cli(raw_path, '--series-length', '4000', '--series', '0:4', '-j', '2',
+                         '--chunk-size', '1', '--stages', 'coherence,nrci', '-o', store_path)
+            output = self.run_cli(raw_path, '--series-length', '4000', '-j', '1', '-o', store_path)
+
+            self.assertIn('Series analyzed: 6', output)
+            with ResultsStore(store_path, mode='r') as store:
+                np.testing.assert_array_equal(np.sort(store.read_column('series_index')), np.arange(6))
+                self.assertTrue(np.isnan(store.read_column('ks_statistic')[:4]).all())
+
+    def test_nist_hdf5_source(self):
+        """Test that the NIST parameter column is not read as a sample."""
+        import h5py
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'test.h5')
+            rows = np.random.default_rng(3).normal(size=(3, 4097))
+            rows[:, 0] = 1e9
+            with h5py.File(path, 'w') as h5f:
+                h5f['test'] = rows
+
+            source = HDF5Source(path)
+            self.assertEqual(source.series_length, 4096)
+            np.testing.assert_array_equal(source.read(0, 2), rows[:2, 1:])
+            raw = HDF5Source(path, param_column=False)
+            self.assertEqual(raw.series_length, 4097)
+            self.assertEqual(raw.read(0, 1)[0, 0], 1e9)
+
+            output = self.run_cli(path, '-j', '1', '--stages', 'nrci')
+            self.assertIn('Series analyzed: 3', output)
+
+    def test_optional_stage_columns(self):
+        """Test that optional stages are accepted and their metrics stored."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store_path = os.path.join(tmp, 'results.h5')
+            self.run_cli('synthetic:white', '--n-series', '2', '--duration', '0.01', '-j', '1',
+                         '--stages', 'nrci,golay,randomness', '-o', store_path)
+            with ResultsStore(store_path, mode='r') as store:
+                codewords = store.read_column('golay_codeword_fraction')
+                self.assertTrue(np.all((codewords >= 0) & (codewords < 0.01)))
+                self.assertTrue(np.all(store.read_column('golay_correction_rate') > 0))
+                self.assertTrue(np.all(store.read_column('runs_p_value') > 0))
+                self.assertTrue(np.all(store.read_column('entropy_rate_16') > 0))
+
+    def test_synthetic_input(self):
+        """Test that synthetic inputs are generated reproducibly per series."""
+        first = self.run_cli('synthetic:thermal', '--n-series', '2', '--duration', '0.005',
+                             '-j', '1', '--stages', 'nrci')
+        second = self.run_cli('synthetic:thermal', '--n-series', '2', '--duration', '0.005',
+                              '-j', '1', '--stages', 'nrci')
+        self.assertIn('Series analyzed: 2', first)
+        self.assertEqual(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
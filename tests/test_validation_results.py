@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact typed validation results.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+import numpy as np
+from noise_theory_validator import ANALYSIS_STAGES, OPTIONAL_STAGES, UBPNoiseValidator
+from validation_results import (SUMMARY_DTYPE, ValidationSummary, ValidationResult,
+                                SummaryTable, summaries_to_array, downsample_spectrum)
+
+
+class TestValidationResults(unittest.TestCase):
+    """Test cases for summaries, spectra and columnar aggregation."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Run one validation shared by all tests."""
+        cls.validator = UBPNoiseValidator()
+        np.random.seed(3)
+        time, noise = cls.validator.generate_thermal_noise(sampling_rate=1e6, duration=0.01)
+        cls.results = cls.validator.validate_noise_hypothesis(noise, 1e6, "Compact Test",
+                                                              stages=ANALYSIS_STAGES + OPTIONAL_STAGES)
+
+    def test_summary_is_slotted_and_matches_results(self):
+        """Test that the summary holds the scalar metrics without a __dict__."""
+        summary = ValidationSummary.from_results(self.results)
+
+        self.assertFalse(hasattr(summary, '__dict__'))
+        self.assertEqual(summary.signal_name, "Compact Test")
+        self.assertEqual(summary.nrci, self.results['nrci'])
+        self.assertEqual(summary.mean_coherence, self.results['coherence_analysis']['mean_coherence'])
+        self.assertEqual(summary.overall_score, self.results['ubp_assessment']['overall_score'])
+        self.assertEqual(summary.golay_codeword_fraction, self.results['golay_analysis']['codeword_fraction'])
+        self.assertEqual(summary.serial_p_value, self.results['randomness_analysis']['serial_p_values'][0])
+
+    def test_record_round_trip(self):
+        """Test conversion to a structured row and back."""
+        summary = ValidationSummary.from_results(self.results)
+        array = summaries_to_array([summary, summary])
+
+        self.assertEqual(array.dtype, SUMMARY_DTYPE)
+        self.assertEqual(ValidationSummary.from_record(array[1]), summary)
+
+    def test_compact_validation_output(self):
+        """Test that compact mode drops or downsamples the spectrum."""
+        time, noise = self.validator.generate_thermal_noise(sampling_rate=1e6, duration=0.01)
+        compact = self.validator.validate_noise_hypothesis(noise, 1e6, "Compact", compact=True)
+        self.assertIsInstance(compact, ValidationResult)
+        self.assertIsNone(compact.spectrum)
+
+        result = ValidationResult.from_results(self.results, spectrum='downsampled', spectrum_points=256)
+        self.assertTrue(result.spectrum.downsampled)
+        self.assertLessEqual(result.spectrum.frequencies.size, 256)
+
+    def test_downsample_preserves_mean_level(self):
+        """Test that log-spaced downsampling keeps the spectral level."""
+        freqs = np.arange(1, 100001, dtype=np.float64)
+        power = np.full(freqs.size, 4.0)
+        f_out, p_out = downsample_spectrum(freqs, power, 500)
+
+        self.assertLessEqual(f_out.size, 500)
+        self.assertTrue(np.all(np.diff(f_out) > 0))
+        np.testing.assert_allclose(p_out, 4.0)
+
+    def test_summary_table_columns_are_views(self):
+        """Test that the table grows and exposes columns without copies."""
+        table = SummaryTable(capacity=1)
+        for _ in range(5):
+            table.append(self.results)
+
+        column = table.column('nrci')
+        self.assertEqual(len(table), 5)
+        self.assertTrue(np.shares_memory(column, table.array))
+        np.testing.assert_allclose(column, self.results['nrci'])
+
+
+if __name__ == "__main__":
+    unittest.main()